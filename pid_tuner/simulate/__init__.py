@@ -9,10 +9,11 @@ PID control systems with configurable process models, disturbances,
 valve characteristics, and measurement noise.
 """
 
-from .sim import simulate
+from .sim import simulate, simulate_steps
 from .realtime import simulate_realtime
 
 __all__ = [
     'simulate',
+    'simulate_steps',
     'simulate_realtime',
 ]
\ No newline at end of file
@@ -2,6 +2,11 @@ from __future__ import annotations
 import os
 import sys
 from PySide6 import QtCore, QtGui, QtWidgets
+try:
+    from PySide6 import QtAsyncio
+    HAS_QTASYNCIO = True
+except Exception:
+    HAS_QTASYNCIO = False
 #import qrc_resources  # ensures :/icons/... and :/qss/... exist
 
 
@@ -20,8 +25,16 @@ def _try_load_qss(app: QtWidgets.QApplication):
         except Exception:
             pass
 
+class _Application(QtWidgets.QApplication):
+    # QtAsyncio's loop runs exec() itself and drops its result; keep it for sys.exit
+    exit_code = 0
+
+    def exec(self) -> int:
+        self.exit_code = super().exec()
+        return self.exit_code
+
 def main():
-    app = QtWidgets.QApplication(sys.argv)
+    app = _Application(sys.argv)
     app.setApplicationName("PID Tuner & Loop Analyzer")
     app.setOrganizationName("PIDLab")
     app.setOrganizationDomain("pidlab.local")
@@ -43,6 +56,10 @@ def main():
     if not icon.isNull():
         app.setWindowIcon(icon)
 
+    # Run the Qt event loop as the asyncio loop so coroutines can be scheduled from slots
+    if HAS_QTASYNCIO:
+        QtAsyncio.run(keep_running=True, quit_qapp=True)
+        sys.exit(app.exit_code)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
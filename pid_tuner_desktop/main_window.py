@@ -1,8 +1,11 @@
 from __future__ import annotations
-import os
+import asyncio
+import json
 import time
-from typing import Optional, Tuple
+from pathlib import Path
+from typing import List, Optional, Tuple
 
+import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
 
 # Views
@@ -16,7 +19,7 @@ from views.tuning_panel import TuningPanel
 
 # ViewModels
 from viewmodels.app_state import AppState
-from viewmodels.controller_vm import ControllerVM
+from viewmodels.controller_vm import ControllerVM, ControllerParams
 from viewmodels.process_vm import ProcessVM
 from viewmodels.simulation_vm import SimulationVM
 from viewmodels.tuning_vm import TuningVM
@@ -24,8 +27,8 @@ from viewmodels.tuning_vm import TuningVM
 # Services
 from services.simulation_service import ProcessSpec, PIDSpec
 from services.tuning_service import simc, lambda_imc, zn_reaction_curve, TuningResult
-from services.identification_service import detect_steps, fit_fopdt, fit_sopdt_from_fopdt, fit_integrating
-from services.storage_service import StorageService, Sample
+from services.identification_service import StepEvent, detect_steps, fit_all
+from services.storage_service import StorageService
 from services.opc_ua_service import OpcUaService
 from services.opc_da_service import OpcDaService
 
@@ -34,16 +37,26 @@ from adapters.core_models import ui_to_core_process, is_valid_process
 from adapters.core_tuning import GenericPID, to_vendor_form
 
 
+_ROOT = Path(__file__).parent
+_RUNTIME = _ROOT / "runtime" / "sessions"
+_ICON_DIR = _ROOT / "qrc" / "icons"
+
+
 def _icon(name: str) -> QtGui.QIcon:
     # Try :/icons/name first then filesystem fallback
     res = QtGui.QIcon(f":/icons/{name}")
     if not res.isNull():
         return res
-    fs = os.path.join(os.path.dirname(__file__), "qrc", "icons", name)
-    return QtGui.QIcon(fs) if os.path.exists(fs) else QtGui.QIcon()
+    fs = _ICON_DIR / name
+    return QtGui.QIcon(str(fs)) if fs.exists() else QtGui.QIcon()
 
 
 class MainWindow(QtWidgets.QMainWindow):
+    # OPC callbacks fire off the GUI thread; re-emit so the slot runs queued on it
+    liveSample = QtCore.Signal(str, float, float)
+    # (kind, target, names) from an OPC browse run on the thread pool; see _start_browse
+    browseDone = QtCore.Signal(str, str, list)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("PID Tuner & Loop Analyzer (Desktop)")
@@ -53,14 +66,18 @@ class MainWindow(QtWidgets.QMainWindow):
         self.state = AppState()
 
         # storage (create runtime dirs)
-        runtime_dir = os.path.join(os.path.dirname(__file__), "runtime")
-        os.makedirs(os.path.join(runtime_dir, "sessions"), exist_ok=True)
-        db_path = os.path.join(runtime_dir, "sessions", "pid_tuner.sqlite")
-        self.storage = StorageService(db_path)
+        _RUNTIME.mkdir(parents=True, exist_ok=True)
+        self.storage = StorageService(str(_RUNTIME / "pid_tuner.sqlite"))
+        self._current_session_id: Optional[int] = None
 
         # opc bridges
         self.ua = OpcUaService()
         self.da = OpcDaService()
+        self._ua_task: Optional[asyncio.Task] = None  # QtAsyncio subscription; asyncio keeps tasks only weakly
+        # browses run here, off the GUI thread; a slow endpoint does not hold up the others
+        self._browse_pool = QtCore.QThreadPool(self)
+        self._browse_pool.setMaxThreadCount(4)
+        self._browsing: set = set()  # (kind, target) browses still running on the pool
 
         # ---------- ViewModels ----------
         self.ctrl_vm = ControllerVM()
@@ -71,8 +88,16 @@ class MainWindow(QtWidgets.QMainWindow):
             lambda Kp, Ti, Td: self.console.log(f"Tuned → Kp={Kp:.6g}, Ti={Ti:.6g}, Td={Td:.6g}")
         )
 
+        # SP/PV/OP tag names used by the tick hot path; refreshed on tagMapChanged
+        self._tick_tags: Tuple[str, str, str] = ("SP", "PV", "OP")
+        self._on_tag_map_changed(self.state.tags())
+        self.state.tagMapChanged.connect(self._on_tag_map_changed, QtCore.Qt.DirectConnection)
+
+        # detect_steps memo shared by Detect/Identify: (history key, steps)
+        self._steps_cache: Tuple[Optional[tuple], Optional[List[StepEvent]]] = (None, None)
+
         # Apply controller VM to the running realtime simulator when changed
-        self.ctrl_vm.paramChanged.connect(self._apply_vm_to_sim)
+        self.ctrl_vm.paramChanged.connect(self._apply_vm_to_sim, QtCore.Qt.DirectConnection)
 
         # ---------- UI Layout ----------
         self._build_menus()
@@ -80,14 +105,16 @@ class MainWindow(QtWidgets.QMainWindow):
         self._build_central()
         self._build_statusbar()
 
-        # Connect VM ticks to plot
-        self.sim_vm.tick.connect(self._on_tick_from_vm)
+        # Connect VM tick batches to plot
+        self.sim_vm.ticksBatch.connect(self._on_ticks_from_vm)
 
         # Connect ProjectBrowser actions
         self.browser.request_opc_ua_discover.connect(self._on_ua_discover)
         self.browser.request_opc_ua_connect_browse.connect(self._on_ua_connect_browse)
         self.browser.request_opc_da_browse.connect(self._on_da_browse)
         self.browser.subscribe_live_requested.connect(self._on_subscribe_live_tag)
+        self.liveSample.connect(self._on_live_sample, QtCore.Qt.QueuedConnection)
+        self.browseDone.connect(self._on_browse_done, QtCore.Qt.QueuedConnection)
 
         # Start simulator idle
         self.console.log("Application ready.")
@@ -174,7 +201,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setCentralWidget(center_split)
 
         # Wire SimulationVM updates to PlotPanel
-        self.sim_vm.historyCleared.connect(self.plot.clear)
+        self.sim_vm.historyCleared.connect(self.plot.clear, QtCore.Qt.DirectConnection)
+        self.sim_vm.historyCleared.connect(self._invalidate_steps, QtCore.Qt.DirectConnection)
 
     def _build_statusbar(self):
         sb = self.statusBar()
@@ -187,7 +215,7 @@ class MainWindow(QtWidgets.QMainWindow):
         # track running state
         self.sim_vm.runningChanged.connect(lambda r: self._lbl_state.setText("Sim: Running" if r else "Sim: Stopped"))
         # track tag map
-        self.state.tagMapChanged.connect(lambda m: self._lbl_tags.setText(f"SP/PV/OP: {m.get('SP','-')}/{m.get('PV','-')}/{m.get('OP','-')}"))
+        self.state.tagMapChanged.connect(lambda m: self._lbl_tags.setText(f"SP/PV/OP: {m.get('SP','-')}/{m.get('PV','-')}/{m.get('OP','-')}"), QtCore.Qt.DirectConnection)
 
     # ================= Toolbar/Menu Handlers =================
 
@@ -213,8 +241,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.console.log(f"Session started (id={sid}).")
 
     def _on_open_db_folder(self):
-        path = os.path.join(os.path.dirname(__file__), "runtime", "sessions")
-        QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(path))
+        QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(str(_RUNTIME)))
 
     def _on_export_vendor(self):
         pid = GenericPID(
@@ -223,17 +250,31 @@ class MainWindow(QtWidgets.QMainWindow):
             mode=self.ctrl_vm.mode(), d_on=self.ctrl_vm.derivative_on()
         )
         data = to_vendor_form("Emerson DeltaV PIDe", pid)
-        text = "{\n" + ",\n".join([f'  "{k}": {float(v):g}' for k, v in data.items()]) + "\n}"
+        text = json.dumps({k: float(v) for k, v in data.items()}, indent=2)
         cb = QtWidgets.QApplication.clipboard()
         cb.setText(text)
         self.console.log("Copied DeltaV PIDe JSON to clipboard.")
 
+    def _get_steps(self, ts, ops) -> List[StepEvent]:
+        # Reuse the last detection while the history is unchanged
+        key = (len(ts), ts[-1] if len(ts) else 0.0, float(np.asarray(ops).sum()) if len(ts) else 0.0)
+        cached_key, cached_steps = self._steps_cache
+        if cached_key == key and cached_steps is not None:
+            return cached_steps
+        steps = detect_steps(ts, ops, min_du=1.0, min_dt=5.0)
+        self._steps_cache = (key, steps)
+        return steps
+
+    @QtCore.Slot()
+    def _invalidate_steps(self):
+        self._steps_cache = (None, None)
+
     def _on_detect_steps(self):
         ts, sps, pvs, ops = self.sim_vm.history()
-        if not ts:
+        if not len(ts):
             self.console.log("No data available to detect steps.")
             return
-        steps = detect_steps(ts, ops, min_du=1.0, min_dt=5.0)
+        steps = self._get_steps(ts, ops)
         if not steps:
             self.console.log("No steps detected.")
             return
@@ -241,15 +282,19 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _on_identify_fopdt(self):
         ts, sps, pvs, ops = self.sim_vm.history()
-        if not ts:
+        if not len(ts):
             self.console.log("No data to identify.")
             return
-        steps = detect_steps(ts, ops, min_du=1.0, min_dt=5.0)
+        steps = self._get_steps(ts, ops)
         if not steps:
             self.console.log("No steps detected for identification.")
             return
-        fr = fit_fopdt(ts, pvs, ops, steps[0])
+        # one shared step window for all three models
+        fits = fit_all(ts, pvs, ops, steps[0])
+        fr = fits["FOPDT"]
         self.console.log(f"FOPDT fit: K={fr.params['K']:.6g}, tau={fr.params['tau']:.6g}, theta={fr.params['theta']:.6g}, r2={fr.stats['r2']:.3f}")
+        fi = fits["Integrating"]
+        self.console.log(f"Integrating fit: Ki={fi.params['Ki']:.6g}, theta={fi.params['theta']:.6g}, r2={fi.stats['r2']:.3f}")
         # Push into ProcessVM
         self.proc_vm.set_fopdt(fr.params["K"], fr.params["tau"], fr.params["theta"])
 
@@ -264,43 +309,91 @@ class MainWindow(QtWidgets.QMainWindow):
     # ================= OPC UA/DA Integration =================
 
     def _on_ua_discover(self):
-        eps = self.ua.discover_local()
-        if not eps:
-            self.console.log("No OPC UA servers discovered.")
-            return
-        self.console.log("OPC UA discovered:\n  " + "\n  ".join(eps))
+        self._start_browse("ua_discover", "", self.ua.discover_local)
 
     def _on_ua_connect_browse(self, endpoint: str):
-        names = self.ua.browse_root(endpoint)
-        if not names:
-            self.console.log(f"Browse failed: {endpoint}")
-        else:
-            self.console.log(f"OPC UA [{endpoint}] root children:\n  " + "\n  ".join(map(str, names)))
+        self._start_browse("ua_browse", endpoint, lambda: self.ua.browse_root(endpoint))
 
     def _on_da_browse(self, host: str):
-        servers = self.da.list_servers(host)
-        self.console.log(f"OPC DA servers on '{host or '(local)'}':\n  " + "\n  ".join(servers))
+        self._start_browse("da_browse", host, lambda: self.da.list_servers(host))
+
+    def _start_browse(self, kind: str, target: str, fetch):
+        # connect/browse can block for seconds: run it on the browse pool, the result comes
+        # back through browseDone (queued). A browse already in flight is not started twice.
+        key = (kind, target)
+        if key in self._browsing:
+            return
+        self._browsing.add(key)
+
+        def run():
+            try:
+                names = [str(n) for n in fetch()]
+            except Exception:
+                names = []
+            try:
+                self.browseDone.emit(kind, target, names)
+            except RuntimeError:
+                pass  # window already destroyed
+
+        self._browse_pool.start(run)
+
+    @QtCore.Slot(str, str, list)
+    def _on_browse_done(self, kind: str, target: str, names: list):
+        self._browsing.discard((kind, target))
+        if kind == "ua_discover":
+            if not names:
+                self.console.log("No OPC UA servers discovered.")
+                return
+            self.console.log("OPC UA discovered:\n  " + "\n  ".join(names))
+        elif kind == "ua_browse":
+            if not names:
+                self.console.log(f"Browse failed: {target}")
+            else:
+                self.console.log(f"OPC UA [{target}] root children:\n  " + "\n  ".join(names))
+        else:
+            self.console.log(f"OPC DA servers on '{target or '(local)'}':\n  " + "\n  ".join(names))
+
+    def _on_ua_task_done(self, task: asyncio.Task):
+        if task is self._ua_task:
+            self._ua_task = None
+        if not task.cancelled() and task.exception() is not None:
+            self.console.log(f"UA subscription failed: {task.exception()!r}")
 
     def _on_subscribe_live_tag(self, tag: str):
         # Try UA sim tags first; fallback to DA sim items
         if tag.startswith("ns="):
-            self.ua.subscribe(
-                "opc.tcp://localhost:4840",
-                [tag],
-                callback=lambda nid, val, ts: self._on_live_sample(tag=nid, value=val, ts=ts),
-                period_s=1.0,
-            )
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            # under QtAsyncio the subscription is a task on the GUI loop; network I/O stays on the service loop
+            if loop is not None:
+                self._ua_task = loop.create_task(self.ua.subscribe_async(
+                    "opc.tcp://localhost:4840",
+                    [tag],
+                    callback=self.liveSample.emit,
+                    period_s=1.0,
+                ))
+                self._ua_task.add_done_callback(self._on_ua_task_done)
+            else:
+                self.ua.subscribe(
+                    "opc.tcp://localhost:4840",
+                    [tag],
+                    callback=self.liveSample.emit,
+                    period_s=1.0,
+                )
             self.console.log(f"Subscribed UA: {tag}")
         else:
             self.da.subscribe(
                 "(local)",
                 "Matrikon.OPC.Simulation.1",
                 [tag],
-                callback=lambda nid, val, ts: self._on_live_sample(tag=nid, value=val, ts=ts),
+                callback=self.liveSample.emit,
                 period_s=1.0,
             )
             self.console.log(f"Subscribed DA: {tag}")
 
+    @QtCore.Slot(str, float, float)
     def _on_live_sample(self, tag: str, value: float, ts: float):
         # For demonstration: if the tag matches known roles, update AppState and Plot
         m = self.state.tags()
@@ -319,67 +412,61 @@ class MainWindow(QtWidgets.QMainWindow):
             self.console.log(f"{tag} = {float(value):.6g}")
 
         # Store in DB if session active
-        sid = getattr(self, "_current_session_id", None)
+        sid = self._current_session_id
         if sid is not None:
             try:
-                self.storage.insert_samples(sid, [Sample(ts=ts, tag=tag, value=float(value))])
+                self.storage.insert_rows(sid, ((ts, tag, float(value)),))
             except Exception:
                 pass
 
     def _elapsed_sim_time(self) -> float:
         # derive from sim history to keep a monotonic time base for plotting
         ts, *_ = self.sim_vm.history()
-        return ts[-1] if ts else 0.0
+        return float(ts[-1]) if len(ts) else 0.0
 
     # ================= VM / SIM Wiring =================
 
-    def _apply_vm_to_sim(self, *args):
-        # Push ControllerVM → underlying simulator PIDSpec (accessing internal _sim attribute)
-        try:
-            sim = self.sim_vm._sim  # type: ignore[attr-defined]
-            sim.pid = PIDSpec(
-                Kp=self.ctrl_vm.Kp(),
-                Ti=self.ctrl_vm.Ti(),
-                Td=self.ctrl_vm.Td(),
-                beta=self.ctrl_vm.beta(),
-                alpha=self.ctrl_vm.alpha(),
-                mode=self.ctrl_vm.mode(),
-                d_on=self.ctrl_vm.derivative_on(),
-                u_min=0.0, u_max=100.0, bias=0.0
-            )
-        except Exception:
-            pass
-
-        # Push ProcessVM → simulator ProcessSpec
-        try:
-            p = self.proc_vm.get_params()
-            m = self.proc_vm.model()
-            payload = ui_to_core_process(m, p)
-            if is_valid_process(payload):
-                sim = self.sim_vm._sim  # type: ignore[attr-defined]
-                if payload["type"] == "FOPDT":
-                    sim.proc = ProcessSpec(type="FOPDT", K=payload["K"], tau=payload["tau"], theta=payload["theta"])
-                elif payload["type"] == "SOPDT":
-                    sim.proc = ProcessSpec(type="SOPDT", K=payload["K"], tau1=payload["tau1"], tau2=payload["tau2"], theta=payload["theta"])
-                else:
-                    sim.proc = ProcessSpec(type="Integrating", Ki=payload["Ki"], theta=payload["theta"])
-        except Exception:
-            pass
-
-    @QtCore.Slot(float, float, float, float)
-    def _on_tick_from_vm(self, t: float, sp: float, pv: float, op: float):
-        self.plot.append(t, sp, pv, op)
+    @QtCore.Slot(object)
+    def _apply_vm_to_sim(self, params: ControllerParams | None = None):
+        # Push ControllerVM → simulator PIDSpec
+        p = params if params is not None else self.ctrl_vm.params()
+        self.sim_vm.apply_pid(PIDSpec(
+            Kp=p.Kp, Ti=p.Ti, Td=p.Td, beta=p.beta, alpha=p.alpha,
+            mode=p.mode, d_on=p.d_on,
+            u_min=0.0, u_max=100.0, bias=0.0
+        ))
+
+        # Push ProcessVM → simulator ProcessSpec (only validated payloads reach the sim)
+        payload = ui_to_core_process(self.proc_vm.model(), self.proc_vm.get_params())
+        if not is_valid_process(payload):
+            return
+        if payload["type"] == "FOPDT":
+            spec = ProcessSpec(type="FOPDT", K=payload["K"], tau=payload["tau"], theta=payload["theta"])
+        elif payload["type"] == "SOPDT":
+            spec = ProcessSpec(type="SOPDT", K=payload["K"], tau1=payload["tau1"], tau2=payload["tau2"], theta=payload["theta"])
+        else:
+            spec = ProcessSpec(type="Integrating", Ki=payload["Ki"], theta=payload["theta"])
+        self.sim_vm.apply_proc(spec)
+
+    @QtCore.Slot(object)
+    def _on_ticks_from_vm(self, rows):
+        # rows: (n, 4) array of t, sp, pv, op since the last flush
+        self.plot.extend(rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3])
+        samples = rows.tolist()
         # Log every 10s
-        if int(t) % 10 == 0:
-            self.console.log(f"t={t:6.1f}  SP={sp:8.3f}  PV={pv:8.3f}  OP={op:8.3f}%")
-        # Store quickly if session running
-        sid = getattr(self, "_current_session_id", None)
-        if sid is not None and (int(t) % 1 == 0):
+        for t, sp, pv, op in samples:
+            if int(t) % 10 == 0:
+                self.console.log(f"t={t:6.1f}  SP={sp:8.3f}  PV={pv:8.3f}  OP={op:8.3f}%")
+        # Store quickly if session running (one transaction per batch)
+        sid = self._current_session_id
+        if sid is not None:
+            tag_sp, tag_pv, tag_op = self._tick_tags
             try:
-                self.storage.insert_samples(sid, [
-                    Sample(ts=t, tag=self.state.tags().get("SP", "SP"), value=float(sp)),
-                    Sample(ts=t, tag=self.state.tags().get("PV", "PV"), value=float(pv)),
-                    Sample(ts=t, tag=self.state.tags().get("OP", "OP"), value=float(op)),
-                ])
+                self.storage.insert_rows(sid, (r for t, sp, pv, op in samples
+                                               for r in ((t, tag_sp, sp), (t, tag_pv, pv), (t, tag_op, op))))
             except Exception:
                 pass
+
+    @QtCore.Slot(dict)
+    def _on_tag_map_changed(self, m: dict):
+        self._tick_tags = (m.get("SP", "SP"), m.get("PV", "PV"), m.get("OP", "OP"))
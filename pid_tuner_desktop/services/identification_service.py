@@ -1,8 +1,23 @@
 from __future__ import annotations
-import math
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Tuple
 
+import numpy as np
+
+# Optional JIT for the FOPDT grid on long windows; NumPy broadcast otherwise.
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except Exception:
+    HAS_NUMBA = False
+
+# n_t * n_theta * n_tau above which the dense (n_t, n_theta, n_tau) broadcast is avoided
+_DENSE_GRID_MAX = 1_000_000
+# coarse FOPDT cells refined by the nested grid search
+_FOPDT_REFINE_SEEDS = 3
+# phi = 1 - exp(-x) is exactly 1.0 in double precision beyond this x
+_EXP_CUTOFF = 38.0
+
 
 @dataclass(slots=True)
 class StepEvent:
@@ -28,25 +43,83 @@ def detect_steps(t: List[float], op: List[float], min_du: float = 0.5, min_dt: f
     Simple median-diff based step detector on OP.
     A step is recognized when |ΔOP| >= min_du and spaced at least min_dt seconds apart.
     """
-    if not (t and op) or len(t) != len(op):
+    if len(t) == 0 or len(op) == 0 or len(t) != len(op):
+        return []
+    t_arr = np.asarray(t, dtype=float)
+    op_arr = np.asarray(op, dtype=float)
+    n = op_arr.size
+    if n < 2:
         return []
+    # look ahead window ~ 5x previous spacing or 60s
+    look = max(20, int((min_dt / max(t_arr[1]-t_arr[0], 1e-9)) * 5))
+    # candidates from one vectorized diff; only these few go through the spacing gate
+    du_all = np.diff(op_arr)
+    cand = np.flatnonzero(np.abs(du_all) >= min_du) + 1
     events: List[StepEvent] = []
     last_t = -1e9
-    pv0 = 0.0
-    op0 = op[0]
-    for i in range(1, len(op)):
-        du = op[i] - op[i-1]
-        if abs(du) >= min_du and (t[i] - last_t) >= min_dt:
-            idx0 = i
-            t0 = t[i]
-            # look ahead window ~ 5x previous spacing or 60s
-            idx1 = min(len(op)-1, i + max(20, int((min_dt / max(t[1]-t[0], 1e-9)) * 5)))
-            events.append(StepEvent(t0=t0, du=du, pv0=pv0, op0=op[i-1], idx0=idx0, idx1=idx1))
+    pv0 = 0.0  # pv0 will be set from external PV in fit; keep placeholder
+    for i in cand.tolist():
+        t0 = float(t_arr[i])
+        if (t0 - last_t) >= min_dt:
+            idx1 = min(n-1, i + look)
+            events.append(StepEvent(t0=t0, du=float(du_all[i-1]), pv0=pv0, op0=float(op_arr[i-1]), idx0=i, idx1=idx1))
             last_t = t0
-        pv0 = pv0  # pv0 will be set from external PV in fit; keep placeholder var unchanged
     return events
 
 
+# ------------------ STEP WINDOW ------------------
+
+@dataclass(slots=True)
+class _StepWindow:
+    """PV/time slices of one step event plus the window R^2 baseline, shared by all fits."""
+    t_win: np.ndarray    # t[idx0:idx1]
+    pv_win: np.ndarray   # pv[idx0:idx1]
+    y0: float            # PV just before the step
+    t_end: float         # t[idx1], end of the fit horizon
+    mean_y: float
+    tss: float
+
+
+def _prepare_window(t, pv, event: StepEvent) -> _StepWindow:
+    t_arr = np.asarray(t, dtype=float)
+    pv_arr = np.asarray(pv, dtype=float)
+    idx0, idx1 = event.idx0, event.idx1
+    pv_win = np.ascontiguousarray(pv_arr[idx0:idx1])
+    mean_y = pv_win.sum() / max(1, (idx1 - idx0))
+    tss = ((pv_win - mean_y) ** 2).sum()
+    return _StepWindow(
+        t_win=np.ascontiguousarray(t_arr[idx0:idx1]),
+        pv_win=pv_win,
+        y0=float(pv_arr[idx0 - 1] if idx0 > 0 else pv_arr[idx0]),
+        t_end=float(t_arr[idx1]),
+        mean_y=float(mean_y),
+        tss=float(tss),
+    )
+
+
+def fit_all(
+    t: List[float],
+    pv: List[float],
+    op: List[float],
+    event: StepEvent,
+) -> Dict[str, FitResult]:
+    """
+    FOPDT, SOPDT (seeded from the FOPDT fit) and Integrating fits of one step
+    event, sharing a single window. Returns {"FOPDT":..., "SOPDT":..., "Integrating":...}.
+    """
+    if not (len(t) == len(pv) == len(op)):
+        fopdt = FitResult("FOPDT", {"K": 1.0, "tau": 10.0, "theta": 1.0}, {"rss": 1e9, "n": 0, "r2": 0.0})
+        return {"FOPDT": fopdt, "SOPDT": fit_sopdt_from_fopdt(fopdt),
+                "Integrating": FitResult("Integrating", {"Ki": 0.0, "theta": 0.1}, {"rss": 1e9, "n": 0, "r2": 0.0})}
+    w = _prepare_window(t, pv, event)
+    fopdt = _fit_fopdt_window(w, event)
+    return {
+        "FOPDT": fopdt,
+        "SOPDT": fit_sopdt_from_fopdt(fopdt),
+        "Integrating": _fit_integrating_window(w, event),
+    }
+
+
 # ------------------ FOPDT FIT ------------------
 
 def fit_fopdt(
@@ -62,51 +135,129 @@ def fit_fopdt(
     """
     if not (len(t) == len(pv) == len(op)):
         return FitResult("FOPDT", {"K": 1.0, "tau": 10.0, "theta": 1.0}, {"rss": 1e9, "n": 0, "r2": 0.0})
+    return _fit_fopdt_window(_prepare_window(t, pv, event), event)
 
-    y0 = pv[event.idx0 - 1] if event.idx0 > 0 else pv[event.idx0]
+
+def _fit_fopdt_window(w: _StepWindow, event: StepEvent) -> FitResult:
     t0 = event.t0
     du = event.du
-    idx1 = event.idx1
-
-    # search grids
-    thetas = _linspace(0.0, (t[idx1] - t0) * 0.6, 25)
-    taus = _geomspace(0.2, max(t[idx1]-t0, 1.0)*2.0, 30)
-
-    best = (1e99, 1.0, 10.0, 0.0)  # rss, tau, theta, K
-    for theta in thetas:
-        for tau in taus:
-            # build regressor phi = 1 - exp(-(t-(t0+theta))/tau) for t>t0+theta else 0
-            phi = []
-            y = []
-            for i in range(event.idx0, idx1):
-                tt = t[i]
-                if tt <= t0 + theta:
-                    phi.append(0.0)
-                else:
-                    phi.append(1.0 - math.exp(-(tt - (t0 + theta)) / tau))
-                y.append(pv[i] - y0)
-            # K by least squares: min || y - K*du*phi ||^2 ⇒ K = (phi·y)/(du*(phi·phi)+eps)
-            num = sum(pi * yi for pi, yi in zip(phi, y))
-            den = du * (sum(pi * pi for pi in phi) + 1e-12)
-            K = num / den if abs(den) > 0 else 0.0
-
-            rss = sum((yi - K * du * pi) ** 2 for yi, pi in zip(y, phi))
-            if rss < best[0]:
-                best = (rss, tau, theta, K)
+    t_win = w.t_win
+    y = w.pv_win - w.y0
+    h = _uniform_step(t_win)
 
+    # nested search grids: coarse 8x8 over the full range, then 8x8 around each of the best coarse cells
+    span = w.t_end - t0
+    thetas = np.asarray(_linspace(0.0, span * 0.6, 8))
+    taus = np.asarray(_geomspace(0.2, max(span, 1.0)*2.0, 8))
+    rss_grid, K_grid = _fopdt_grid(t_win, y, t0, du, thetas, taus, h)
+    d_theta = thetas[1] - thetas[0]
+    r_tau = taus[1] / taus[0]
+    # stable sort keeps the first-minimum tie-break of a nested theta/tau scan
+    order = np.argsort(rss_grid, axis=None, kind="stable")
+    i, j = np.unravel_index(order[0], rss_grid.shape)
+    best = (rss_grid[i, j], taus[j], thetas[i], K_grid[i, j])  # rss, tau, theta, K
+    for flat in order[:_FOPDT_REFINE_SEEDS]:
+        i, j = np.unravel_index(flat, rss_grid.shape)
+        fine_thetas = np.asarray(_linspace(max(0.0, thetas[i] - d_theta), thetas[i] + d_theta, 8))
+        fine_taus = np.asarray(_geomspace(taus[j] / r_tau, taus[j] * r_tau, 8))
+        f_rss, f_K = _fopdt_grid(t_win, y, t0, du, fine_thetas, fine_taus, h)
+        a, b = np.unravel_index(np.argmin(f_rss), f_rss.shape)
+        if f_rss[a, b] < best[0]:
+            best = (f_rss[a, b], fine_taus[b], fine_thetas[a], f_K[a, b])
     rss, tau, theta, K = best
-    # compute r^2
-    mean_y = sum(pv[event.idx0:idx1]) / max(1, (idx1 - event.idx0))
-    tss = sum((yi - mean_y) ** 2 for yi in pv[event.idx0:idx1])
-    r2 = 1.0 - (rss / (tss + 1e-12))
+
+    r2 = 1.0 - (rss / (w.tss + 1e-12))
 
     return FitResult(
         "FOPDT",
         {"K": float(K), "tau": float(tau), "theta": float(theta)},
-        {"rss": float(rss), "n": idx1 - event.idx0, "r2": float(r2)},
+        {"rss": float(rss), "n": event.idx1 - event.idx0, "r2": float(r2)},
     )
 
 
+def _fopdt_grid(t_win, y, t0, du, thetas, taus, h):
+    """(rss, K) over a (theta, tau) grid via the dense, JIT or row-chunked kernel."""
+    if t_win.size * thetas.size * taus.size <= _DENSE_GRID_MAX:
+        return _fopdt_grid_dense(t_win, y, t0, du, thetas, taus, h)
+    if HAS_NUMBA:
+        return _fopdt_grid_jit(t_win, y, t0, du, thetas, taus, h)
+    # one theta row at a time keeps memory at (n_t, n_tau)
+    rows = [_fopdt_grid_dense(t_win, y, t0, du, thetas[k:k+1], taus, h) for k in range(thetas.size)]
+    return np.vstack([r for r, _ in rows]), np.vstack([k for _, k in rows])
+
+
+def _fopdt_grid_dense(t_win, y, t0, du, thetas, taus, h=0.0):
+    """Evaluate every (theta, tau) model at once: arrays are (n_t, n_theta, n_tau)."""
+    # regressor phi = 1 - exp(-(t-(t0+theta))/tau) for t>t0+theta else 0
+    ts = t0 + thetas
+    if h > 0.0:
+        # uniform sampling: exp(-(t_k-ts)/tau) = c * a**m with a = exp(-h/tau), m samples past
+        # the first one after ts; the a**m table is shared by every theta
+        first = np.searchsorted(t_win, ts, side="right")
+        m = np.arange(t_win.size)[:, None] - first[None, :]
+        powers = np.cumprod(np.broadcast_to(np.exp(-h / taus), (t_win.size, taus.size)), axis=0)
+        powers = np.vstack([np.ones((1, taus.size)), powers[:-1]])
+        t_first = t_win[np.minimum(first, t_win.size - 1)]
+        c = np.exp(-np.maximum(t_first - ts, 0.0)[:, None] / taus[None, :])
+        phi = np.where((m >= 0)[:, :, None], 1.0 - c[None, :, :] * powers[np.maximum(m, 0)], 0.0)
+    else:
+        arg = (t_win[:, None, None] - ts[None, :, None]) / taus[None, None, :]
+        phi = np.where(arg > 0.0, -np.expm1(-np.maximum(arg, 0.0)), 0.0)
+    # K by least squares: min || y - K*du*phi ||^2 ⇒ K = (phi·y)/(du*(phi·phi)+eps)
+    num = np.einsum("tij,t->ij", phi, y)
+    den = du * (np.einsum("tij,tij->ij", phi, phi) + 1e-12)
+    K_grid = np.divide(num, den, out=np.zeros_like(num), where=den != 0.0)
+    rss_grid = ((y[:, None, None] - (K_grid * du)[None, :, :] * phi) ** 2).sum(axis=0)
+    return rss_grid, K_grid
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _fopdt_grid_jit(t_win, y, t0, du, thetas, taus, h=0.0):
+        """Same grid as _fopdt_grid_dense without materializing phi; one pass per model."""
+        n_th, n_tau = thetas.size, taus.size
+        rss_grid = np.empty((n_th, n_tau))
+        K_grid = np.empty((n_th, n_tau))
+        yy = 0.0
+        for k in range(t_win.size):
+            yy += y[k] * y[k]
+        for i in prange(n_th):
+            ts = t0 + thetas[i]
+            for j in range(n_tau):
+                inv_tau = 1.0 / taus[j]
+                # uniform sampling: decay follows decay *= exp(-h/tau) after the first sample
+                a = np.exp(-h * inv_tau)
+                decay = -1.0
+                py = 0.0
+                pp = 0.0
+                for k in range(t_win.size):
+                    if t_win[k] > ts:
+                        if h > 0.0 and decay >= 0.0:
+                            decay *= a
+                        else:
+                            x = (t_win[k] - ts) * inv_tau
+                            # 1 - exp(-x) rounds to exactly 1.0 past the cutoff, so skip the exp
+                            decay = np.exp(-x) if x < _EXP_CUTOFF else 0.0
+                        p = 1.0 - decay
+                        py += p * y[k]
+                        pp += p * p
+                den = du * (pp + 1e-12)
+                K = py / den if den != 0.0 else 0.0
+                # ||y - K*du*phi||^2 expanded so phi is never stored
+                rss_grid[i, j] = max(yy - 2.0 * K * du * py + K * K * du * du * pp, 0.0)
+                K_grid[i, j] = K
+        return rss_grid, K_grid
+
+
+def _uniform_step(t_win) -> float:
+    """Sample period if t_win is uniformly spaced (to 1e-6 relative), else 0.0."""
+    if t_win.size < 2:
+        return 0.0
+    d = np.diff(t_win)
+    h = float(d.mean())
+    return h if h > 0.0 and np.ptp(d) <= 1e-6 * h else 0.0
+
+
 # ------------------ SOPDT FIT (heuristic) ------------------
 
 def fit_sopdt_from_fopdt(fopdt: FitResult) -> FitResult:
@@ -134,39 +285,46 @@ def fit_integrating(
     """
     For an integrating process with deadtime:
       dy/dt = Ki * u(t - theta)
-    Approximate Ki by linear regression over slope after delay.
+    Approximate Ki by a least-squares slope fit of PV after the delay.
     """
+    return _fit_integrating_window(_prepare_window(t, pv, event), event)
+
+
+def _fit_integrating_window(w: _StepWindow, event: StepEvent) -> FitResult:
     t0 = event.t0
-    y0 = pv[event.idx0 - 1] if event.idx0 > 0 else pv[event.idx0]
     du = event.du
-    idx1 = event.idx1
+    t_win, yy = w.t_win, w.pv_win
 
     # scan theta to maximize correlation with slope
     best = (1e99, 0.0, 0.1)  # rss, Ki, theta
-    thetas = _linspace(0.0, (t[idx1] - t0) * 0.5, 20)
-    for theta in thetas:
-        # use simple slope from (t0+theta) to idx1
-        i_start = event.idx0
-        while i_start < idx1 and t[i_start] < t0 + theta:
-            i_start += 1
-        if i_start + 1 >= idx1:
-            continue
-        dy = pv[idx1] - pv[i_start]
-        dt = t[idx1] - t[i_start]
-        slope = dy / max(dt, 1e-9)
-        Ki = slope / max(du, 1e-12)
-        # rss ~ squared error to linear ramp
-        rss = 0.0
-        for i in range(i_start, idx1):
-            t_rel = t[i] - t[i_start]
-            y_hat = pv[i_start] + Ki * du * t_rel
-            rss += (pv[i] - y_hat) ** 2
-        if rss < best[0]:
-            best = (rss, Ki, theta)
+    r2 = 0.0  # stays 0 when no theta leaves room for a line
+    thetas = np.asarray(_linspace(0.0, (w.t_end - t0) * 0.5, 20))
+    # first window offset at/after t0+theta for every theta at once (capped at the window end)
+    starts = np.searchsorted(t_win, t0 + thetas, side="left")
+    ok = starts + 1 < t_win.size
+    if ok.any():
+        s = starts[ok]
+        # least-squares line y = a + b*t over [start, end) for every theta at once (masked rows);
+        # times are shifted to the window start so epoch timestamps keep their precision
+        tt = t_win - t_win[0]
+        M = (np.arange(t_win.size)[None, :] >= s[:, None]).astype(float)
+        n = M.sum(axis=1)
+        St, Sy = M @ tt, M @ yy
+        Stt, Sty = M @ (tt * tt), M @ (tt * yy)
+        den = n * Stt - St * St
+        slope = np.divide(n * Sty - St * Sy, den, out=np.zeros_like(den), where=den > 0.0)
+        a = (Sy - slope * St) / n
+        Ki_all = slope / (du if abs(du) >= 1e-12 else 1e-12)
+        rss_all = (M * (yy[None, :] - a[:, None] - slope[:, None] * tt[None, :]) ** 2).sum(axis=1)
+        k = int(np.argmin(rss_all))
+        if rss_all[k] < best[0]:
+            best = (rss_all[k], Ki_all[k], thetas[ok][k])
+            # R^2 over the same masked samples as rss, not the whole window
+            tss = (M[k] * (yy - Sy[k] / n[k]) ** 2).sum()
+            r2 = 1.0 - (rss_all[k] / (tss + 1e-12))
     rss, Ki, theta = best
-    r2 = 0.0  # keep simple
     return FitResult("Integrating", {"Ki": float(Ki), "theta": float(theta)},
-                     {"rss": float(rss), "n": idx1 - event.idx0, "r2": float(r2)})
+                     {"rss": float(rss), "n": event.idx1 - event.idx0, "r2": float(r2)})
 
 
 # ------------------ helpers ------------------
@@ -1,6 +1,9 @@
 from __future__ import annotations
 import threading, time
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+# server lists are reused for this long before asking the host again
+_BROWSE_TTL_S = 30.0
 
 
 class OpcDaService:
@@ -21,6 +24,7 @@ class OpcDaService:
         self._cb: Optional[Callable[[str, float, float], None]] = None  # item_id, value, ts
         self._poll_thr: Optional[threading.Thread] = None
         self._stop = threading.Event()
+        self._servers_cache: Dict[str, Tuple[float, List[str]]] = {}  # host -> (monotonic ts, progids)
         self._t = 0.0
         self._items: Dict[str, float] = {"Channel1.Device1.Random.PV": 42.0,
                                          "Channel1.Device1.Random.OP": 30.0,
@@ -28,12 +32,19 @@ class OpcDaService:
 
     def list_servers(self, host: str = "") -> List[str]:
         host = host or "(local)"
+        now = time.monotonic()
+        hit = self._servers_cache.get(host)
+        if hit is not None and now - hit[0] < _BROWSE_TTL_S:
+            return list(hit[1])
         # Deterministic set (extend as needed)
-        return ["Kepware.KEPServerEX.V6", "Matrikon.OPC.Simulation.1"]
+        servers = ["Kepware.KEPServerEX.V6", "Matrikon.OPC.Simulation.1"]
+        self._servers_cache[host] = (now, servers)
+        return list(servers)
 
     def subscribe(self, host: str, progid: str, item_ids: List[str],
                   callback: Callable[[str, float, float], None], period_s: float = 1.0):
         self.unsubscribe()
+        self._servers_cache.clear()
         self._host = host or "(local)"
         self._progid = progid
         self._subs = list(item_ids)
@@ -56,6 +67,7 @@ class OpcDaService:
     # -------- internal polling sim --------
     def _poll_loop(self, dt: float):
         import math, time as _t
+        deadline = _t.monotonic()
         while not self._stop.is_set():
             self._t += dt
             # simple evolutions
@@ -71,4 +83,7 @@ class OpcDaService:
                         self._cb(it, float(v), now)
                     except Exception:
                         pass
-            _t.sleep(dt)
+            # wait to the next deadline (not a fixed dt) so callback time does not drift the period;
+            # the event wait also returns at once on unsubscribe()
+            deadline += dt
+            self._stop.wait(max(0.0, deadline - _t.monotonic()))
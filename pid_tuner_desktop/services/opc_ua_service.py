@@ -1,5 +1,6 @@
 from __future__ import annotations
-import threading, time
+import asyncio, math, threading, time
+from concurrent.futures import Future
 from typing import Callable, Dict, List, Optional, Tuple
 
 # Try to use asyncua if it exists; otherwise run a local simulator.
@@ -9,27 +10,54 @@ try:
 except Exception:
     HAS_ASYNCUA = False
 
+# browse results are reused for this long before reconnecting
+_BROWSE_TTL_S = 30.0
+
+
+class _DataChangeHandler:
+    """asyncua subscription handler: forwards data-change notifications to the service callback."""
+
+    def __init__(self, service: "OpcUaService", names: Dict[object, str]):
+        self._svc = service
+        self._names = names  # NodeId -> node id string as subscribed
+
+    def datachange_notification(self, node, val, data):
+        cb = self._svc._cb
+        if cb:
+            try:
+                cb(self._names.get(node.nodeid, str(node)), float(val), time.time())
+            except Exception:
+                pass
+
 
 class OpcUaService:
     """
     Minimal OPC UA client wrapper with two modes:
-      1) Real mode (asyncua present): discover/connect/browse/read/subscribe (polling)
+      1) Real mode (asyncua present): discover/connect/browse/read/subscribe
+         (server data-change subscription, polling read_value as fallback)
       2) Sim mode (no asyncua): deterministic in-process tag generator you can 'subscribe' to.
 
     Public API (works both modes):
       - discover_local() -> List[str]
       - browse_root(endpoint) -> List[str]
       - subscribe(endpoint, node_ids: List[str], callback: callable(tag, value, ts))
+      - subscribe_async(...)  (coroutine; awaitable from any event loop, incl. QtAsyncio)
       - unsubscribe()
       - is_connected()
     """
 
     def __init__(self):
         self._endpoint = ""
-        self._poll_thr: Optional[threading.Thread] = None
+        # one private loop thread per service runs browse + subscriptions and owns the Clients
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._clients: Dict[str, "Client"] = {}  # endpoint -> connected Client (loop thread only)
+        self._poll_fut: Optional[Future] = None
+        self._poll_task: Optional[asyncio.Task] = None
         self._stop = threading.Event()
         self._subs: List[str] = []
         self._cb: Optional[Callable[[str, float, float], None]] = None  # tag, value, ts
+        self._browse_cache: Dict[str, Tuple[float, List[str]]] = {}  # endpoint -> (monotonic ts, names)
 
         # simulator state
         self._sim_t = 0.0
@@ -42,80 +70,187 @@ class OpcUaService:
         return ["opc.tcp://localhost:4840", "opc.tcp://127.0.0.1:4841"]
 
     def browse_root(self, endpoint_url: str) -> List[str]:
+        now = time.monotonic()
+        hit = self._browse_cache.get(endpoint_url)
+        if hit is not None and now - hit[0] < _BROWSE_TTL_S:
+            return list(hit[1])
+        names = self._browse_root(endpoint_url)
+        if names:  # failures are not cached so a retry reconnects
+            self._browse_cache[endpoint_url] = (now, list(names))
+        return names
+
+    def _browse_root(self, endpoint_url: str) -> List[str]:
         if HAS_ASYNCUA:
             # basic browse of Root->Objects
             try:
-                import asyncio
-                async def _browse():
-                    async with Client(url=endpoint_url) as client:
-                        root = client.nodes.root
-                        objects = client.nodes.objects
-                        refs = await objects.get_children()
-                        names = []
-                        for n in refs:
-                            try:
-                                names.append(await n.read_display_name())
-                            except Exception:
-                                names.append(str(n))
-                        return [str(x) for x in names]
-                return asyncio.get_event_loop().run_until_complete(_browse())
+                return self._run(self._browse(endpoint_url), timeout=10.0)
             except Exception:
+                asyncio.run_coroutine_threadsafe(self._drop_client(endpoint_url), self._ensure_loop())
                 return []
         # sim mode
         return ["Objects", "Types", "Views"]
 
+    async def _browse(self, endpoint_url: str) -> List[str]:
+        client = await self._client(endpoint_url)
+        refs = await client.nodes.objects.get_children()
+        names = []
+        for n in refs:
+            try:
+                names.append(await n.read_display_name())
+            except Exception:
+                names.append(str(n))
+        return [str(x) for x in names]
+
     # -------- Subscription (polling) --------
     def subscribe(self, endpoint_url: str, node_ids: List[str], callback: Callable[[str, float, float], None], period_s: float = 1.0):
         """
-        Subscribes to a group of node_ids. In 'real' mode we poll read_values.
+        Subscribes to a group of node_ids. In 'real' mode the server pushes data
+        changes (falling back to polling read_values if it refuses a subscription).
         In sim mode we synthesize values deterministically.
+        Runs on the service's shared event loop thread; callbacks fire there.
         """
-        self.unsubscribe()
-        self._endpoint = endpoint_url
-        self._subs = list(node_ids)
-        self._cb = callback
-        self._stop.clear()
-        self._poll_thr = threading.Thread(target=self._poll_loop, args=(max(0.1, float(period_s)),), daemon=True)
-        self._poll_thr.start()
+        self._prepare(endpoint_url, node_ids, callback)
+        dt = max(0.1, float(period_s))
+        self._poll_fut = asyncio.run_coroutine_threadsafe(self._poll_async(dt), self._ensure_loop())
+
+    async def subscribe_async(self, endpoint_url: str, node_ids: List[str], callback: Callable[[str, float, float], None], period_s: float = 1.0):
+        """
+        Same as subscribe() but awaitable from the caller's running event loop until
+        unsubscribe() is called or the task is cancelled. Sim mode polls on the
+        caller's loop; real mode I/O stays on the service loop (QtAsyncio has no
+        socket transports yet), so callbacks then fire on the service loop thread.
+        """
+        self._prepare(endpoint_url, node_ids, callback)
+        task = self._poll_task = asyncio.current_task()
+        dt = max(0.1, float(period_s))
+        try:
+            if HAS_ASYNCUA:
+                self._poll_fut = asyncio.run_coroutine_threadsafe(self._poll_async(dt), self._ensure_loop())
+                await asyncio.wrap_future(self._poll_fut)
+            else:
+                await self._poll_async(dt)
+        finally:
+            # a re-subscribe cancels this task after it has already stored its own
+            if self._poll_task is task:
+                self._poll_task = None
 
     def unsubscribe(self):
         self._stop.set()
-        if self._poll_thr and self._poll_thr.is_alive():
-            self._poll_thr.join(timeout=1.0)
-        self._poll_thr = None
+        fut = self._poll_fut
+        if fut is not None and not fut.done():
+            try:
+                fut.result(timeout=1.0)
+            except Exception:
+                fut.cancel()
+        self._poll_fut = None
+        if self._poll_task is not None and not self._poll_task.done():
+            self._poll_task.cancel()
+        self._poll_task = None
         self._subs.clear()
         self._cb = None
 
     def is_connected(self) -> bool:
-        return self._poll_thr is not None and self._poll_thr.is_alive()
+        if self._poll_task is not None and not self._poll_task.done():
+            return True
+        return self._poll_fut is not None and not self._poll_fut.done()
+
+    # -------- shared event loop / clients --------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        # Plain selector loop: the process-wide policy may be QtAsyncio's, which is GUI-thread only
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.SelectorEventLoop()
+                threading.Thread(target=loop.run_forever, name="opcua-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _run(self, coro, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result(timeout=timeout)
+
+    async def _client(self, endpoint_url: str):
+        # connections are reused across browse/subscribe calls on the same endpoint
+        client = self._clients.get(endpoint_url)
+        if client is None:
+            client = Client(url=endpoint_url)
+            await client.connect()
+            self._clients[endpoint_url] = client
+        return client
+
+    async def _drop_client(self, endpoint_url: str):
+        client = self._clients.pop(endpoint_url, None)
+        if client is not None:
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
 
     # -------- internal polling --------
-    def _poll_loop(self, dt: float):
+    def _prepare(self, endpoint_url: str, node_ids: List[str], callback: Callable[[str, float, float], None]):
+        self.unsubscribe()
+        if endpoint_url != self._endpoint:
+            self._browse_cache.clear()  # same endpoint: cached browse results stay valid
+        self._endpoint = endpoint_url
+        self._subs = list(node_ids)
+        self._cb = callback
+        self._stop.clear()
+
+    async def _poll_async(self, dt: float):
         if HAS_ASYNCUA:
-            import asyncio
-            async def _poll():
+            try:
+                client = await self._client(self._endpoint)
+                nodes = [client.get_node(nid) for nid in self._subs]
+                # prefer server-side push: only changed values arrive, no per-tick roundtrips
+                sub = None
                 try:
-                    async with Client(url=self._endpoint) as client:
-                        nodes = [client.get_node(nid) for nid in self._subs]
-                        while not self._stop.is_set():
-                            now = time.time()
+                    handler = _DataChangeHandler(self, {n.nodeid: nid for n, nid in zip(nodes, self._subs)})
+                    sub = await client.create_subscription(dt * 1000.0, handler)
+                    await sub.subscribe_data_change(nodes)
+                except Exception:
+                    # server refused; drop any half-made subscription and poll instead
+                    if sub is not None:
+                        try:
+                            await sub.delete()
+                        except Exception:
+                            pass
+                    sub = None
+                if sub is not None:
+                    while not self._stop.is_set():
+                        await asyncio.sleep(dt)
+                    try:
+                        await sub.delete()
+                    except Exception:
+                        pass
+                    return
+                bulk_read = True
+                deadline = time.monotonic()
+                while not self._stop.is_set():
+                    now = time.time()
+                    try:
+                        if bulk_read:
+                            # one Read service call for all nodes
+                            vals = await client.read_values(nodes)
+                        else:
+                            vals = await asyncio.gather(*[n.read_value() for n in nodes])
+                    except Exception:
+                        if bulk_read:
+                            bulk_read = False  # server rejected the bulk request; per-node from now on
+                            continue
+                        vals = [None] * len(nodes)
+                    if self._cb:
+                        for nid, v in zip(self._subs, vals):
                             try:
-                                vals = await asyncio.gather(*[n.read_value() for n in nodes])
+                                self._cb(nid, float(v), now)
                             except Exception:
-                                vals = [None] * len(nodes)
-                            if self._cb:
-                                for nid, v in zip(self._subs, vals):
-                                    try:
-                                        self._cb(nid, float(v), now)
-                                    except Exception:
-                                        pass
-                            await asyncio.sleep(dt)
-                except Exception:
-                    # connection failed; end loop
-                    pass
-            asyncio.get_event_loop().run_until_complete(_poll())
+                                pass
+                    # sleep to the next deadline so read time does not stretch the period
+                    deadline += dt
+                    await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+            except Exception:
+                # connection failed or dropped; reconnect on the next call
+                await self._drop_client(self._endpoint)
         else:
             # sim mode
+            deadline = time.monotonic()
             while not self._stop.is_set():
                 now = time.time()
                 self._sim_t += dt
@@ -130,4 +265,5 @@ class OpcUaService:
                             self._cb(nid, float(v), now)
                         except Exception:
                             pass
-                time.sleep(dt)
+                deadline += dt
+                await asyncio.sleep(max(0.0, deadline - time.monotonic()))
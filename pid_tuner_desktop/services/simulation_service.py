@@ -1,9 +1,23 @@
 from __future__ import annotations
-import threading, time, math, random
+import threading, time, math
 from dataclasses import dataclass
-from typing import Callable, Dict, Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, Tuple
+
+import numpy as np
 from PySide6 import QtCore
 
+# Optional JIT for the offline batch loop; without numba the same kernel runs as plain Python.
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except Exception:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
 
 @dataclass(slots=True)
 class ProcessSpec:
@@ -35,22 +49,37 @@ class PIDSpec:
     bias: float = 0.0     # output bias (%)
 
 
+# samples per ticks_batch emission, capped so one batch never spans more than _TICK_BATCH_MAX_S
+_TICK_BATCH = 50
+_TICK_BATCH_MAX_S = 0.1
+
+
 def _sat(v: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, v))
 
 
+def _pid_effective(p: PIDSpec) -> Tuple[float, float, float, bool]:
+    """Resolve mode/d_on to (Ti, Td, 1/Ti, d_on_pv) as used by the step equations."""
+    Ti = 0.0 if p.mode == "P" else p.Ti
+    Td = p.Td if p.mode not in ("P", "PI") else 0.0
+    return Ti, Td, 1.0 / max(Ti, 1e-12), p.d_on.strip().upper().startswith("PV")
+
+
 class RealtimeSim(QtCore.QObject):
     """
-    Threaded realtime toy simulator that emits (t, sp, pv, op) once per 'period_s'.
+    Threaded realtime toy simulator stepping once per 'period_s'.
+    Samples are emitted in (n, 4) float arrays of rows (t, sp, pv, op) via ticks_batch;
+    short periods are batched so the cross-thread signal rate stays bounded.
     Uses a simple closed-loop with the internal PID against a FOPDT-like process.
     Replace with a call into your true pid_tuner.simulate.realtime if desired.
     """
-    tick = QtCore.Signal(float, float, float, float)
+    ticks_batch = QtCore.Signal(object)
 
     def __init__(self, period_s: float = 1.0, parent=None):
         super().__init__(parent)
         self._period = max(1e-3, float(period_s))
         self._stop = threading.Event()
+        self._lock = threading.Lock()
         self._thr: threading.Thread | None = None
         self._t = 0.0
         self.sp = 5.0
@@ -65,6 +94,14 @@ class RealtimeSim(QtCore.QObject):
         self._e_int = 0.0
         self._d_state = 0.0
         self._aw = 0.0  # anti-windup backcalc term
+        self._x_prev = 0.0  # previous derivative input
+        # deadtime delay line (ring buffer) + first lag state for SOPDT
+        self._u_q = np.zeros(0)
+        self._q_idx = 0
+        self._x1 = 0.0
+        self._size_delay_line()
+        self._bind_plant()
+        self._resolve_pid()
 
     # ----- public control -----
     def start(self):
@@ -78,27 +115,40 @@ class RealtimeSim(QtCore.QObject):
         self._stop.set()
 
     def configure(self, proc: ProcessSpec | None = None, pid: PIDSpec | None = None):
-        if proc: self.proc = proc
-        if pid: self.pid = pid
+        # Specs are swapped under the lock so the worker never steps a half-applied pair
+        with self._lock:
+            if proc:
+                self.proc = proc
+                self._size_delay_line()
+                self._bind_plant()
+            if pid:
+                self.pid = pid
+                self._resolve_pid()
+
+    def _size_delay_line(self):
+        # qlen depends only on theta and the fixed period, so resize here rather than per tick
+        qlen = max(1, int(round(self.proc.theta / self._period)))
+        if self._u_q.size != qlen:
+            self._u_q = np.zeros(qlen, dtype=np.float64)
+            self._q_idx = 0
 
     # ----- internals -----
+    def _resolve_pid(self):
+        # mode / d_on are configuration-stable; resolve them here rather than per tick
+        self._Ti_eff, self._Td_eff, self._inv_Ti, self._d_on_pv = _pid_effective(self.pid)
+
     def _pid_step(self, sp: float, pv: float, dt: float) -> float:
         p = self.pid
-        if p.mode == "P":
-            Ti = 0.0; Td = 0.0
-        elif p.mode == "PI":
-            Ti = p.Ti; Td = 0.0
-        else:
-            Ti = p.Ti; Td = p.Td
+        Ti = self._Ti_eff; Td = self._Td_eff
 
         e = sp - pv
         ep = p.beta * sp - pv  # setpoint-weighted proportional path
         # Integral (external reset: bias acts like remote output feedback)
         if Ti > 0:
-            self._e_int += (e - self._aw) * dt / max(Ti, 1e-12)
+            self._e_int += (e - self._aw) * dt * self._inv_Ti
 
         # Derivative (filtered)
-        if p.d_on.upper().startswith("PV"):
+        if self._d_on_pv:
             x = - (pv)  # derivative on measurement
         else:
             x = e
@@ -106,7 +156,7 @@ class RealtimeSim(QtCore.QObject):
         # discrete bilinear approx
         if Td > 0:
             a = p.alpha * Td
-            self._d_state += (Td / max(a, 1e-12)) * ((x - getattr(self, "_x_prev", 0.0)) / max(dt, 1e-12)) - (self._d_state / max(a, 1e-12)) * dt
+            self._d_state += (Td / max(a, 1e-12)) * ((x - self._x_prev) / max(dt, 1e-12)) - (self._d_state / max(a, 1e-12)) * dt
         else:
             self._d_state = 0.0
         self._x_prev = x
@@ -117,44 +167,42 @@ class RealtimeSim(QtCore.QObject):
         self._aw = (u - u_unsat) * 0.5  # tracking factor
         return u
 
-    def _plant_step(self, u: float, dt: float):
+    def _bind_plant(self):
+        # proc and the period are fixed between configure() calls: pick the model branch
+        # and fold K, tau and dt into per-step constants once, not on every tick
         pr = self.proc
+        dt = self._period
         if pr.type == "FOPDT":
-            # deadtime approximated by a bucket delay line of length theta
-            # implement as a circular buffer with step dt resolution
-            qlen = max(1, int(round(pr.theta / dt)))
-            if not hasattr(self, "_u_q"):
-                self._u_q = [0.0] * qlen
-                self._q_idx = 0
-            self._u_q[self._q_idx] = u
-            self._q_idx = (self._q_idx + 1) % qlen
-            u_delayed = self._u_q[self._q_idx] if qlen > 0 else u
             # first-order dynamics: y' = (K*u - y)/tau
-            self.pv += (pr.K * u_delayed - self.pv) * dt / max(pr.tau, 1e-12)
+            a = dt / max(pr.tau, 1e-12); Ka = pr.K * a
+
+            def step(u_delayed: float):
+                self.pv += Ka * u_delayed - a * self.pv
 
         elif pr.type == "SOPDT":
             # two first-orders in series with deadtime
-            qlen = max(1, int(round(pr.theta / dt)))
-            if not hasattr(self, "_u_q2"):
-                self._u_q2 = [0.0] * qlen
-                self._q2 = 0
-                self._x1 = 0.0
-            self._u_q2[self._q2] = u
-            self._q2 = (self._q2 + 1) % qlen
-            u_delayed = self._u_q2[self._q2] if qlen > 0 else u
-
-            self._x1 += (pr.K * u_delayed - self._x1) * dt / max(pr.tau1, 1e-12)
-            self.pv  += (self._x1 - self.pv) * dt / max(pr.tau2, 1e-12)
+            a1 = dt / max(pr.tau1, 1e-12); Ka1 = pr.K * a1
+            a2 = dt / max(pr.tau2, 1e-12)
+
+            def step(u_delayed: float):
+                self._x1 += Ka1 * u_delayed - a1 * self._x1
+                self.pv += a2 * (self._x1 - self.pv)
 
         else:  # Integrating with deadtime
-            qlen = max(1, int(round(pr.theta / dt)))
-            if not hasattr(self, "_u_qi"):
-                self._u_qi = [0.0] * qlen
-                self._qi = 0
-            self._u_qi[self._qi] = u
-            self._qi = (self._qi + 1) % qlen
-            u_delayed = self._u_qi[self._qi] if qlen > 0 else u
-            self.pv += pr.Ki * u_delayed * dt
+            Kidt = pr.Ki * dt
+
+            def step(u_delayed: float):
+                self.pv += Kidt * u_delayed
+
+        self._plant_fn = step
+
+    def _plant_step(self, u: float):
+        # deadtime approximated by a bucket delay line of length theta
+        # implemented as a circular buffer with step dt resolution
+        q = self._u_q
+        q[self._q_idx] = u
+        self._q_idx = (self._q_idx + 1) % q.size
+        self._plant_fn(float(q[self._q_idx]))
 
     def _run(self):
         self._t = 0.0
@@ -166,18 +214,86 @@ class RealtimeSim(QtCore.QObject):
         self.op = 0.0
 
         dt = self._period
+        batch = np.empty((max(1, min(_TICK_BATCH, int(_TICK_BATCH_MAX_S / dt))), 4))
+        k = 0
+        deadline = time.monotonic()
         while not self._stop.is_set():
-            u = self._pid_step(self.sp, self.pv, dt)
-            self.op = u
-            self._plant_step(u, dt)
+            with self._lock:
+                u = self._pid_step(self.sp, self.pv, dt)
+                self.op = u
+                self._plant_step(u)
 
             self._t += dt
-            self.tick.emit(self._t, self.sp, self.pv, self.op)
-            time.sleep(self._period)
+            batch[k] = (self._t, self.sp, self.pv, self.op)
+            k += 1
+            if k == batch.shape[0]:
+                self.ticks_batch.emit(batch.copy())
+                k = 0
+            # deadline scheduling: step time does not accumulate into the period,
+            # and stop() wakes the wait immediately
+            deadline += dt
+            self._stop.wait(max(0.0, deadline - time.monotonic()))
+        if k:
+            self.ticks_batch.emit(batch[:k].copy())  # flush the partial batch on stop
 
 
 # -------- batch simulator (offline) --------
 
+# process type -> kernel branch; anything else steps as Integrating (as in _plant_step)
+_PROC_KINDS = {"FOPDT": 0, "SOPDT": 1}
+
+
+@njit(cache=True)
+def _batch_kernel(kind, dt, K, tau, tau1, tau2, Ki, qlen,
+                  Kp, Ti, inv_Ti, Td, beta, alpha, d_on_pv, u_min, u_max, bias,
+                  SP, PV, OP):
+    """
+    RealtimeSim._pid_step/_plant_step unrolled over flat scalars so the whole
+    run compiles to one native loop. Reads SP per tick and fills PV/OP.
+    """
+    e_int = 0.0; d_state = 0.0; aw = 0.0; x_prev = 0.0
+    pv = 0.0; x1 = 0.0
+    u_q = np.zeros(qlen)
+    q_idx = 0
+    # per-step plant constants, folded as in RealtimeSim._bind_plant
+    a0 = dt / max(tau, 1e-12); Ka0 = K * a0
+    a1 = dt / max(tau1, 1e-12); Ka1 = K * a1
+    a2 = dt / max(tau2, 1e-12)
+    Kidt = Ki * dt
+    for i in range(SP.size):
+        sp = SP[i]
+
+        # PID (same equations as RealtimeSim._pid_step)
+        e = sp - pv
+        ep = beta * sp - pv
+        if Ti > 0:
+            e_int += (e - aw) * dt * inv_Ti
+        x = -pv if d_on_pv else e
+        if Td > 0:
+            a = alpha * Td
+            d_state += (Td / max(a, 1e-12)) * ((x - x_prev) / max(dt, 1e-12)) - (d_state / max(a, 1e-12)) * dt
+        else:
+            d_state = 0.0
+        x_prev = x
+        u_unsat = bias + Kp * (ep + e_int + Td * d_state)
+        u = max(u_min, min(u_max, u_unsat))
+        aw = (u - u_unsat) * 0.5
+
+        # plant (same equations as RealtimeSim._plant_step)
+        u_q[q_idx] = u
+        q_idx = (q_idx + 1) % qlen
+        u_delayed = u_q[q_idx]
+        if kind == 0:
+            pv += Ka0 * u_delayed - a0 * pv
+        elif kind == 1:
+            x1 += Ka1 * u_delayed - a1 * x1
+            pv += a2 * (x1 - pv)
+        else:
+            pv += Kidt * u_delayed
+
+        PV[i] = pv; OP[i] = u
+
+
 def simulate_batch(
     t_end: float,
     dt: float,
@@ -185,45 +301,38 @@ def simulate_batch(
     pid: PIDSpec,
     sp_schedule: Iterable[Tuple[float, float]],  # list of (time, sp_value)
     noise_std: float = 0.0,
-) -> Dict[str, List[float]]:
+) -> Dict[str, np.ndarray]:
     """
-    Deterministic offline simulation. Returns dict with lists: t, sp, pv, op.
+    Deterministic offline simulation. Returns dict of float64 arrays: t, sp, pv, op.
     Uses the same plant/controller equations as RealtimeSim.
     """
-    rt = RealtimeSim(period_s=dt)
-    rt.configure(proc=proc, pid=pid)
-
-    # init internal states (mirror realtime)
-    rt._t = 0.0
-    rt._e_int = 0.0
-    rt._d_state = 0.0
-    rt._aw = 0.0
-    rt._x_prev = 0.0
-    rt.pv = 0.0
-    rt.op = 0.0
-    rt.sp = 0.0
-
-    t = 0.0
-    idx_sched = 0
-    sched = sorted(list(sp_schedule), key=lambda x: x[0])
-    if sched:
-        rt.sp = sched[0][1]
-
-    T, SP, PV, OP = [], [], [], []
-
-    while t <= t_end + 1e-12:
-        # update setpoint if needed
-        while idx_sched + 1 < len(sched) and t >= sched[idx_sched + 1][0] - 1e-12:
-            idx_sched += 1
-            rt.sp = sched[idx_sched][1]
-
-        u = rt._pid_step(rt.sp, rt.pv, dt)
-        rt.op = u
-        rt._plant_step(u, dt)
-
-        pv_noisy = rt.pv + (random.gauss(0.0, noise_std) if noise_std > 0 else 0.0)
-
-        T.append(t); SP.append(rt.sp); PV.append(pv_noisy); OP.append(rt.op)
-        t += dt
+    dt = float(dt)
+    # resolve mode and process type once instead of per tick
+    Ti, Td, inv_Ti, d_on_pv = _pid_effective(pid)
+    kind = _PROC_KINDS.get(proc.type, 2)
+    qlen = max(1, int(round(proc.theta / dt)))
+
+    # tick times and the setpoint in force at each tick, gathered in one pass
+    n = max(0, int(np.floor((t_end + 1e-12) / dt)) + 1)
+    T = np.arange(n) * dt
+    sched = np.asarray(list(sp_schedule), dtype=np.float64).reshape(-1, 2)
+    if sched.shape[0]:
+        sched = sched[np.argsort(sched[:, 0], kind="stable")]
+        idx = np.searchsorted(sched[:, 0] - 1e-12, T, side="right") - 1
+        SP = sched[np.maximum(idx, 0), 1]
+    else:
+        SP = np.zeros(n)
+
+    PV, OP = np.empty(n), np.empty(n)
+    _batch_kernel(
+        kind, dt, float(proc.K), float(proc.tau), float(proc.tau1), float(proc.tau2), float(proc.Ki), qlen,
+        float(pid.Kp), float(Ti), float(inv_Ti), float(Td), float(pid.beta), float(pid.alpha), d_on_pv,
+        float(pid.u_min), float(pid.u_max), float(pid.bias),
+        SP, PV, OP,
+    )
+
+    if noise_std > 0:
+        # one vectorized draw instead of a random.gauss call per tick
+        PV += np.random.default_rng().normal(0.0, noise_std, size=n)
 
     return {"t": T, "sp": SP, "pv": PV, "op": OP}
@@ -1,11 +1,48 @@
 from __future__ import annotations
-import sqlite3, json, os
+import sqlite3, json, os, itertools
 from dataclasses import dataclass
+from collections import OrderedDict
 from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
+
+# Optional fast JSON for model-fit params/stats; stdlib json otherwise.
+try:
+    import orjson
+    HAS_ORJSON = True
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    _json_loads = orjson.loads
+except Exception:
+    HAS_ORJSON = False
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Optional CBOR encoding for model-fit params/stats (storage_format="cbor").
+try:
+    import cbor2
+    HAS_CBOR2 = True
+except Exception:
+    HAS_CBOR2 = False
+
+# Optional apsw read connection (backend="apsw"): thinner row loop for series/step-test reads.
+try:
+    import apsw
+    HAS_APSW = True
+except Exception:
+    HAS_APSW = False
+
+
+# Timestamps in samples/step_tests/model_fits are INTEGER microseconds since the epoch;
+# the public API keeps float seconds and converts at the boundary.
+# v1: integer-microsecond timestamps; v2: samples is WITHOUT ROWID keyed on (session_id, tag_id, ts);
+# v3: model_fits.params/stats hold JSON text or CBOR bytes (was params_json/stats_json);
+# v4: samples is a rowid table again so repeated timestamps (a restarted sim) are all kept
+SCHEMA_VERSION = 4
 
 SCHEMA = """
-PRAGMA journal_mode=WAL;
 CREATE TABLE IF NOT EXISTS tags(
   id INTEGER PRIMARY KEY,
   name TEXT UNIQUE NOT NULL,
@@ -17,23 +54,23 @@ CREATE TABLE IF NOT EXISTS sessions(
   end_ts REAL,
   notes TEXT
 );
+-- (session_id, tag_id, ts) is not unique: a restarted run logs the same timestamps again
 CREATE TABLE IF NOT EXISTS samples(
-  id INTEGER PRIMARY KEY,
   session_id INTEGER NOT NULL,
-  ts REAL NOT NULL,
   tag_id INTEGER NOT NULL,
+  ts INTEGER NOT NULL,
   value REAL NOT NULL,
   quality INTEGER DEFAULT 192,
   FOREIGN KEY(session_id) REFERENCES sessions(id),
   FOREIGN KEY(tag_id) REFERENCES tags(id)
 );
-CREATE INDEX IF NOT EXISTS idx_samples_session_ts ON samples(session_id, ts);
-CREATE INDEX IF NOT EXISTS idx_samples_tag ON samples(tag_id);
+-- covering index for read_series: one ordered range scan, no row lookups
+CREATE INDEX IF NOT EXISTS idx_samples_sess_tag_ts ON samples(session_id, tag_id, ts, value);
 
 CREATE TABLE IF NOT EXISTS step_tests(
   id INTEGER PRIMARY KEY,
   session_id INTEGER NOT NULL,
-  t0 REAL NOT NULL,
+  t0 INTEGER NOT NULL,
   tag_op INTEGER NOT NULL,
   tag_pv INTEGER NOT NULL,
   du REAL NOT NULL,
@@ -51,15 +88,73 @@ CREATE TABLE IF NOT EXISTS model_fits(
   session_id INTEGER NOT NULL,
   step_id INTEGER,
   model_type TEXT NOT NULL, -- FOPDT|SOPDT|Integrating
-  params_json TEXT NOT NULL,
-  stats_json TEXT NOT NULL,
-  created_ts REAL NOT NULL,
+  params BLOB NOT NULL,   -- JSON text or CBOR bytes, per storage_format
+  stats BLOB NOT NULL,
+  created_ts INTEGER NOT NULL,
   FOREIGN KEY(session_id) REFERENCES sessions(id),
   FOREIGN KEY(step_id) REFERENCES step_tests(id)
 );
 """
 
 
+# Hot-path SQL kept as constants so every call hits the connection's prepared-statement cache.
+_SQL_SELECT_TAG = "SELECT id FROM tags WHERE name=?"
+_SQL_INSERT_TAG = "INSERT INTO tags(name, kind) VALUES(?,?)"
+_SQL_INSERT_TAG_IGNORE = "INSERT OR IGNORE INTO tags(name, kind) VALUES(?,?)"
+# one round-trip get-or-add; the no-op update keeps the existing kind and makes RETURNING fire on conflict
+_SQL_UPSERT_TAG = "INSERT INTO tags(name, kind) VALUES(?,?) ON CONFLICT(name) DO UPDATE SET name=name RETURNING id"
+_SQL_INSERT_SESSION = "INSERT INTO sessions(start_ts, notes) VALUES(?,?)"
+_SQL_END_SESSION = "UPDATE sessions SET end_ts=? WHERE id=?"
+_SQL_INSERT_SAMPLE = "INSERT INTO samples(session_id, ts, tag_id, value, quality) VALUES(?,?,?,?,?)"
+# one statement for every t_min/t_max combination; open bounds are bound as the int64 extremes
+_SQL_READ_SERIES = "SELECT ts, value FROM samples WHERE session_id=? AND tag_id=? AND ts>=? AND ts<=? ORDER BY ts ASC"
+_SQL_INSERT_STEP = "INSERT INTO step_tests(session_id,t0,tag_op,tag_pv,du,pv0,op0,idx0,idx1) VALUES(?,?,?,?,?,?,?,?,?)"
+_SQL_LIST_STEPS = """SELECT st.id, st.t0, topt.name, tpv.name, st.du, st.pv0, st.op0, st.idx0, st.idx1
+               FROM step_tests st
+               JOIN tags topt ON st.tag_op = topt.id
+               JOIN tags tpv ON st.tag_pv = tpv.id
+               WHERE st.session_id=?
+               ORDER BY st.t0"""
+_SQL_INSERT_FIT = "INSERT INTO model_fits(session_id, step_id, model_type, params, stats, created_ts) VALUES(?,?,?,?,?,?)"
+_SQL_LIST_FITS = "SELECT id, step_id, model_type, params, stats, created_ts FROM model_fits WHERE session_id=? ORDER BY created_ts DESC"
+# JSON rows are read by json_extract in C (only $.r2 is parsed); CBOR rows come back as the raw blob
+_SQL_LIST_FITS_SUMMARY = """SELECT id, step_id, model_type, created_ts,
+               CASE WHEN typeof(stats)='text' THEN json_extract(stats, '$.r2') END,
+               CASE WHEN typeof(stats)='text' THEN NULL ELSE stats END
+               FROM model_fits
+               WHERE session_id=? AND (? IS NULL OR typeof(stats)<>'text' OR json_extract(stats, '$.r2') >= ?)
+               ORDER BY created_ts DESC"""
+
+_TS_MIN, _TS_MAX = -(2 ** 63), 2 ** 63 - 1
+# rows pulled per fetchmany() when reading series into arrays
+_FETCH_CHUNK = 10_000
+# names per "WHERE name IN (...)" lookup; stays under SQLite's older 999-variable limit
+_IN_CHUNK = 900
+# (session, tag) series kept by read_series_np; the least recently read is dropped first
+_SERIES_CACHE_MAX = 16
+# rows per insert_rows transaction; bounds WAL growth on backfills, live batches fit in one
+_COMMIT_CHUNK = 10_000
+# UPSERT ... RETURNING needs SQLite 3.35+; older builds keep the SELECT-then-INSERT path
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def _to_us(ts: float) -> int:
+    return round(ts * 1_000_000)
+
+
+def _from_us(us) -> float:
+    return us / 1e6
+
+
+def _decode_fit_field(v):
+    # CBOR rows come back as bytes, JSON rows as str; a file may hold both
+    if isinstance(v, (bytes, memoryview)):
+        if not HAS_CBOR2:
+            raise RuntimeError("model fit stored as CBOR; install cbor2 to read it")
+        return cbor2.loads(bytes(v))
+    return _json_loads(v)
+
+
 @dataclass(slots=True)
 class Sample:
     ts: float
@@ -73,95 +168,283 @@ class StorageService:
     SQLite historian + derived tables (step tests, model fits).
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, full_sync: bool = False, storage_format: str = "json", backend: str = "sqlite3"):
+        """
+        full_sync=True keeps synchronous=FULL (fsync on every commit) for maximum durability.
+        storage_format selects how new model-fit params/stats are written: "json" (TEXT,
+        readable by any SQLite tool) or "cbor" (compact BLOB, needs cbor2). Reads accept both.
+        backend="apsw" serves read_series/list_step_tests from a second, read-only apsw
+        connection (needs apsw); writes always go through sqlite3. WAL lets the two coexist.
+        """
+        if storage_format not in ("json", "cbor"):
+            raise ValueError(f"unknown storage_format {storage_format!r}")
+        if storage_format == "cbor" and not HAS_CBOR2:
+            raise RuntimeError("storage_format='cbor' requires the cbor2 package")
+        if backend not in ("sqlite3", "apsw"):
+            raise ValueError(f"unknown backend {backend!r}")
+        if backend == "apsw" and not HAS_APSW:
+            raise RuntimeError("backend='apsw' requires the apsw package")
+        self.storage_format = storage_format
+        self.backend = backend
+        self._encode = cbor2.dumps if storage_format == "cbor" else _json_dumps
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self.conn = self._open_conn(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
         self.conn.execute("PRAGMA foreign_keys=ON;")
-        for statement in filter(None, SCHEMA.split(";")):
-            self.conn.execute(statement)
+        # historian tuning: WAL + NORMAL only fsyncs at checkpoints, temp b-trees in RAM,
+        # mmap'd reads and a 64 MiB page cache for range scans
+        self.conn.execute(f"PRAGMA synchronous={'FULL' if full_sync else 'NORMAL'};")
+        self.conn.execute("PRAGMA temp_store=MEMORY;")
+        self.conn.execute("PRAGMA mmap_size=268435456;")
+        self.conn.execute("PRAGMA cache_size=-65536;")
+        self.conn.execute("PRAGMA wal_autocheckpoint=1000;")
+        self._apply_schema()
+        self._migrate()
+        # read-only paths; opened after migration so it never sees the pre-migration schema
+        self._rconn = self._open_read_conn(db_path) if backend == "apsw" else self.conn
+        self._tag_cache: Dict[str, int] = {}  # name -> id; tags are never deleted
+        # (session_id, tag_id) -> (int64 ts_us, read-only (N, 2) rows); windowed reads slice it,
+        # LRU-bounded to _SERIES_CACHE_MAX; inserts and end_session drop the session's entries
+        self._series_cache: OrderedDict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = OrderedDict()
+
+    @staticmethod
+    def _open_conn(db_path: str) -> sqlite3.Connection:
+        return sqlite3.connect(db_path, isolation_level=None, check_same_thread=False, cached_statements=256)
+
+    @staticmethod
+    def _open_read_conn(db_path: str):
+        conn = apsw.Connection(db_path)
+        conn.execute("PRAGMA query_only=ON;")
+        conn.execute("PRAGMA mmap_size=268435456;")
+        conn.execute("PRAGMA cache_size=-65536;")
+        return conn
+
+    def _apply_schema(self):
+        # one script compile; executescript commits first, which is fine at init time
+        self.conn.executescript(SCHEMA)
+
+    # -------- schema migration --------
+    def _migrate(self):
+        version = int(self.conn.execute("PRAGMA user_version").fetchone()[0])
+        if version >= SCHEMA_VERSION:
+            return
+        cols = {r[1]: r[2].upper() for r in self.conn.execute("PRAGMA table_info(samples)")}
+        # v2/v3 files hold a WITHOUT ROWID samples table keyed on (session_id, tag_id, ts)
+        keyed = any(r[3] == "pk" for r in self.conn.execute("PRAGMA index_list(samples)"))
+        if "id" in cols or keyed:
+            # pre-v2 files have an id column; pre-v1 files also still hold REAL-seconds timestamps
+            self._rebuild_tables(real_seconds=cols.get("ts") == "REAL", order_by_id="id" in cols)
+        fit_cols = {r[1] for r in self.conn.execute("PRAGMA table_info(model_fits)")}
+        if "params_json" in fit_cols:
+            # pre-v3 column names; the stored JSON text is read as-is
+            self.conn.execute("ALTER TABLE model_fits RENAME COLUMN params_json TO params")
+            self.conn.execute("ALTER TABLE model_fits RENAME COLUMN stats_json TO stats")
+        self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _rebuild_tables(self, real_seconds: bool, order_by_id: bool):
+        """Recreate samples/step_tests/model_fits from SCHEMA and copy the rows across."""
+        tables = ("samples", "step_tests", "model_fits")
+        us = (lambda c: f"CAST(ROUND({c} * 1000000) AS INTEGER)") if real_seconds else (lambda c: c)
+        old_cols = {r[1] for r in self.conn.execute("PRAGMA table_info(model_fits)")}
+        fit_cols = "params_json, stats_json" if "params_json" in old_cols else "params, stats"
+        indexes = [idx for (idx,) in self.conn.execute(
+            f"SELECT name FROM sqlite_master WHERE type='index' AND sql IS NOT NULL "
+            f"AND tbl_name IN ({','.join('?' * len(tables))})", tables)]
+        # move the old tables (and their indexes) aside, recreate from SCHEMA, copy across;
+        # a single script with its own BEGIN/COMMIT so the rebuild stays atomic
+        script = "\n".join([
+            "BEGIN IMMEDIATE;",
+            *(f"DROP INDEX {idx};" for idx in indexes),
+            *(f"ALTER TABLE {name} RENAME TO _{name}_old;" for name in tables),
+            SCHEMA,
+            # every row is kept, duplicate (session, tag, ts) samples included
+            "INSERT INTO samples(session_id, tag_id, ts, value, quality) "
+            f"SELECT session_id, tag_id, {us('ts')}, value, quality FROM _samples_old"
+            f"{' ORDER BY id' if order_by_id else ''};",
+            "INSERT INTO step_tests(id, session_id, t0, tag_op, tag_pv, du, pv0, op0, idx0, idx1) "
+            f"SELECT id, session_id, {us('t0')}, tag_op, tag_pv, du, pv0, op0, idx0, idx1 FROM _step_tests_old;",
+            "INSERT INTO model_fits(id, session_id, step_id, model_type, params, stats, created_ts) "
+            f"SELECT id, session_id, step_id, model_type, {fit_cols}, {us('created_ts')} FROM _model_fits_old;",
+            *(f"DROP TABLE _{name}_old;" for name in tables),
+            "COMMIT;",
+        ])
+        self.conn.execute("PRAGMA foreign_keys=OFF;")
+        try:
+            self.conn.executescript(script)
+        except Exception:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            raise
+        finally:
+            self.conn.execute("PRAGMA foreign_keys=ON;")
 
     # -------- tags --------
     def _get_or_add_tag(self, name: str, kind: str) -> int:
-        cur = self.conn.execute("SELECT id FROM tags WHERE name=?", (name,))
-        row = cur.fetchone()
-        if row:
-            return int(row[0])
-        cur = self.conn.execute("INSERT INTO tags(name, kind) VALUES(?,?)", (name, kind))
-        return int(cur.lastrowid)
+        tag_id = self._tag_cache.get(name)
+        if tag_id is not None:
+            return tag_id
+        if _HAS_RETURNING:
+            tag_id = int(self.conn.execute(_SQL_UPSERT_TAG, (name, kind)).fetchone()[0])
+        else:
+            cur = self.conn.execute(_SQL_SELECT_TAG, (name,))
+            row = cur.fetchone()
+            if row:
+                tag_id = int(row[0])
+            else:
+                cur = self.conn.execute(_SQL_INSERT_TAG, (name, kind))
+                tag_id = int(cur.lastrowid)
+        self._tag_cache[name] = tag_id
+        return tag_id
 
     def ensure_tags(self, mapping: Dict[str, str]) -> Dict[str, int]:
         """
         mapping: {"TCAF":"PV", "TCAF.SP":"SP", "PCAF":"OP"}
         returns: {"TCAF":1, "TCAF.SP":2, "PCAF":3}
         """
-        out: Dict[str, int] = {}
-        for name, kind in mapping.items():
-            out[name] = self._get_or_add_tag(name, kind)
-        return out
+        missing = [(name, kind) for name, kind in mapping.items() if name not in self._tag_cache]
+        if missing:
+            # one upsert pass + one lookup per chunk instead of SELECT/INSERT per tag
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(_SQL_INSERT_TAG_IGNORE, missing)
+                for i in range(0, len(missing), _IN_CHUNK):
+                    names = [name for name, _ in missing[i:i + _IN_CHUNK]]
+                    q = f"SELECT id, name FROM tags WHERE name IN ({','.join('?' * len(names))})"
+                    for tag_id, name in self.conn.execute(q, names):
+                        self._tag_cache[name] = int(tag_id)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                self._tag_cache.clear()  # tags added in this transaction were rolled back too
+                raise
+        return {name: self._tag_cache[name] for name in mapping}
 
     # -------- sessions --------
     def start_session(self, start_ts: float, notes: str = "") -> int:
-        cur = self.conn.execute("INSERT INTO sessions(start_ts, notes) VALUES(?,?)", (start_ts, notes))
+        cur = self.conn.execute(_SQL_INSERT_SESSION, (start_ts, notes))
         return int(cur.lastrowid)
 
     def end_session(self, session_id: int, end_ts: float):
-        self.conn.execute("UPDATE sessions SET end_ts=? WHERE id=?", (end_ts, session_id))
+        self.conn.execute(_SQL_END_SESSION, (end_ts, session_id))
+        self._drop_series(session_id)
 
     # -------- samples --------
-    def insert_samples(self, session_id: int, samples: Iterable[Sample]):
-        # batch insert; ensure tags exist on the fly
-        names = {s.tag for s in samples}
-        # need to iterate twice: convert to list
-        samples = list(samples)
-        tag_ids = {n: self._get_or_add_tag(n, "PV") for n in names}  # default kind PV if unknown
-        rows = [(session_id, s.ts, tag_ids[s.tag], s.value, s.quality) for s in samples]
-        self.conn.executemany(
-            "INSERT INTO samples(session_id, ts, tag_id, value, quality) VALUES(?,?,?,?,?)",
-            rows,
-        )
+    def insert_samples(self, session_id: int, samples: Iterable[Sample | Tuple]):
+        """
+        Accepts Sample objects or raw (ts, tag, value[, quality]) tuples; tuples go
+        straight to insert_rows without the Sample attribute indirection.
+        """
+        it = iter(samples)
+        first = next(it, None)
+        if first is None:
+            return
+        rows = itertools.chain((first,), it)
+        if hasattr(first, "tag"):
+            rows = ((s.ts, s.tag, s.value, s.quality) for s in rows)
+        self.insert_rows(session_id, rows)
+
+    def insert_rows(self, session_id: int, rows: Iterable[Tuple]):
+        """
+        Flat fast path for hot loops: rows are (ts, tag, value) or
+        (ts, tag, value, quality) tuples, no Sample objects needed.
+        Large inputs (backfills) are committed every _COMMIT_CHUNK rows so the WAL can
+        be checkpointed between chunks; if a chunk fails, earlier chunks stay committed.
+        """
+        tag_cache = self._tag_cache
+
+        def params():
+            # single pass straight into executemany; tags are resolved (and created) on first sight
+            for r in rows:
+                tag_id = tag_cache.get(r[1])
+                if tag_id is None:
+                    tag_id = self._get_or_add_tag(r[1], "PV")  # default kind PV if unknown
+                yield (session_id, _to_us(r[0]), tag_id, r[2], r[3] if len(r) > 3 else 192)
+
+        # one transaction per chunk instead of an autocommit per row
+        it = params()
+        try:
+            while True:
+                self.conn.execute("BEGIN IMMEDIATE")
+                try:
+                    chunk = list(itertools.islice(it, _COMMIT_CHUNK))
+                    if chunk:
+                        self.conn.executemany(_SQL_INSERT_SAMPLE, chunk)
+                    self.conn.execute("COMMIT")
+                except Exception:
+                    self.conn.execute("ROLLBACK")
+                    self._tag_cache.clear()  # tags added in this transaction were rolled back too
+                    raise
+                if len(chunk) < _COMMIT_CHUNK:
+                    break
+        finally:
+            self._drop_series(session_id)
+
+    def _drop_series(self, session_id: int):
+        for key in [k for k in self._series_cache if k[0] == session_id]:
+            del self._series_cache[key]
 
     def read_series(self, session_id: int, tag: str, t_min: float | None = None, t_max: float | None = None) -> List[Tuple[float, float]]:
-        cur = self.conn.execute("SELECT id FROM tags WHERE name=?", (tag,))
-        r = cur.fetchone()
-        if not r:
-            return []
-        tag_id = int(r[0])
-        q = "SELECT ts, value FROM samples WHERE session_id=? AND tag_id=?"
-        params: List[float | int] = [session_id, tag_id]
-        if t_min is not None:
-            q += " AND ts>=?"
-            params.append(t_min)
-        if t_max is not None:
-            q += " AND ts<=?"
-            params.append(t_max)
-        q += " ORDER BY ts ASC"
-        return [(float(ts), float(val)) for ts, val in self.conn.execute(q, params)]
+        return list(map(tuple, self.read_series_np(session_id, tag, t_min, t_max).tolist()))
+
+    def read_series_np(self, session_id: int, tag: str, t_min: float | None = None, t_max: float | None = None) -> np.ndarray:
+        """
+        (N, 2) float64 array of (ts seconds, value) rows ordered by ts; no per-row Python tuples kept.
+        The first read of a (session, tag) loads the whole series once; later windows
+        (zoom/pan) are binary-searched slices of it. The result is a read-only view.
+        """
+        tag_id = self._tag_cache.get(tag)
+        if tag_id is None:
+            r = self.conn.execute(_SQL_SELECT_TAG, (tag,)).fetchone()
+            if not r:
+                return np.empty((0, 2))
+            tag_id = self._tag_cache[tag] = int(r[0])
+        key = (session_id, tag_id)
+        hit = self._series_cache.get(key)
+        if hit is None:
+            hit = self._series_cache[key] = self._load_series(session_id, tag_id)
+            if len(self._series_cache) > _SERIES_CACHE_MAX:
+                self._series_cache.popitem(last=False)
+        else:
+            self._series_cache.move_to_end(key)
+        ts_us, arr = hit
+        i0 = 0 if t_min is None else int(np.searchsorted(ts_us, _to_us(t_min), side="left"))
+        i1 = len(ts_us) if t_max is None else int(np.searchsorted(ts_us, _to_us(t_max), side="right"))
+        return arr[i0:i1]
+
+    def _load_series(self, session_id: int, tag_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        # plain cursor iteration works on both backends (apsw has no fetchmany)
+        cur = self._rconn.execute(_SQL_READ_SERIES, (session_id, tag_id, _TS_MIN, _TS_MAX))
+        chunks = []
+        while True:
+            rows = list(itertools.islice(cur, _FETCH_CHUNK))
+            if not rows:
+                break
+            chunks.append(np.array(rows, dtype=np.float64))
+        if not chunks:
+            return np.empty(0, dtype=np.int64), np.empty((0, 2))
+        out = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+        # exact integer keys for the window search; float64 holds microsecond epochs exactly
+        ts_us = out[:, 0].astype(np.int64)
+        out[:, 0] /= 1e6  # integer microseconds -> seconds
+        out.flags.writeable = False
+        return ts_us, out
 
     # -------- step tests --------
     def record_step_test(self, session_id: int, t0: float, tag_op: str, tag_pv: str, du: float, pv0: float, op0: float, idx0: int, idx1: int) -> int:
-        op_id = self._get_or_add_tag(tag_op, "OP")
-        pv_id = self._get_or_add_tag(tag_pv, "PV")
+        ids = self.ensure_tags({tag_pv: "PV", tag_op: "OP"})
+        op_id, pv_id = ids[tag_op], ids[tag_pv]
         cur = self.conn.execute(
-            "INSERT INTO step_tests(session_id,t0,tag_op,tag_pv,du,pv0,op0,idx0,idx1) VALUES(?,?,?,?,?,?,?,?,?)",
-            (session_id, t0, op_id, pv_id, du, pv0, op0, idx0, idx1),
+            _SQL_INSERT_STEP,
+            (session_id, _to_us(t0), op_id, pv_id, du, pv0, op0, idx0, idx1),
         )
         return int(cur.lastrowid)
 
     def list_step_tests(self, session_id: int) -> List[Dict]:
         out = []
-        cur = self.conn.execute(
-            """SELECT st.id, st.t0, topt.name, tpv.name, st.du, st.pv0, st.op0, st.idx0, st.idx1
-               FROM step_tests st
-               JOIN tags topt ON st.tag_op = topt.id
-               JOIN tags tpv ON st.tag_pv = tpv.id
-               WHERE st.session_id=?
-               ORDER BY st.t0""",
-            (session_id,),
-        )
-        for row in cur.fetchall():
+        for row in self._rconn.execute(_SQL_LIST_STEPS, (session_id,)):
             out.append({
-                "id": int(row[0]), "t0": float(row[1]), "tag_op": row[2], "tag_pv": row[3],
+                "id": int(row[0]), "t0": _from_us(row[1]), "tag_op": row[2], "tag_pv": row[3],
                 "du": float(row[4]), "pv0": float(row[5]), "op0": float(row[6]),
                 "idx0": int(row[7]), "idx1": int(row[8]),
             })
@@ -170,30 +453,52 @@ class StorageService:
     # -------- model fits --------
     def insert_model_fit(self, session_id: int, model_type: str, params: Dict, stats: Dict, step_id: int | None, created_ts: float) -> int:
         cur = self.conn.execute(
-            "INSERT INTO model_fits(session_id, step_id, model_type, params_json, stats_json, created_ts) VALUES(?,?,?,?,?,?)",
-            (session_id, step_id, model_type, json.dumps(params), json.dumps(stats), created_ts),
+            _SQL_INSERT_FIT,
+            (session_id, step_id, model_type, self._encode(params), self._encode(stats), _to_us(created_ts)),
         )
         return int(cur.lastrowid)
 
     def list_model_fits(self, session_id: int) -> List[Dict]:
-        cur = self.conn.execute(
-            "SELECT id, step_id, model_type, params_json, stats_json, created_ts FROM model_fits WHERE session_id=? ORDER BY created_ts DESC",
-            (session_id,),
-        )
+        """Full rows with "params"/"stats" decoded to plain dicts; list views use list_model_fits_summary()."""
+        cur = self.conn.execute(_SQL_LIST_FITS, (session_id,))
         out = []
         for r in cur.fetchall():
             out.append({
                 "id": int(r[0]),
                 "step_id": None if r[1] is None else int(r[1]),
                 "model_type": str(r[2]),
-                "params": json.loads(r[3]),
-                "stats": json.loads(r[4]),
-                "created_ts": float(r[5]),
+                "params": _decode_fit_field(r[3]),
+                "stats": _decode_fit_field(r[4]),
+                "created_ts": _from_us(r[5]),
+            })
+        return out
+
+    def list_model_fits_summary(self, session_id: int, min_r2: float | None = None) -> List[Dict]:
+        """
+        List-view rows (id, step_id, model_type, created_ts, r2) without decoding params/stats.
+        min_r2 filters in SQL for JSON rows; CBOR rows are decoded here to read r2.
+        """
+        out = []
+        for r in self.conn.execute(_SQL_LIST_FITS_SUMMARY, (session_id, min_r2, min_r2)):
+            r2 = r[4]
+            if r[5] is not None:
+                r2 = _decode_fit_field(r[5]).get("r2")
+                if min_r2 is not None and (r2 is None or r2 < min_r2):
+                    continue
+            out.append({
+                "id": int(r[0]),
+                "step_id": None if r[1] is None else int(r[1]),
+                "model_type": str(r[2]),
+                "created_ts": _from_us(r[3]),
+                "r2": None if r2 is None else float(r2),
             })
         return out
 
     def close(self):
-        try:
-            self.conn.close()
-        except Exception:
-            pass
+        self._series_cache.clear()
+        conns = (self.conn,) if self._rconn is self.conn else (self._rconn, self.conn)
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict
+from typing import Callable, Dict
 
 
 @dataclass(slots=True)
@@ -19,19 +19,33 @@ def lambda_imc(rule_input: Dict) -> TuningResult:
     SOPDT: {"type":"SOPDT","K":..,"tau1":..,"tau2":..,"theta":..,"lambda":..}
     Integrating: {"type":"Integrating","Ki":..,"theta":..,"lambda":..}
     """
-    t = rule_input.get("type", "FOPDT")
-    lam = float(rule_input.get("lambda", 10.0))
-    if t == "FOPDT":
-        K, tau, theta = float(rule_input["K"]), float(rule_input["tau"]), float(rule_input["theta"])
-        Kp = tau / (K * (lam + theta)); Ti = tau; Td = 0.0
-    elif t == "SOPDT":
-        K, tau1, tau2, theta = float(rule_input["K"]), float(rule_input["tau1"]), float(rule_input["tau2"]), float(rule_input["theta"])
+    rule = make_lambda_imc(rule_input.get("type", "FOPDT"), rule_input)
+    return rule(float(rule_input.get("lambda", 10.0)))
+
+
+def make_lambda_imc(model: str, params: Dict) -> Callable[[float], TuningResult]:
+    """
+    Lambda/IMC rule specialised for one model: the type is resolved and params coerced
+    once, the returned rule(lam) only evaluates the formula (for lambda sweeps).
+    """
+    if model == "FOPDT":
+        K, tau, theta = float(params["K"]), float(params["tau"]), float(params["theta"])
+
+        def rule(lam: float) -> TuningResult:
+            return TuningResult(tau / (K * (lam + theta)), tau, 0.0)
+    elif model == "SOPDT":
+        K, tau1, tau2, theta = float(params["K"]), float(params["tau1"]), float(params["tau2"]), float(params["theta"])
         tau_sum = tau1 + tau2
-        Kp = tau_sum / (K * (lam + theta)); Ti = tau_sum; Td = (tau1 * tau2) / max(1e-12, tau_sum)
+        Td = (tau1 * tau2) / max(1e-12, tau_sum)
+
+        def rule(lam: float) -> TuningResult:
+            return TuningResult(tau_sum / (K * (lam + theta)), tau_sum, Td)
     else:
-        Ki, theta = float(rule_input["Ki"]), float(rule_input["theta"])
-        Kp = 1.0 / (Ki * (lam + theta)); Ti = 4.0 * (lam + theta); Td = 0.0
-    return TuningResult(float(Kp), float(Ti), float(Td))
+        Ki, theta = float(params["Ki"]), float(params["theta"])
+
+        def rule(lam: float) -> TuningResult:
+            return TuningResult(1.0 / (Ki * (lam + theta)), 4.0 * (lam + theta), 0.0)
+    return rule
 
 
 # -------- SIMC --------
@@ -41,23 +55,31 @@ def simc(rule_input: Dict) -> TuningResult:
     SIMC rules (Skogestad simplified).
     Inputs same as lambda_imc but parameter name 'tauc' instead of 'lambda'.
     """
-    t = rule_input.get("type", "FOPDT")
-    tauc = float(rule_input.get("tauc", 10.0))
-    if t == "FOPDT":
-        K, tau, theta = float(rule_input["K"]), float(rule_input["tau"]), float(rule_input["theta"])
-        Kp = tau / (K * (tauc + theta))
-        Ti = min(tau, 4.0 * (tauc + theta))
+    rule = make_simc(rule_input.get("type", "FOPDT"), rule_input)
+    return rule(float(rule_input.get("tauc", 10.0)))
+
+
+def make_simc(model: str, params: Dict) -> Callable[[float], TuningResult]:
+    """SIMC counterpart of make_lambda_imc: returns rule(tauc) for one model."""
+    if model == "FOPDT":
+        K, tau, theta = float(params["K"]), float(params["tau"]), float(params["theta"])
         Td = 0.5 * theta
-    elif t == "SOPDT":
-        K, tau1, tau2, theta = float(rule_input["K"]), float(rule_input["tau1"]), float(rule_input["tau2"]), float(rule_input["theta"])
+
+        def rule(tauc: float) -> TuningResult:
+            return TuningResult(tau / (K * (tauc + theta)), min(tau, 4.0 * (tauc + theta)), Td)
+    elif model == "SOPDT":
+        K, tau1, tau2, theta = float(params["K"]), float(params["tau1"]), float(params["tau2"]), float(params["theta"])
         tau_sum = tau1 + tau2
-        Kp = tau_sum / (K * (tauc + theta))
-        Ti = min(tau_sum, 4.0 * (tauc + theta))
         Td = (tau1 * tau2) / max(1e-12, tau_sum)
+
+        def rule(tauc: float) -> TuningResult:
+            return TuningResult(tau_sum / (K * (tauc + theta)), min(tau_sum, 4.0 * (tauc + theta)), Td)
     else:
-        Ki, theta = float(rule_input["Ki"]), float(rule_input["theta"])
-        Kp = 1.0 / (Ki * (tauc + theta)); Ti = 4.0 * (tauc + theta); Td = 0.0
-    return TuningResult(float(Kp), float(Ti), float(Td))
+        Ki, theta = float(params["Ki"]), float(params["theta"])
+
+        def rule(tauc: float) -> TuningResult:
+            return TuningResult(1.0 / (Ki * (tauc + theta)), 4.0 * (tauc + theta), 0.0)
+    return rule
 
 
 # -------- ZN reaction-curve (heuristic) --------
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass, field, asdict
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
 from PySide6 import QtCore
 
 
@@ -44,8 +45,9 @@ class AppState(QtCore.QObject):
             self.currentCaseChanged.emit(name)
 
     # --- tag map (SP/PV/OP)
-    def tags(self) -> Dict[str, str]:
-        return dict(self._tags)
+    def tags(self) -> Mapping[str, str]:
+        # read-only live view, no per-call copy; use to_dict() for a snapshot
+        return MappingProxyType(self._tags)
 
     def set_tag(self, role: str, tag: str):
         role = role.upper()
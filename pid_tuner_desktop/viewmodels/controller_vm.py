@@ -1,16 +1,29 @@
 from __future__ import annotations
+from dataclasses import dataclass
 from typing import Literal
 from PySide6 import QtCore
 
 
+@dataclass(slots=True, frozen=True)
+class ControllerParams:
+    """Immutable snapshot of the controller settings carried by paramChanged."""
+    Kp: float
+    Ti: float
+    Td: float
+    beta: float
+    alpha: float
+    mode: str
+    d_on: str
+
+
 class ControllerVM(QtCore.QObject):
     """
     PID controller parameters viewmodel.
     Supports P/PI/PID modes, derivative on PV or Error, setpoint weight β, filter α.
-    Emits paramChanged(Kp, Ti, Td, beta, alpha, mode, d_on).
+    Emits paramChanged(ControllerParams) — one object instead of seven marshalled arguments.
     """
 
-    paramChanged = QtCore.Signal(float, float, float, float, float, str, str)
+    paramChanged = QtCore.Signal(object)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -21,6 +34,7 @@ class ControllerVM(QtCore.QObject):
         self._Td: float = 0.0
         self._beta: float = 1.0
         self._alpha: float = 0.125  # derivative filter factor (0..1]
+        self._params = self._snapshot()  # last emitted snapshot; rebuilt only on change
 
     # --- getters
     def mode(self) -> str: return self._mode
@@ -30,8 +44,10 @@ class ControllerVM(QtCore.QObject):
     def Td(self) -> float: return self._Td
     def beta(self) -> float: return self._beta
     def alpha(self) -> float: return self._alpha
+    def params(self) -> ControllerParams: return self._params
 
     # --- setters (emit on change)
+    @QtCore.Slot(str)
     def set_mode(self, mode: str):
         mode = mode.upper()
         if mode not in ("P", "PI", "PID"):
@@ -41,36 +57,42 @@ class ControllerVM(QtCore.QObject):
             self._normalize_by_mode()
             self._emit()
 
+    @QtCore.Slot(str)
     def set_derivative_on(self, d_on: str):
         d_on = "PV" if str(d_on).lower().startswith("pv") else "Error"
         if self._d_on != d_on:
             self._d_on = d_on
             self._emit()
 
+    @QtCore.Slot(float)
     def set_Kp(self, Kp: float):
         Kp = float(max(0.0, Kp))
         if self._Kp != Kp:
             self._Kp = Kp
             self._emit()
 
+    @QtCore.Slot(float)
     def set_Ti(self, Ti: float):
         Ti = float(max(0.0, Ti))
         if self._Ti != Ti:
             self._Ti = Ti
             self._emit()
 
+    @QtCore.Slot(float)
     def set_Td(self, Td: float):
         Td = float(max(0.0, Td))
         if self._Td != Td:
             self._Td = Td
             self._emit()
 
+    @QtCore.Slot(float)
     def set_beta(self, beta: float):
         beta = float(max(0.0, min(2.0, beta)))
         if self._beta != beta:
             self._beta = beta
             self._emit()
 
+    @QtCore.Slot(float)
     def set_alpha(self, alpha: float):
         alpha = float(max(1e-6, min(1.0, alpha)))
         if self._alpha != alpha:
@@ -79,7 +101,8 @@ class ControllerVM(QtCore.QObject):
 
     # --- utilities
     def as_tuple(self):
-        return (self._Kp, self._Ti, self._Td, self._beta, self._alpha, self._mode, self._d_on)
+        p = self._params
+        return (p.Kp, p.Ti, p.Td, p.beta, p.alpha, p.mode, p.d_on)
 
     def apply(self, Kp: float, Ti: float, Td: float, beta: float | None = None, alpha: float | None = None):
         self._Kp = max(0.0, float(Kp))
@@ -99,5 +122,9 @@ class ControllerVM(QtCore.QObject):
         elif self._mode == "PI":
             self._Td = 0.0
 
+    def _snapshot(self) -> ControllerParams:
+        return ControllerParams(self._Kp, self._Ti, self._Td, self._beta, self._alpha, self._mode, self._d_on)
+
     def _emit(self):
-        self.paramChanged.emit(self._Kp, self._Ti, self._Td, self._beta, self._alpha, self._mode, self._d_on)
+        self._params = self._snapshot()
+        self.paramChanged.emit(self._params)
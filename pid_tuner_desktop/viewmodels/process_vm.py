@@ -26,10 +26,15 @@ class ProcessVM(QtCore.QObject):
         self._zeta: float = 1.0  # damping factor
         # Integrating: Ki (gain of integrator), theta
         self._Ki: float = 0.1
+        # last get_params() result; setters drop it, so repeat reads share one dict
+        self._params_cache: dict | None = None
 
     # --- getters
     def model(self) -> str: return self._model
     def get_params(self) -> dict:
+        """Current params; the returned dict is shared between calls, treat it as read-only."""
+        if self._params_cache is not None:
+            return self._params_cache
         d = {"model": self._model}
         if self._model == "FOPDT":
             d.update({"K": self._K, "tau": self._tau, "theta": self._theta})
@@ -37,6 +42,7 @@ class ProcessVM(QtCore.QObject):
             d.update({"K": self._K, "tau1": self._tau, "tau2": self._tau2, "theta": self._theta, "zeta": self._zeta})
         else:
             d.update({"Ki": self._Ki, "theta": self._theta})
+        self._params_cache = d
         return d
 
     # --- setters
@@ -47,32 +53,37 @@ class ProcessVM(QtCore.QObject):
         model = "Integrating" if model == "INTEGRATING" else model
         if model != self._model:
             self._model = model
+            self._params_cache = None
             self.modelChanged.emit(model)
             self.paramsChanged.emit(self.get_params())
 
     def set_fopdt(self, K: float, tau: float, theta: float):
-        self._model = "FOPDT"
-        self._K = float(K)
-        self._tau = max(1e-9, float(tau))
-        self._theta = max(0.0, float(theta))
-        self.modelChanged.emit(self._model)
-        self.paramsChanged.emit(self.get_params())
+        K, tau, theta = float(K), max(1e-9, float(tau)), max(0.0, float(theta))
+        if self._model == "FOPDT" and (self._K, self._tau, self._theta) == (K, tau, theta):
+            return  # no-op: spare every listener a refresh
+        self._K, self._tau, self._theta = K, tau, theta
+        self._commit("FOPDT")
 
     def set_sopdt(self, K: float, tau1: float, tau2: float, theta: float, zeta: float = 1.0):
-        self._model = "SOPDT"
-        self._K = float(K)
-        self._tau = max(1e-9, float(tau1))
-        self._tau2 = max(1e-9, float(tau2))
-        self._theta = max(0.0, float(theta))
-        self._zeta = max(0.1, float(zeta))
-        self.modelChanged.emit(self._model)
-        self.paramsChanged.emit(self.get_params())
+        new = (float(K), max(1e-9, float(tau1)), max(1e-9, float(tau2)), max(0.0, float(theta)), max(0.1, float(zeta)))
+        if self._model == "SOPDT" and (self._K, self._tau, self._tau2, self._theta, self._zeta) == new:
+            return
+        self._K, self._tau, self._tau2, self._theta, self._zeta = new
+        self._commit("SOPDT")
 
     def set_integrator(self, Ki: float, theta: float):
-        self._model = "Integrating"
-        self._Ki = float(Ki)
-        self._theta = max(0.0, float(theta))
-        self.modelChanged.emit(self._model)
+        Ki, theta = float(Ki), max(0.0, float(theta))
+        if self._model == "Integrating" and (self._Ki, self._theta) == (Ki, theta):
+            return
+        self._Ki, self._theta = Ki, theta
+        self._commit("Integrating")
+
+    def _commit(self, model: str):
+        # params changed: drop the cached dict; modelChanged only when the model type moved
+        self._params_cache = None
+        if model != self._model:
+            self._model = model
+            self.modelChanged.emit(model)
         self.paramsChanged.emit(self.get_params())
 
     # convenience accessors
@@ -1,19 +1,22 @@
 from __future__ import annotations
-from typing import List, Tuple
+from typing import Tuple
+
+import numpy as np
 from PySide6 import QtCore
-from services.simulation_service import RealtimeSim
+from services.simulation_service import PIDSpec, ProcessSpec, RealtimeSim
 
 
 class SimulationVM(QtCore.QObject):
     """
     Simulation configuration + history buffer.
-    Owns a RealtimeSim service and mirrors its ticks.
+    Owns a RealtimeSim service and mirrors its ticks; new samples are re-emitted
+    at most every FLUSH_MS as one (n, 4) array of rows (t, sp, pv, op).
     Signals:
       runningChanged(bool)
       spChanged(float)
       noiseChanged(float)
       speedChanged(float)
-      tick(t, sp, pv, op)
+      ticksBatch(np.ndarray)
       historyCleared()
     """
 
@@ -21,65 +24,112 @@ class SimulationVM(QtCore.QObject):
     spChanged = QtCore.Signal(float)
     noiseChanged = QtCore.Signal(float)
     speedChanged = QtCore.Signal(float)
-    tick = QtCore.Signal(float, float, float, float)
+    ticksBatch = QtCore.Signal(object)
     historyCleared = QtCore.Signal()
 
-    def __init__(self, period_s: float = 1.0, parent=None):
+    FLUSH_MS = 33  # ~30 Hz: views redraw per flush, not per sample
+
+    def __init__(self, period_s: float = 1.0, parent=None, *, history_capacity: int = 100_000):
         super().__init__(parent)
         self._sim = RealtimeSim(period_s=period_s)
-        self._sim.tick.connect(self._on_tick)
+        self._sim.ticks_batch.connect(self._on_ticks_batch)
         self._sp: float = 5.0
         self._noise_std: float = 0.0    # not used by stub engine yet
         self._speed: float = 1.0        # multiplier (future)
         self._running: bool = False
 
-        self._ts: List[float] = []
-        self._sps: List[float] = []
-        self._pvs: List[float] = []
-        self._ops: List[float] = []
+        # bounded ring buffers; _head is the next write slot, _n the number of valid samples
+        self._cap = max(1, int(history_capacity))
+        self._ts = np.empty(self._cap, dtype=np.float64)
+        self._sps = np.empty(self._cap, dtype=np.float64)
+        self._pvs = np.empty(self._cap, dtype=np.float64)
+        self._ops = np.empty(self._cap, dtype=np.float64)
+        self._head = 0
+        self._n = 0
+
+        # rows received since the last ticksBatch; the single-shot timer is armed by the first one
+        self._pending: list = []
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_MS)
+        self._flush_timer.timeout.connect(self._flush)
 
     # --- controls
+    @QtCore.Slot()
     def start(self):
         if not self._running:
             self._sim.start()
             self._running = True
             self.runningChanged.emit(True)
 
+    @QtCore.Slot()
     def stop(self):
         if self._running:
             self._sim.stop()
             self._running = False
             self.runningChanged.emit(False)
 
+    @QtCore.Slot()
     def clear_history(self):
-        self._ts.clear(); self._sps.clear(); self._pvs.clear(); self._ops.clear()
+        self._head = 0; self._n = 0
+        self._pending.clear(); self._flush_timer.stop()
         self.historyCleared.emit()
 
     # --- config
+    @QtCore.Slot(float)
     def set_sp(self, sp: float):
         sp = float(sp)
         self._sp = sp
-        # push into service (stub exposes attribute)
-        try:
-            self._sim._sp = sp  # noqa: accessing stub directly
-        except Exception:
-            pass
+        self._sim.sp = sp
         self.spChanged.emit(sp)
 
+    @QtCore.Slot(float)
     def set_noise(self, std: float):
         self._noise_std = max(0.0, float(std))
         self.noiseChanged.emit(self._noise_std)
 
+    @QtCore.Slot(float)
     def set_speed(self, mult: float):
         self._speed = max(0.1, float(mult))
         self.speedChanged.emit(self._speed)
 
+    def apply_pid(self, spec: PIDSpec):
+        """Swap the controller used by the running simulator."""
+        self._sim.configure(pid=spec)
+
+    def apply_proc(self, spec: ProcessSpec):
+        """Swap the process model used by the running simulator (validate upstream)."""
+        self._sim.configure(proc=spec)
+
     # --- history access
-    def history(self) -> Tuple[List[float], List[float], List[float], List[float]]:
-        return self._ts, self._sps, self._pvs, self._ops
+    def history(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Oldest-first (ts, sps, pvs, ops) arrays. Until the ring wraps these are views
+        into the buffers (no copy); afterwards they are unrolled copies.
+        """
+        n, h = self._n, self._head
+        bufs = (self._ts, self._sps, self._pvs, self._ops)
+        if n < self._cap:
+            return tuple(a[:n] for a in bufs)
+        return tuple(np.concatenate((a[h:], a[:h])) for a in bufs)
 
     # --- tick propagation
-    @QtCore.Slot(float, float, float, float)
-    def _on_tick(self, t: float, sp: float, pv: float, op: float):
-        self._ts.append(t); self._sps.append(sp); self._pvs.append(pv); self._ops.append(op)
-        self.tick.emit(t, sp, pv, op)
+    @QtCore.Slot(object)
+    def _on_ticks_batch(self, rows):
+        # rows: (n, 4) array of t, sp, pv, op; written into the rings in one scatter
+        tail = rows[-self._cap:]
+        idx = (self._head + np.arange(tail.shape[0])) % self._cap
+        self._ts[idx] = tail[:, 0]; self._sps[idx] = tail[:, 1]; self._pvs[idx] = tail[:, 2]; self._ops[idx] = tail[:, 3]
+        self._head = (self._head + tail.shape[0]) % self._cap
+        self._n = min(self._n + tail.shape[0], self._cap)
+        self._pending.append(rows)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    @QtCore.Slot()
+    def _flush(self):
+        if not self._pending:
+            return
+        rows = self._pending[0] if len(self._pending) == 1 else np.concatenate(self._pending)
+        self._pending = []
+        self.ticksBatch.emit(rows)
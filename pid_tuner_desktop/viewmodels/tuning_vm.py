@@ -1,10 +1,101 @@
 from __future__ import annotations
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Dict, Literal, Tuple
 from PySide6 import QtCore
 from .process_vm import ProcessVM
 from .controller_vm import ControllerVM
 
+# memoized compute() results kept per TuningVM (LRU)
+_RESULT_CACHE_MAX = 256
+
+# lower-cased rule names/aliases -> canonical rule; anything else falls back to SIMC
+_RULE_ALIASES = {
+    "simc": "SIMC",
+    "lambda": "Lambda", "imc": "Lambda", "lambda (imc)": "Lambda",
+    "zn": "ZN", "ziegler": "ZN", "ziegler-nichols": "ZN", "ziegler–nichols": "ZN",
+}
+
+
+# ------------------ rule kernels: floats in, (Kp, Ti, Td) out ------------------
+# plain Python: for ~10 flops a numba dispatch costs as much as the math it replaces
+
+# Lambda/IMC for FOPDT: Kp = tau/(K*(lambda+theta)), Ti=tau, Td=0 (PI form)
+# For SOPDT: use tau1+tau2; Td = tau1*tau2/(tau1+tau2) as heuristic.
+# For Integrating: Kp = 1/(Ki*(lambda+theta)), Ti = 4*(lambda+theta)
+
+def _lambda_fopdt(K, tau, theta, lam):
+    return tau / (K * (lam + theta)), tau, 0.0
+
+
+def _lambda_sopdt(K, tau1, tau2, theta, lam):
+    tau_sum = tau1 + tau2
+    return tau_sum / (K * (lam + theta)), tau_sum, (tau1 * tau2) / max(1e-9, tau_sum)
+
+
+def _lambda_int(Ki, theta, lam):
+    return 1.0 / (Ki * (lam + theta)), 4.0 * (lam + theta), 0.0
+
+
+# SIMC rules (Skogestad, simplified):
+#   FOPDT (PI or PID): Kp = (tau)/(K*(tauc+theta))
+#                       Ti = min(tau, 4*(tauc+theta))
+#                       Td (PID heuristic) = 0.5*theta
+#   SOPDT: replace tau by (tau1+tau2), Td = tau1*tau2/(tau1+tau2)
+#   Integrating: Kp = 1/(Ki*(tauc+theta)); Ti = 4*(tauc+theta)
+
+def _simc_fopdt(K, tau, theta, tauc):
+    return tau / (K * (tauc + theta)), min(tau, 4.0 * (tauc + theta)), 0.5 * theta
+
+
+def _simc_sopdt(K, tau1, tau2, theta, tauc):
+    tau_sum = tau1 + tau2
+    return (tau_sum / (K * (tauc + theta)), min(tau_sum, 4.0 * (tauc + theta)),
+            (tau1 * tau2) / max(1e-9, tau_sum))
+
+
+def _simc_int(Ki, theta, tauc):
+    return 1.0 / (Ki * (tauc + theta)), 4.0 * (tauc + theta), 0.0
+
+
+# Classic Ziegler–Nichols based on FOPDT reaction curve heuristics:
+#   PID:  Kp = 1.2 * (tau/(K*theta)), Ti = 2*theta, Td = 0.5*theta
+#   PI:   Kp = 0.9 * (tau/(K*theta)), Ti = 3.33*theta
+# For SOPDT: use tau = tau1+tau2. For Integrating: fallback to PI with theta as delay.
+
+def _zn_fopdt(K, tau, theta):
+    theta = max(1e-9, theta)
+    return 1.2 * (tau / (K * theta)), 2.0 * theta, 0.5 * theta
+
+
+def _zn_sopdt(K, tau1, tau2, theta):
+    return _zn_fopdt(K, tau1 + tau2, theta)
+
+
+def _zn_int(Ki, theta):
+    # use theta as apparent delay: equivalent gain K≈1/Ki with tau≈4*theta for a rough guess
+    return _zn_fopdt(1.0 / max(1e-9, Ki), 4.0 * max(1e-9, theta), theta)
+
+
+# (rule, model) -> (kernel, process param names in kernel order, trailing knob: "lambda"/"tauc"/None);
+# models other than FOPDT/SOPDT take the Integrating entry
+_KERNELS = {
+    ("Lambda", "FOPDT"): (_lambda_fopdt, ("K", "tau", "theta"), "lambda"),
+    ("Lambda", "SOPDT"): (_lambda_sopdt, ("K", "tau1", "tau2", "theta"), "lambda"),
+    ("Lambda", "Integrating"): (_lambda_int, ("Ki", "theta"), "lambda"),
+    ("SIMC", "FOPDT"): (_simc_fopdt, ("K", "tau", "theta"), "tauc"),
+    ("SIMC", "SOPDT"): (_simc_sopdt, ("K", "tau1", "tau2", "theta"), "tauc"),
+    ("SIMC", "Integrating"): (_simc_int, ("Ki", "theta"), "tauc"),
+    ("ZN", "FOPDT"): (_zn_fopdt, ("K", "tau", "theta"), None),
+    ("ZN", "SOPDT"): (_zn_sopdt, ("K", "tau1", "tau2", "theta"), None),
+    ("ZN", "Integrating"): (_zn_int, ("Ki", "theta"), None),
+}
+
+
+def _kernel_entry(rule: str, model: str):
+    entry = _KERNELS.get((rule, model))
+    return entry if entry is not None else _KERNELS[(rule, "Integrating")]
+
 
 @dataclass
 class TuningResult:
@@ -43,6 +134,12 @@ class TuningVM(QtCore.QObject):
             "Gain": (1e-4, 1e2), "Ti": (0.0, 1e4), "Td": (0.0, 1e4)
         }
         self._optimize: Dict[str, bool] = {"Gain": True, "Ti": True, "Td": True}
+        # (lo, hi) for Kp, Ti, Td with the optimize flags folded in (unflagged -> ±inf)
+        self._clamp: Tuple[Tuple[float, float], ...] = ()
+        self._rebuild_clamp()
+        # (rule, lambda, tauc, model, params) -> clamped result; bounds/flags changes clear it
+        self._cache: "OrderedDict[tuple, TuningResult]" = OrderedDict()
+        self._last_emitted: Tuple[float, float, float] | None = None
 
     # --- getters
     def rule(self) -> str: return self._rule
@@ -52,136 +149,112 @@ class TuningVM(QtCore.QObject):
     def optimize_map(self) -> Dict[str, bool]: return dict(self._optimize)
 
     # --- setters
+    @QtCore.Slot(str)
     def set_rule(self, rule: str):
-        rule = rule.capitalize()
-        if rule not in ("SIMC", "Lambda", "Ziegler–nichols", "Zn"):
-            rule = "SIMC"
-        rule = "ZN" if rule.lower().startswith("ziegler") or rule == "Zn" else rule
+        rule = _RULE_ALIASES.get(rule.strip().lower(), "SIMC")
         if self._rule != rule:
             self._rule = rule
             self.ruleChanged.emit(rule)
 
+    @QtCore.Slot(float)
     def set_lambda(self, lam: float):
         lam = max(1e-6, float(lam))
         if self._lambda != lam:
             self._lambda = lam
             self.lambdaChanged.emit(lam)
 
+    @QtCore.Slot(float)
     def set_tauc(self, tauc: float):
         tauc = max(1e-6, float(tauc))
         if self._tauc != tauc:
             self._tauc = tauc
             self.taucChanged.emit(tauc)
 
+    @QtCore.Slot(dict)
     def set_bounds(self, mapping: Dict[str, Tuple[float, float]]):
         self._bounds.update(mapping)
+        self._rebuild_clamp()
+        self._cache.clear()
         self.boundsChanged.emit(self.bounds())
 
     def set_optimize_map(self, mapping: Dict[str, bool]):
         self._optimize.update(mapping)
+        self._rebuild_clamp()
+        self._cache.clear()
+        self.optimizeMapChanged.emit(self.optimize_map())
+
+    def set_bound(self, name: str, which: str, value: float):
+        """Set one side ("lower"/"upper") of one parameter's bounds; no-op if unchanged."""
+        if name not in self._bounds:
+            return
+        low, high = self._bounds[name]
+        pair = (float(value), high) if which == "lower" else (low, float(value))
+        if pair == (low, high):
+            return
+        self._bounds[name] = pair
+        self._rebuild_clamp()
+        self._cache.clear()
+        self.boundsChanged.emit(self.bounds())
+
+    def set_optimize_flag(self, name: str, flag: bool):
+        """Set one parameter's optimize flag; no-op if unchanged."""
+        if name not in self._optimize or self._optimize[name] == bool(flag):
+            return
+        self._optimize[name] = bool(flag)
+        self._rebuild_clamp()
+        self._cache.clear()
         self.optimizeMapChanged.emit(self.optimize_map())
 
     # --- main API
     def compute(self, proc: ProcessVM) -> TuningResult:
         """
         Compute Kp, Ti, Td per selected rule using process params.
+        Identical inputs are served from an LRU cache; resultChanged fires only
+        when the result differs from the last one emitted.
         """
         m = proc.model()
         params = proc.get_params()
+        key = (self._rule, self._lambda, self._tauc, m, tuple(sorted(params.items())))
+        res = self._cache.get(key)
+        if res is not None:
+            self._cache.move_to_end(key)
+            self._emit_result(res)
+            return TuningResult(res.Kp, res.Ti, res.Td)
+
+        # one table probe picks the kernel; _rule is always canonical (see set_rule)
+        kernel, names, knob = _kernel_entry(self._rule, m)
+        args = [float(params[n]) for n in names]
+        if knob == "lambda":
+            args.append(self._lambda)
+        elif knob == "tauc":
+            args.append(self._tauc)
+        Kp, Ti, Td = kernel(*args)
+
+        # clamp to bounds and respect optimize flags: min(max(x, lo), hi) with prebuilt limits
+        (lk, hk), (li, hi), (ld, hd) = self._clamp
+        Kp = lk if Kp < lk else Kp; Kp = hk if Kp > hk else Kp
+        Ti = li if Ti < li else Ti; Ti = hi if Ti > hi else Ti
+        Td = ld if Td < ld else Td; Td = hd if Td > hd else Td
 
-        if self._rule == "Lambda":
-            res = self._lambda_rule(m, params, self._lambda)
-        elif self._rule == "ZN":
-            res = self._zn_reaction_curve(m, params)
-        else:  # SIMC
-            res = self._simc_rule(m, params, self._tauc)
-
-        # clamp to bounds and respect optimize flags
-        Kp, Ti, Td = res.Kp, res.Ti, res.Td
-        if self._optimize.get("Gain", True):
-            low, high = self._bounds["Gain"]; Kp = min(max(Kp, low), high)
-        if self._optimize.get("Ti", True):
-            low, high = self._bounds["Ti"]; Ti = min(max(Ti, low), high)
-        if self._optimize.get("Td", True):
-            low, high = self._bounds["Td"]; Td = min(max(Td, low), high)
-
-        self.resultChanged.emit(Kp, Ti, Td)
+        res = TuningResult(Kp, Ti, Td)
+        self._cache[key] = res
+        if len(self._cache) > _RESULT_CACHE_MAX:
+            self._cache.popitem(last=False)
+        self._emit_result(res)
         return TuningResult(Kp, Ti, Td)
 
-    # --- rules implementations
-    def _lambda_rule(self, model: str, p: Dict, lam: float) -> TuningResult:
-        """
-        Lambda/IMC for FOPDT: Kp = tau/(K*(lambda+theta)), Ti=tau, Td=0 (PI form)
-        For SOPDT: use tau1+tau2; Td = tau1*tau2/(tau1+tau2) as heuristic.
-        For Integrating: Kp = 1/(Ki*(lambda+theta)), Ti = 4*(lambda+theta)
-        """
-        if model == "FOPDT":
-            K, tau, theta = float(p["K"]), float(p["tau"]), float(p["theta"])
-            Kp = tau / (K * (lam + theta))
-            Ti = tau
-            Td = 0.0
-        elif model == "SOPDT":
-            K, tau1, tau2, theta = float(p["K"]), float(p["tau1"]), float(p["tau2"]), float(p["theta"])
-            tau_sum = tau1 + tau2
-            Kp = tau_sum / (K * (lam + theta))
-            Ti = tau_sum
-            Td = (tau1 * tau2) / max(1e-9, tau_sum)
-        else:  # Integrating
-            Ki, theta = float(p["Ki"]), float(p["theta"])
-            Kp = 1.0 / (Ki * (lam + theta))
-            Ti = 4.0 * (lam + theta)
-            Td = 0.0
-        return TuningResult(float(Kp), float(Ti), float(Td))
-
-    def _simc_rule(self, model: str, p: Dict, tauc: float) -> TuningResult:
-        """
-        SIMC rules (Skogestad, simplified):
-          FOPDT (PI or PID): Kp = (tau)/(K*(tauc+theta))
-                              Ti = min(tau, 4*(tauc+theta))
-                              Td (PID heuristic) = 0.5*theta
-          SOPDT: replace tau by (tau1+tau2), Td = tau1*tau2/(tau1+tau2)
-          Integrating: Kp = 1/(Ki*(tauc+theta)); Ti = 4*(tauc+theta)
-        """
-        if model == "FOPDT":
-            K, tau, theta = float(p["K"]), float(p["tau"]), float(p["theta"])
-            Kp = tau / (K * (tauc + theta))
-            Ti = min(tau, 4.0 * (tauc + theta))
-            Td = 0.5 * theta
-        elif model == "SOPDT":
-            K, tau1, tau2, theta = float(p["K"]), float(p["tau1"]), float(p["tau2"]), float(p["theta"])
-            tau_sum = tau1 + tau2
-            Kp = tau_sum / (K * (tauc + theta))
-            Ti = min(tau_sum, 4.0 * (tauc + theta))
-            Td = (tau1 * tau2) / max(1e-9, tau_sum)
-        else:  # Integrating
-            Ki, theta = float(p["Ki"]), float(p["theta"])
-            Kp = 1.0 / (Ki * (tauc + theta))
-            Ti = 4.0 * (tauc + theta)
-            Td = 0.0
-        return TuningResult(float(Kp), float(Ti), float(Td))
-
-    def _zn_reaction_curve(self, model: str, p: Dict) -> TuningResult:
-        """
-        Classic Ziegler–Nichols based on FOPDT reaction curve heuristics:
-          PID:  Kp = 1.2 * (tau/(K*theta)), Ti = 2*theta, Td = 0.5*theta
-          PI:   Kp = 0.9 * (tau/(K*theta)), Ti = 3.33*theta
-        For SOPDT: use tau = tau1+tau2. For Integrating: fallback to PI with theta as delay.
-        """
-        if model == "FOPDT":
-            K, tau, theta = float(p["K"]), float(p["tau"]), float(p["theta"])
-        elif model == "SOPDT":
-            K, tau, theta = float(p["K"]), float(p["tau1"]) + float(p["tau2"]), float(p["theta"])
-        else:  # Integrator fallback: use theta as apparent delay and tau=4*theta heuristic
-            Ki, theta = float(p["Ki"]), float(p["theta"])
-            # define equivalent gain K≈1/Ki with tau≈4*theta for a rough guess
-            K = 1.0 / max(1e-9, Ki)
-            tau = 4.0 * max(1e-9, theta)
-
-        theta = max(1e-9, theta)
-        Kp = 1.2 * (tau / (K * theta))
-        Ti = 2.0 * theta
-        Td = 0.5 * theta
-        return TuningResult(float(Kp), float(Ti), float(Td))
+    def _rebuild_clamp(self):
+        inf = float("inf")
+        self._clamp = tuple(
+            tuple(map(float, self._bounds[name])) if self._optimize.get(name, True) else (-inf, inf)
+            for name in ("Gain", "Ti", "Td")
+        )
+
+    def _emit_result(self, res: TuningResult):
+        out = (res.Kp, res.Ti, res.Td)
+        if out != self._last_emitted:
+            self._last_emitted = out
+            self.resultChanged.emit(*out)
 
     # --- convenience
     def apply_to_controller(self, ctrl: ControllerVM, proc: ProcessVM) -> TuningResult:
@@ -1,18 +1,46 @@
 from __future__ import annotations
-from datetime import datetime
-from PySide6 import QtWidgets
+import time
+from PySide6 import QtCore, QtWidgets
 
 
 class ConsolePanel(QtWidgets.QPlainTextEdit):
     """
-    Simple console with timestamped logging and auto-scroll.
+    Simple console with timestamped logging and auto-scroll (only while the
+    view is already at the bottom); the oldest lines drop past MAX_LINES.
+    Lines are queued and appended together on the next FLUSH_MS tick, so a
+    burst of log() calls costs one document update instead of one per line.
     """
 
+    FLUSH_MS = 33
+    MAX_LINES = 5000
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setReadOnly(True)
+        self.setMaximumBlockCount(self.MAX_LINES)  # bounded document; evicts from the top
+        self._ts_cache = ("", -1)  # ("[HH:MM:SS] ", epoch second) rebuilt once per second
+        self._pending: list[str] = []
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_MS)
+        self._flush_timer.timeout.connect(self.flush)
 
     def log(self, msg: str):
-        ts = datetime.now().strftime("%H:%M:%S")
-        self.appendPlainText(f"[{ts}] {msg}")
-        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        sec = int(time.time())
+        if sec != self._ts_cache[1]:
+            self._ts_cache = (time.strftime("[%H:%M:%S] ", time.localtime(sec)), sec)
+        self._pending.append(self._ts_cache[0] + msg)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    @QtCore.Slot()
+    def flush(self):
+        """Append queued lines now (also called by the timer)."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        bar = self.verticalScrollBar()
+        follow = bar.value() == bar.maximum()  # a user who scrolled up keeps their place
+        self.appendPlainText("\n".join(batch))
+        if follow:
+            bar.setValue(bar.maximum())
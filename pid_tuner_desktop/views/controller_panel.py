@@ -1,6 +1,6 @@
 from __future__ import annotations
 from PySide6 import QtCore, QtWidgets
-from viewmodels.controller_vm import ControllerVM
+from viewmodels.controller_vm import ControllerVM, ControllerParams
 
 
 class ControllerPanel(QtWidgets.QWidget):
@@ -52,14 +52,18 @@ class ControllerPanel(QtWidgets.QWidget):
         s.setMaximumWidth(220)
         return s
 
-    def _vm_to_ui(self):
-        self.mode.setCurrentText(self.vm.mode())
-        self.d_on.setCurrentText(self.vm.derivative_on())
-        self.kp.setValue(self.vm.Kp())
-        self.ti.setValue(self.vm.Ti())
-        self.td.setValue(self.vm.Td())
-        self.beta.setValue(self.vm.beta())
-        self.alpha.setValue(self.vm.alpha())
+    def _vm_to_ui(self, p: ControllerParams | None = None):
+        # signals blocked for the whole sync so nothing echoes back to the VM; unchanged widgets are skipped
+        p = p if p is not None else self.vm.params()
+        blockers = [QtCore.QSignalBlocker(w) for w in (self.mode, self.d_on, self.kp, self.ti, self.td, self.beta, self.alpha)]
+        for combo, text in ((self.mode, p.mode), (self.d_on, p.d_on)):
+            if combo.currentText() != text:
+                combo.setCurrentText(text)
+        for spin, v in ((self.kp, p.Kp), (self.ti, p.Ti), (self.td, p.Td), (self.beta, p.beta), (self.alpha, p.alpha)):
+            if abs(spin.value() - v) > 1e-12:
+                spin.setValue(v)
+        for b in blockers:
+            b.unblock()
         self._apply_mode_visibility()
 
     def _apply_mode_visibility(self):
@@ -79,4 +83,4 @@ class ControllerPanel(QtWidgets.QWidget):
         self.alpha.valueChanged.connect(self.vm.set_alpha)
 
         # VM -> UI
-        self.vm.paramChanged.connect(lambda *_: self._vm_to_ui())
+        self.vm.paramChanged.connect(self._vm_to_ui)
@@ -1,9 +1,33 @@
 from __future__ import annotations
-from collections import deque
-from typing import Deque, List, Tuple, Optional
+from itertools import islice
+from typing import List, Tuple, Optional
 
+from importlib.util import find_spec
+import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
-import pyqtgraph as pg
+
+# pyqtgraph is a slow import; it is loaded by _load_pg() when the first PlotPanel is shown
+pg = None
+
+# OpenGL viewport for "Performance Mode" needs PyOpenGL; without it only AA is dropped.
+# Only probed here: pyqtgraph imports it itself once the viewport is switched on.
+HAS_OPENGL = find_spec("OpenGL") is not None
+
+
+def _load_pg():
+    global pg
+    if pg is None:
+        import pyqtgraph
+        pg = pyqtgraph
+    return pg
+
+
+def _f64_slice(seq, start: int, stop: int) -> np.ndarray:
+    """float64 array of seq[start:stop]; never converts the part before start."""
+    if isinstance(seq, (np.ndarray, list, tuple)):
+        return np.asarray(seq[start:stop], dtype=np.float64)  # view for arrays, tail-sized list otherwise
+    # deques and other non-sliceable sequences stream straight into the array
+    return np.fromiter(islice(seq, start, stop), dtype=np.float64, count=stop - start)
 
 
 class PlotPanel(QtWidgets.QWidget):
@@ -14,9 +38,10 @@ class PlotPanel(QtWidgets.QWidget):
     --------
     - Fast, incremental appends with a fixed capacity or sliding time-window
     - Dual y-axes using a secondary ViewBox linked to the main x-axis
-    - Context menu: Fit, Clear, Toggle Grid, Toggle AA, Copy CSV
+    - Context menu: Fit, Clear, Toggle Grid, Toggle AA, Performance Mode, Copy CSV
     - Helper APIs:
         append(t, sp, pv, op)
+        extend(ts, sps, pvs, ops)
         set_history(ts, sps, pvs, ops)
         clear()
         fit()
@@ -26,28 +51,60 @@ class PlotPanel(QtWidgets.QWidget):
 
     Notes
     -----
-    - Uses deques for O(1) append/pop and plots update only the changed data.
+    - Samples live in preallocated float64 ring buffers; curves get array views
+      (a single unrolled copy once the ring has wrapped), never Python lists.
+    - Time-window mode grows the rings as needed instead of overwriting.
+    - append() only queues the sample and extend() only writes the rings; queued
+      samples land in one block write and curves are redrawn at most once per
+      REDRAW_MS (see set_redraw_hz()), so the render rate is independent of the
+      sample rate.
+    - While the panel is hidden, curves are not re-uploaded at all; the pending
+      redraw happens once when it is shown again.
+    - pyqtgraph and the plot widget are created on the first show; until then
+      data only accumulates in the rings.
+    - Curves are clipped to the visible X range and peak-downsampled to the
+      screen width, so paint cost follows pixels rather than buffered points.
     - Secondary axis auto-rescales along with primary; ranges stay linked in X.
     """
 
     # Emitted on each update to help outer widgets (e.g., to refresh legends)
     updated = QtCore.Signal()
 
+    REDRAW_MS = 33  # ~30 fps
+
     def __init__(self, parent: Optional[QtWidgets.QWidget] = None, *, capacity: int = 5000):
         super().__init__(parent)
         self._capacity = max(100, int(capacity))
         self._time_window_s: Optional[float] = None  # if set, trims points older than (t_max - window)
 
-        # --- data buffers
-        self._ts: Deque[float] = deque(maxlen=self._capacity)
-        self._sps: Deque[float] = deque(maxlen=self._capacity)
-        self._pvs: Deque[float] = deque(maxlen=self._capacity)
-        self._ops: Deque[float] = deque(maxlen=self._capacity)
+        # --- data buffers: rings of len(self._buf_t); _head is the next write slot, _count the live length
+        self._realloc_buffers(self._capacity)
 
-        # --- UI
-        layout = QtWidgets.QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
+        # --- coalesced redraw: armed by the first write after a flush, so an idle plot never wakes
+        self._dirty = False
+        self._stale = False  # rings changed while hidden; curves are refreshed on show
+        self._redraw_timer = QtCore.QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(self.REDRAW_MS)
+        self._redraw_timer.timeout.connect(self._flush)
+
+        # --- UI: the PlotWidget replaces this placeholder in _build_plot() on first show
+        self._layout = QtWidgets.QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._placeholder = QtWidgets.QWidget()
+        self._layout.addWidget(self._placeholder)
+        self.plot = None
+        self.cur_sp = self.cur_pv = self.cur_op = None
+
+        # view state set before the plot exists is applied when it is built
+        self._pen_sp = self._pen_pv = self._pen_op = None
+        self._grid_on = True
+        self._aa_on = False  # what the curves were created with; read from pyqtgraph on build
+        self._perf_on = False
+        self._right_visible = True
 
+    def _build_plot(self):
+        pg = _load_pg()
         self.plot = pg.PlotWidget()
         self.plot.setBackground("default")
         self.plot.setLabel("bottom", "Time", units="s")
@@ -55,9 +112,18 @@ class PlotPanel(QtWidgets.QWidget):
         self.plot.showGrid(x=True, y=True, alpha=0.25)
         self.plot.addLegend(offset=(8, 8))
 
+        # Default pens are built once (pens from an earlier set_pens() win);
+        # set_pens() skips a pen equal to the one already set
+        if self._pen_sp is None:
+            self._pen_sp = pg.mkPen(QtGui.QColor("#0080ff"), width=1.5, style=QtCore.Qt.DashLine)
+        if self._pen_pv is None:
+            self._pen_pv = pg.mkPen(QtGui.QColor("#00c853"), width=2.0)
+        if self._pen_op is None:
+            self._pen_op = pg.mkPen(QtGui.QColor("#ff6d00"), width=1.8)
+
         # Curves on primary (left) axis
-        self.cur_sp = self.plot.plot(name="SP", pen=pg.mkPen(QtGui.QColor("#0080ff"), width=1.5, style=QtCore.Qt.DashLine))
-        self.cur_pv = self.plot.plot(name="PV", pen=pg.mkPen(QtGui.QColor("#00c853"), width=2.0))
+        self.cur_sp = self.plot.plot(name="SP", pen=self._pen_sp)
+        self.cur_pv = self.plot.plot(name="PV", pen=self._pen_pv)
 
         # Secondary (right) axis + curve (OP)
         self._right_vb = pg.ViewBox()
@@ -66,9 +132,14 @@ class PlotPanel(QtWidgets.QWidget):
         self.plot.scene().addItem(self._right_vb)
         self.plot.getAxis("right").linkToView(self._right_vb)
         self._right_vb.setXLink(self.plot.getViewBox())
-        self.cur_op = pg.PlotCurveItem(pen=pg.mkPen(QtGui.QColor("#ff6d00"), width=1.8), name="OP")
+        self.cur_op = pg.PlotDataItem(pen=self._pen_op, name="OP")
         self._right_vb.addItem(self.cur_op)
 
+        # draw only what is on screen: clip to the view, peak-downsample to the pixel width
+        for cur in (self.cur_sp, self.cur_pv, self.cur_op):
+            cur.setDownsampling(auto=True, method="peak")
+            cur.setClipToView(True)
+
         # Keep right axis aligned with main vb
         self.plot.getViewBox().sigResized.connect(self._update_views)
 
@@ -76,10 +147,17 @@ class PlotPanel(QtWidgets.QWidget):
         self.plot.setMenuEnabled(False)
         self.plot.scene().contextMenu = None
         self.plot.scene().sigMouseClicked.connect(self._maybe_context_menu)
-        self._grid_on = True
-        self._aa_on = True
+        self._aa_on = bool(pg.getConfigOption("antialias"))
 
-        layout.addWidget(self.plot)
+        if not self._right_visible:
+            self.set_right_axis_visible(False)
+        if self._perf_on:
+            self.set_performance_mode(True)
+
+        self._layout.replaceWidget(self._placeholder, self.plot)
+        self._placeholder.deleteLater()
+        self._placeholder = None
+        self._refresh_curves()
 
     # ------------- Public API -------------
 
@@ -97,18 +175,41 @@ class PlotPanel(QtWidgets.QWidget):
         """Use a sliding time-window (seconds) instead of fixed capacity."""
         self._time_window_s = max(1.0, float(seconds))
 
+    def set_redraw_hz(self, hz: float):
+        """Cap the curve refresh rate at `hz` (default 1000/REDRAW_MS, ~30 fps)."""
+        self._redraw_timer.setInterval(max(1, int(1000 / max(1e-3, float(hz)))))
+
+    def set_performance_mode(self, on: bool):
+        """Antialiasing off and (with PyOpenGL) an OpenGL viewport; off restores the AA setting."""
+        self._perf_on = bool(on)
+        if self.plot is None:
+            return
+        self._apply_antialias()
+        if HAS_OPENGL:
+            self.plot.useOpenGL(self._perf_on)
+
     def set_right_axis_visible(self, visible: bool):
+        self._right_visible = bool(visible)
+        if self.plot is None:
+            return
         self.plot.getAxis("right").setStyle(showValues=visible)
         self.plot.getAxis("right").setWidth(40 if visible else 1)
         self._right_vb.setVisible(visible)
 
     def set_pens(self, sp_pen=None, pv_pen=None, op_pen=None):
-        if sp_pen is not None:
-            self.cur_sp.setPen(sp_pen)
-        if pv_pen is not None:
-            self.cur_pv.setPen(pv_pen)
-        if op_pen is not None:
-            self.cur_op.setPen(op_pen)
+        built = self.plot is not None
+        if sp_pen is not None and sp_pen != self._pen_sp:
+            self._pen_sp = sp_pen
+            if built:
+                self.cur_sp.setPen(sp_pen)
+        if pv_pen is not None and pv_pen != self._pen_pv:
+            self._pen_pv = pv_pen
+            if built:
+                self.cur_pv.setPen(pv_pen)
+        if op_pen is not None and op_pen != self._pen_op:
+            self._pen_op = op_pen
+            if built:
+                self.cur_op.setPen(op_pen)
 
     def set_history(self, ts: List[float], sps: List[float], pvs: List[float], ops: List[float]):
         n = min(len(ts), len(sps), len(pvs), len(ops))
@@ -116,43 +217,31 @@ class PlotPanel(QtWidgets.QWidget):
             self.clear()
             return
         if self._time_window_s is None:
-            # capacity mode
-            cap = self._capacity
-            self._ts = deque(ts[-cap:], maxlen=cap)
-            self._sps = deque(sps[-cap:], maxlen=cap)
-            self._pvs = deque(pvs[-cap:], maxlen=cap)
-            self._ops = deque(ops[-cap:], maxlen=cap)
+            # capacity mode: only the newest samples are ever converted
+            idx0 = max(0, n - self._capacity)
+            ts = _f64_slice(ts, idx0, n)
         else:
-            # window mode
-            tmax = ts[n - 1]
-            tmin = tmax - self._time_window_s
-            idx0 = 0
-            while idx0 < n and ts[idx0] < tmin:
-                idx0 += 1
-            self._ts = deque(ts[idx0:], maxlen=None)
-            self._sps = deque(sps[idx0:], maxlen=None)
-            self._pvs = deque(pvs[idx0:], maxlen=None)
-            self._ops = deque(ops[idx0:], maxlen=None)
+            # window mode: history is time-ordered, so the cutoff is one binary search
+            ts = _f64_slice(ts, 0, n)
+            idx0 = int(np.searchsorted(ts, ts[n - 1] - self._time_window_s, side="left"))
+            ts = ts[idx0:]
+        self._realloc_buffers(max(self._capacity, n - idx0))
+        self._ring_write(ts, _f64_slice(sps, idx0, n), _f64_slice(pvs, idx0, n), _f64_slice(ops, idx0, n))
         self._refresh_curves()
 
     def append(self, t: float, sp: float, pv: float, op: float):
-        self._ts.append(float(t))
-        self._sps.append(float(sp))
-        self._pvs.append(float(pv))
-        self._ops.append(float(op))
-
-        if self._time_window_s is not None and len(self._ts) > 1:
-            tmax = self._ts[-1]
-            tmin = tmax - self._time_window_s
-            while self._ts and self._ts[0] < tmin:
-                self._ts.popleft(); self._sps.popleft(); self._pvs.popleft(); self._ops.popleft()
-
-        # Cast to list for pyqtgraph
-        self.cur_sp.setData(list(self._ts), list(self._sps))
-        self.cur_pv.setData(list(self._ts), list(self._pvs))
-        self.cur_op.setData(list(self._ts), list(self._ops))
-        self.updated.emit()
-
+        # hot path: queue the sample; the rings are written in one vectorized block per frame
+        self._pending.append((t, sp, pv, op))
+        if not self._dirty:
+            self._schedule_redraw()
+
+    def extend(self, ts, sps, pvs, ops):
+        """Append a block of samples; redrawn with the next flush."""
+        self._drain()
+        self._ring_write(np.asarray(ts, dtype=np.float64), np.asarray(sps, dtype=np.float64),
+                         np.asarray(pvs, dtype=np.float64), np.asarray(ops, dtype=np.float64))
+        self._trim_window()
+        self._schedule_redraw()
 
     def clear(self):
         self._realloc_buffers(self._capacity)
@@ -160,6 +249,8 @@ class PlotPanel(QtWidgets.QWidget):
 
     def fit(self):
         """Autoscale both axes to current data."""
+        if self.plot is None:
+            return
         vb = self.plot.getViewBox()
         vb.enableAutoRange(pg.ViewBox.XYAxes, enable=True)
         vb.autoRange()
@@ -168,15 +259,117 @@ class PlotPanel(QtWidgets.QWidget):
     # ------------- Internals -------------
 
     def _realloc_buffers(self, capacity: int):
-        self._ts = deque(maxlen=capacity)
-        self._sps = deque(maxlen=capacity)
-        self._pvs = deque(maxlen=capacity)
-        self._ops = deque(maxlen=capacity)
+        self._buf_t = np.empty(capacity, dtype=np.float64)
+        self._buf_sp = np.empty(capacity, dtype=np.float64)
+        self._buf_pv = np.empty(capacity, dtype=np.float64)
+        self._buf_op = np.empty(capacity, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        self._pending = []  # append()ed (t, sp, pv, op) rows not yet in the rings
+
+    def _grow(self, need: int):
+        # window mode only: unroll into larger rings so nothing inside the window is overwritten
+        t, sp, pv, op = self._views()
+        n = self._count
+        self._realloc_buffers(max(need, 2 * len(self._buf_t)))
+        self._buf_t[:n] = t; self._buf_sp[:n] = sp; self._buf_pv[:n] = pv; self._buf_op[:n] = op
+        self._head = self._count = n
+
+    def _ring_write(self, ts: np.ndarray, sps: np.ndarray, pvs: np.ndarray, ops: np.ndarray):
+        k = min(len(ts), len(sps), len(pvs), len(ops))
+        if self._time_window_s is not None and self._count + k > len(self._buf_t):
+            self._grow(self._count + k)
+        cap = len(self._buf_t)
+        if k > cap:  # capacity mode: only the newest cap samples survive anyway
+            ts, sps, pvs, ops = ts[k - cap:k], sps[k - cap:k], pvs[k - cap:k], ops[k - cap:k]
+            k = cap
+        h = self._head
+        first = min(k, cap - h)  # up to the end of the ring, the rest wraps to the front
+        for buf, src in ((self._buf_t, ts), (self._buf_sp, sps), (self._buf_pv, pvs), (self._buf_op, ops)):
+            buf[h:h + first] = src[:first]
+            buf[:k - first] = src[first:k]
+        self._head = (h + k) % cap
+        self._count = min(self._count + k, cap)
+
+    def _drain(self):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        block = np.array(rows, dtype=np.float64)
+        self._ring_write(block[:, 0], block[:, 1], block[:, 2], block[:, 3])
+        self._trim_window()
+
+    def _views(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # oldest -> newest; zero-copy slices unless the live span wraps past the end of the ring
+        self._drain()
+        n = self._count
+        cap = len(self._buf_t)
+        start = (self._head - n) % cap
+        bufs = (self._buf_t, self._buf_sp, self._buf_pv, self._buf_op)
+        if start + n <= cap:
+            return tuple(b[start:start + n] for b in bufs)
+        return tuple(np.concatenate((b[start:], b[:self._head])) for b in bufs)
+
+    def _trim_window(self):
+        if self._time_window_s is None or self._count < 2:
+            return
+        # samples are time-ordered: binary-search the (at most two) ring segments in place and
+        # drop everything older than the window by shrinking _count; nothing is copied
+        n = self._count
+        cap = len(self._buf_t)
+        start = (self._head - n) % cap
+        tmin = self._buf_t[(self._head - 1) % cap] - self._time_window_s
+        older = self._buf_t[start:min(start + n, cap)]
+        k = int(np.searchsorted(older, tmin, side="left"))
+        if k == len(older) and start + n > cap:
+            k += int(np.searchsorted(self._buf_t[:self._head], tmin, side="left"))
+        self._count -= k
+
+    def _apply_antialias(self):
+        # curves copy the antialias option when created, so set it per item and just repaint;
+        # the buffered data is not re-uploaded
+        aa = self._aa_on and not self._perf_on
+        for cur in (self.cur_sp, self.cur_pv, self.cur_op):
+            cur.opts["antialias"] = aa
+            cur.curve.opts["antialias"] = aa
+            cur.curve.update()
+
+    def _schedule_redraw(self):
+        self._dirty = True
+        if not self._redraw_timer.isActive():
+            self._redraw_timer.start()
+
+    @QtCore.Slot()
+    def _flush(self):
+        if not self._dirty:
+            return
+        if self.plot is None or not self.isVisible():
+            # nothing to paint: fold queued samples into the rings and upload once on show;
+            # the next append() re-arms the timer so the queue stays bounded
+            self._drain()
+            self._dirty = False
+            self._stale = True
+            return
+        self._refresh_curves()
+
+    def showEvent(self, ev: QtGui.QShowEvent):
+        super().showEvent(ev)
+        if self.plot is None:
+            self._build_plot()  # uploads the buffered data
+        elif self._dirty or self._stale:
+            self._refresh_curves()
 
     def _refresh_curves(self):
-        self.cur_sp.setData(list(self._ts), list(self._sps))
-        self.cur_pv.setData(list(self._ts), list(self._pvs))
-        self.cur_op.setData(list(self._ts), list(self._ops))
+        self._dirty = False
+        if self.plot is None:
+            self._drain()
+            self._stale = True
+            return
+        self._stale = False
+        t, sp, pv, op = self._views()
+        self.cur_sp.setData(t, sp, skipFiniteCheck=True)
+        self.cur_pv.setData(t, pv, skipFiniteCheck=True)
+        self.cur_op.setData(t, op, skipFiniteCheck=True)
         self.updated.emit()
 
     def _update_views(self):
@@ -200,6 +393,9 @@ class PlotPanel(QtWidgets.QWidget):
         act_aa = menu.addAction("Toggle Antialiasing")
         act_aa.setCheckable(True)
         act_aa.setChecked(self._aa_on)
+        act_perf = menu.addAction("Performance Mode")
+        act_perf.setCheckable(True)
+        act_perf.setChecked(self._perf_on)
         menu.addSeparator()
         act_copy = menu.addAction("Copy CSV to Clipboard")
 
@@ -216,13 +412,13 @@ class PlotPanel(QtWidgets.QWidget):
             self.plot.showGrid(x=self._grid_on, y=self._grid_on, alpha=0.25 if self._grid_on else 0.0)
         elif chosen == act_aa:
             self._aa_on = not self._aa_on
-            pg.setConfigOptions(antialias=self._aa_on)
-            self._refresh_curves()
+            self._apply_antialias()
+        elif chosen == act_perf:
+            self.set_performance_mode(not self._perf_on)
         elif chosen == act_copy:
             QtWidgets.QApplication.clipboard().setText(self._to_csv())
 
     def _to_csv(self) -> str:
-        lines = ["t,SP,PV,OP"]
-        for t, sp, pv, op in zip(self._ts, self._sps, self._pvs, self._ops):
-            lines.append(f"{t:.6f},{sp:.6f},{pv:.6f},{op:.6f}")
-        return "\n".join(lines)
+        # one %-format per row over plain-float tuples; ~2x the per-field f-string loop
+        rows = zip(*(v.tolist() for v in self._views()))
+        return "\n".join(["t,SP,PV,OP"] + ["%.6f,%.6f,%.6f,%.6f" % r for r in rows])
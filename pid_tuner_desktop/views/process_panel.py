@@ -28,6 +28,13 @@ class ProcessPanel(QtWidgets.QWidget):
         self.stack.addWidget(self.page_fopdt)
         self.stack.addWidget(self.page_sopdt)
         self.stack.addWidget(self.page_int)
+        # VM param name -> spin box, per model page
+        self._fields = {
+            "FOPDT": (("K", self.f_k), ("tau", self.f_tau), ("theta", self.f_theta)),
+            "SOPDT": (("K", self.s_k), ("tau1", self.s_tau1), ("tau2", self.s_tau2),
+                      ("theta", self.s_theta), ("zeta", self.s_zeta)),
+            "Integrating": (("Ki", self.i_ki), ("theta", self.i_theta)),
+        }
 
         # --- tag row
         self.sp_tag = QtWidgets.QLineEdit(self.app_state.tags().get("SP", ""))
@@ -108,33 +115,30 @@ class ProcessPanel(QtWidgets.QWidget):
 
     # ----- bindings
     def _vm_to_ui(self):
+        # touch only widgets whose value moved, with their signals blocked so nothing echoes back to the VM
         m = self.vm.model()
-        self.model.setCurrentText(m)
+        if self.model.currentText() != m:
+            with QtCore.QSignalBlocker(self.model):
+                self.model.setCurrentText(m)
         self.stack.setCurrentIndex({"FOPDT": 0, "SOPDT": 1, "Integrating": 2}[m])
         p = self.vm.get_params()
-        if m == "FOPDT":
-            self.f_k.setValue(p["K"]); self.f_tau.setValue(p["tau"]); self.f_theta.setValue(p["theta"])
-        elif m == "SOPDT":
-            self.s_k.setValue(p["K"]); self.s_tau1.setValue(p["tau1"]); self.s_tau2.setValue(p["tau2"])
-            self.s_theta.setValue(p["theta"]); self.s_zeta.setValue(p["zeta"])
-        else:
-            self.i_ki.setValue(p["Ki"]); self.i_theta.setValue(p["theta"])
+        for name, spin in self._fields[m]:
+            v = p[name]
+            if abs(spin.value() - v) > 1e-12:
+                with QtCore.QSignalBlocker(spin):
+                    spin.setValue(v)
 
     def _wire(self):
         # UI -> VM
         self.model.currentTextChanged.connect(self._on_model_changed)
-        self.f_k.valueChanged.connect(lambda v: self.vm.set_fopdt(v, self.f_tau.value(), self.f_theta.value()))
-        self.f_tau.valueChanged.connect(lambda v: self.vm.set_fopdt(self.f_k.value(), v, self.f_theta.value()))
-        self.f_theta.valueChanged.connect(lambda v: self.vm.set_fopdt(self.f_k.value(), self.f_tau.value(), v))
-
-        self.s_k.valueChanged.connect(lambda v: self.vm.set_sopdt(v, self.s_tau1.value(), self.s_tau2.value(), self.s_theta.value(), self.s_zeta.value()))
-        self.s_tau1.valueChanged.connect(lambda v: self.vm.set_sopdt(self.s_k.value(), v, self.s_tau2.value(), self.s_theta.value(), self.s_zeta.value()))
-        self.s_tau2.valueChanged.connect(lambda v: self.vm.set_sopdt(self.s_k.value(), self.s_tau1.value(), v, self.s_theta.value(), self.s_zeta.value()))
-        self.s_theta.valueChanged.connect(lambda v: self.vm.set_sopdt(self.s_k.value(), self.s_tau1.value(), self.s_tau2.value(), v, self.s_zeta.value()))
-        self.s_zeta.valueChanged.connect(lambda v: self.vm.set_sopdt(self.s_k.value(), self.s_tau1.value(), self.s_tau2.value(), self.s_theta.value(), v))
-
-        self.i_ki.valueChanged.connect(lambda v: self.vm.set_integrator(v, self.i_theta.value()))
-        self.i_theta.valueChanged.connect(lambda v: self.vm.set_integrator(self.i_ki.value(), v))
+        # spin edits are debounced per page: one VM commit after the user pauses, not one per field
+        self._commit_fopdt_timer = self._debounce(self._commit_fopdt)
+        self._commit_sopdt_timer = self._debounce(self._commit_sopdt)
+        self._commit_int_timer = self._debounce(self._commit_integrator)
+        for page, timer in (("FOPDT", self._commit_fopdt_timer), ("SOPDT", self._commit_sopdt_timer),
+                            ("Integrating", self._commit_int_timer)):
+            for _, spin in self._fields[page]:
+                spin.valueChanged.connect(lambda _v, t=timer: t.start())
 
         # VM -> UI
         self.vm.modelChanged.connect(lambda *_: self._vm_to_ui())
@@ -147,12 +151,29 @@ class ProcessPanel(QtWidgets.QWidget):
         self.btn_pick.clicked.connect(self._pick_tags)
         self.app_state.tagMapChanged.connect(self._on_tags_changed)
 
+    def _debounce(self, slot, ms: int = 50) -> QtCore.QTimer:
+        t = QtCore.QTimer(self)
+        t.setSingleShot(True)
+        t.setInterval(ms)
+        t.timeout.connect(slot)
+        return t
+
     # ---- handlers
+    def _commit_fopdt(self):
+        self.vm.set_fopdt(self.f_k.value(), self.f_tau.value(), self.f_theta.value())
+
+    def _commit_sopdt(self):
+        self.vm.set_sopdt(self.s_k.value(), self.s_tau1.value(), self.s_tau2.value(), self.s_theta.value(), self.s_zeta.value())
+
+    def _commit_integrator(self):
+        self.vm.set_integrator(self.i_ki.value(), self.i_theta.value())
+
     @QtCore.Slot(str)
     def _on_model_changed(self, txt: str):
         self.vm.set_model(txt)
         self.stack.setCurrentIndex({"FOPDT": 0, "SOPDT": 1, "Integrating": 2}[self.vm.model()])
 
+    @QtCore.Slot()
     def _pick_tags(self):
         dlg = TagPicker(self)
         # pre-populate sources; real app will query OPC/db
@@ -167,6 +188,7 @@ class ProcessPanel(QtWidgets.QWidget):
         if dlg.exec() == QtWidgets.QDialog.Accepted:
             self.app_state.set_tag(dlg.selected_role(), dlg.selected_tag())
 
+    @QtCore.Slot(dict)
     def _on_tags_changed(self, mapping: dict):
         self.sp_tag.setText(mapping.get("SP", ""))
         self.pv_tag.setText(mapping.get("PV", ""))
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from PySide6 import QtCore, QtGui, QtWidgets
 from viewmodels.app_state import AppState
@@ -48,6 +48,11 @@ class ProjectBrowser(QtWidgets.QTreeWidget):
     new_case_requested = QtCore.Signal()
     delete_node_requested = QtCore.Signal(str, str)
 
+    # item flags, fixed per kind: QTreeWidgetItem's defaults plus our additions
+    _FLAGS_STATIC = (QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsDragEnabled
+                     | QtCore.Qt.ItemIsDropEnabled | QtCore.Qt.ItemIsUserCheckable)
+    _FLAGS_EDITABLE = _FLAGS_STATIC | QtCore.Qt.ItemIsEditable
+
     def __init__(self, state: AppState, parent: Optional[QtWidgets.QWidget] = None):
         super().__init__(parent)
         self.state = state
@@ -61,6 +66,25 @@ class ProjectBrowser(QtWidgets.QTreeWidget):
         self.setDragDropMode(QtWidgets.QAbstractItemView.DragOnly)
         self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
 
+        # context menus: node type -> (menu, section action) and node type -> {action: handler},
+        # all built here from one shared set of actions
+        self._acts = self._make_actions()
+        self._menus: Dict[str, Tuple[QtWidgets.QMenu, Optional[QtGui.QAction]]] = {}
+        self._handlers: Dict[str, Dict[QtGui.QAction, Callable[[QtWidgets.QTreeWidgetItem], None]]] = {}
+        self._init_menus()
+
+        # list_signals()/list_cases() results; any row insert/remove or rename drops them
+        self._list_cache: Dict[str, List[str]] = {}
+        self.model().rowsInserted.connect(self._invalidate_lists)
+        self.model().rowsRemoved.connect(self._invalidate_lists)
+        self.model().modelReset.connect(self._invalidate_lists)
+        self.itemChanged.connect(self._invalidate_lists)
+
+        # signal children are created after the first paint (see _on_expanded)
+        self._signal_tags: List[str] = []
+        self._signals_placeholder: Optional[QtWidgets.QTreeWidgetItem] = None
+        self.itemExpanded.connect(self._on_expanded)
+
         # build initial tree
         self._build()
 
@@ -69,20 +93,27 @@ class ProjectBrowser(QtWidgets.QTreeWidget):
     def _mk(self, text: str, node_type: str, editable: bool = False) -> QtWidgets.QTreeWidgetItem:
         it = QtWidgets.QTreeWidgetItem([text])
         it.setData(0, ROLE_NODE_TYPE, node_type)
-        if editable:
-            it.setFlags(it.flags() | QtCore.Qt.ItemIsEditable | QtCore.Qt.ItemIsDragEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled)
-        else:
-            it.setFlags(it.flags() | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled)
+        it.setFlags(self._FLAGS_EDITABLE if editable else self._FLAGS_STATIC)
         return it
 
     def _build(self):
+        # one repaint for the whole rebuild; groups are filled before they join the tree
+        self.setUpdatesEnabled(False)
+        try:
+            self._build_items()
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _build_items(self):
         self.clear()
         root = self._mk("PID Tuner Project", TYPE_ROOT)
 
-        # Signals group
+        # Signals group: a placeholder until the group is first expanded
         self.node_signals = self._mk("Signals", TYPE_SIGNALS)
-        for tag in ["TCAF", "PCAF", "TCBE", "TCCF", "TCCD", "TCAF.SP"]:
-            self.node_signals.addChild(self._mk(tag, TYPE_SIGNAL, editable=True))
+        self._signal_tags = ["TCAF", "PCAF", "TCBE", "TCCF", "TCCD", "TCAF.SP"]
+        self._signals_placeholder = QtWidgets.QTreeWidgetItem(["Loading…"])
+        self._signals_placeholder.setFlags(QtCore.Qt.ItemIsEnabled)
+        self.node_signals.addChild(self._signals_placeholder)
 
         # Imported Models
         self.node_imported = self._mk("Imported Models", TYPE_IMPORTED)
@@ -91,14 +122,27 @@ class ProjectBrowser(QtWidgets.QTreeWidget):
         self.node_cases = self._mk("Loop Tuning Cases", TYPE_CASES)
         self.node_cases.addChild(self._mk(self.state.current_case(), TYPE_CASE, editable=True))
 
-        root.addChild(self.node_signals)
-        root.addChild(self.node_imported)
-        root.addChild(self.node_cases)
+        root.addChildren([self.node_signals, self.node_imported, self.node_cases])
         self.addTopLevelItem(root)
         self.expandItem(root)
         self.expandItem(self.node_signals)
         self.expandItem(self.node_cases)
 
+    @QtCore.Slot(QtWidgets.QTreeWidgetItem)
+    def _on_expanded(self, item: QtWidgets.QTreeWidgetItem):
+        # paint the placeholder first, fill the real children on the next loop iteration
+        if item is self.node_signals and self._signals_placeholder is not None:
+            QtCore.QTimer.singleShot(0, self._populate_signals)
+
+    def _populate_signals(self):
+        # also called before anything reads or appends signal children
+        ph = self._signals_placeholder
+        if ph is None:
+            return
+        self._signals_placeholder = None
+        self.node_signals.removeChild(ph)
+        self.node_signals.addChildren([self._mk(tag, TYPE_SIGNAL, editable=True) for tag in self._signal_tags])
+
     # --------------- Context Menu ----------------
 
     def contextMenuEvent(self, event: QtGui.QContextMenuEvent):
@@ -106,97 +150,143 @@ class ProjectBrowser(QtWidgets.QTreeWidget):
         if not it:
             return
         node_type = it.data(0, ROLE_NODE_TYPE)
-        name = it.text(0)
 
-        menu = QtWidgets.QMenu(self)
+        entry = self._menus.get(node_type)
+        if entry is None:
+            return
+        menu, section = entry
+        if section is not None:
+            section.setText(it.text(0))
 
+        chosen = menu.exec(self.mapToGlobal(event.pos()))
+        handler = self._handlers[node_type].get(chosen)
+        if handler:
+            handler(it)
+
+    def _make_actions(self) -> Dict[str, QtGui.QAction]:
+        # created once and shared by the per-type menus; what they do is per type (see _handlers)
+        return {key: QtGui.QAction(text, self) for key, text in (
+            ("add", "Add Signal…"),
+            ("rename_sel", "Rename Selected…"),
+            ("remove_sel", "Remove Selected"),
+            ("subua", "Import from OPC UA…"),
+            ("subda", "Import from OPC DA…"),
+            ("disc", "OPC UA: Discover Local Servers"),
+            ("sub", "Subscribe Live"),
+            ("rename", "Rename…"),
+            ("del_signal", "Remove"),
+            ("new", "New Case"),
+            ("dup", "Duplicate Case"),
+            ("del_case", "Delete Case"),
+        )}
+
+    def _init_menus(self):
+        # root and the Signals group share one menu
+        signals = self._build_menu_signals()
+        for node_type, built in (
+            (TYPE_ROOT, signals),
+            (TYPE_SIGNALS, signals),
+            (TYPE_SIGNAL, self._build_menu_signal()),
+            (TYPE_CASES, self._build_menu_cases()),
+            (TYPE_CASE, self._build_menu_case()),
+        ):
+            menu, section, handlers = built
+            self._menus[node_type] = (menu, section)
+            self._handlers[node_type] = handlers
+
+    # Each builder returns (menu, section action or None, {action: handler});
+    # node names go into the section text.
+
+    def _build_menu_signals(self):
         # ROOT or SIGNALS group → add/import/discover
-        if node_type in (TYPE_ROOT, TYPE_SIGNALS):
-            menu.addSection("Signals")
-            act_add = menu.addAction("Add Signal…")
-            act_rename = menu.addAction("Rename Selected…")
-            act_remove = menu.addAction("Remove Selected")
-            menu.addSeparator()
-            act_subua = menu.addAction("Import from OPC UA…")
-            act_subda = menu.addAction("Import from OPC DA…")
-            menu.addSeparator()
-            act_disc = menu.addAction("OPC UA: Discover Local Servers")
-
+        a = self._acts
+        menu = QtWidgets.QMenu(self)
+        menu.addSection("Signals")
+        menu.addActions([a["add"], a["rename_sel"], a["remove_sel"]])
+        menu.addSeparator()
+        menu.addActions([a["subua"], a["subda"]])
+        menu.addSeparator()
+        menu.addAction(a["disc"])
+        return menu, None, {
+            a["add"]: self._h_add_signal,
+            a["rename_sel"]: self._h_rename,
+            a["remove_sel"]: self._h_remove,
+            a["subua"]: self._h_import_ua,
+            a["subda"]: self._h_import_da,
+            a["disc"]: self._h_discover,
+        }
+
+    def _build_menu_signal(self):
         # individual SIGNAL → subscribe/rename/remove
-        elif node_type == TYPE_SIGNAL:
-            menu.addSection(name)
-            act_sub = menu.addAction("Subscribe Live")
-            act_rename = menu.addAction("Rename…")
-            act_del = menu.addAction("Remove")
-
+        a = self._acts
+        menu = QtWidgets.QMenu(self)
+        section = menu.addSection("")
+        menu.addActions([a["sub"], a["rename"], a["del_signal"]])
+        return menu, section, {
+            a["sub"]: self._h_subscribe,
+            a["rename"]: self._h_rename,
+            a["del_signal"]: self._h_remove,
+        }
+
+    def _build_menu_cases(self):
         # CASES group → new case
-        elif node_type == TYPE_CASES:
-            menu.addSection("Cases")
-            act_new = menu.addAction("New Case")
+        a = self._acts
+        menu = QtWidgets.QMenu(self)
+        menu.addSection("Cases")
+        menu.addAction(a["new"])
+        return menu, None, {a["new"]: self._h_new_case}
 
+    def _build_menu_case(self):
         # individual CASE → duplicate/delete/rename
-        elif node_type == TYPE_CASE:
-            menu.addSection(name)
-            act_dup = menu.addAction("Duplicate Case")
-            act_rename = menu.addAction("Rename…")
-            act_del = menu.addAction("Delete Case")
+        a = self._acts
+        menu = QtWidgets.QMenu(self)
+        section = menu.addSection("")
+        menu.addActions([a["dup"], a["rename"], a["del_case"]])
+        return menu, section, {
+            a["dup"]: self._h_dup_case,
+            a["rename"]: self._h_rename,
+            a["del_case"]: self._h_remove,
+        }
 
-        chosen = menu.exec(self.mapToGlobal(event.pos()))
-        if not chosen:
-            return
+    # ---- menu handlers: each takes the right-clicked item
 
-        # ---- Signals group / root actions
-        if 'act_add' in locals() and chosen == act_add:
-            text, ok = QtWidgets.QInputDialog.getText(self, "Add Signal", "Tag name:")
-            if ok and text.strip():
-                self._add_signal(text.strip())
+    def _h_add_signal(self, it: QtWidgets.QTreeWidgetItem):
+        text, ok = QtWidgets.QInputDialog.getText(self, "Add Signal", "Tag name:")
+        if ok and text.strip():
+            self._add_signal(text.strip())
 
-        if 'act_rename' in locals() and chosen == act_rename:
-            self.editItem(it, 0)
+    def _h_import_ua(self, it: QtWidgets.QTreeWidgetItem):
+        endpoint, ok = QtWidgets.QInputDialog.getText(self, "OPC UA Endpoint", "e.g. opc.tcp://localhost:4840")
+        if ok and endpoint.strip():
+            self.request_opc_ua_connect_browse.emit(endpoint.strip())
+
+    def _h_import_da(self, it: QtWidgets.QTreeWidgetItem):
+        host, ok = QtWidgets.QInputDialog.getText(self, "OPC DA Host", "Computer name (blank = local):")
+        if ok:
+            self.request_opc_da_browse.emit(host.strip())
+
+    def _h_discover(self, it: QtWidgets.QTreeWidgetItem):
+        self.request_opc_ua_discover.emit()
+
+    def _h_subscribe(self, it: QtWidgets.QTreeWidgetItem):
+        self.subscribe_live_requested.emit(it.text(0))
+
+    def _h_new_case(self, it: QtWidgets.QTreeWidgetItem):
+        self._add_case("new case")
+
+    def _h_dup_case(self, it: QtWidgets.QTreeWidgetItem):
+        self._duplicate_case(it)
+
+    def _h_rename(self, it: QtWidgets.QTreeWidgetItem):
+        self.editItem(it, 0)
 
-        if 'act_remove' in locals() and chosen == act_remove and node_type in (TYPE_SIGNAL,):
+    def _h_remove(self, it: QtWidgets.QTreeWidgetItem):
+        node_type = it.data(0, ROLE_NODE_TYPE)
+        if node_type in (TYPE_SIGNAL, TYPE_CASE):
+            name = it.text(0)
             parent = it.parent() or self.invisibleRootItem()
             parent.removeChild(it)
-            self.delete_node_requested.emit(TYPE_SIGNAL, name)
-
-        if 'act_subua' in locals() and chosen == act_subua:
-            endpoint, ok = QtWidgets.QInputDialog.getText(self, "OPC UA Endpoint", "e.g. opc.tcp://localhost:4840")
-            if ok and endpoint.strip():
-                self.request_opc_ua_connect_browse.emit(endpoint.strip())
-
-        if 'act_subda' in locals() and chosen == act_subda:
-            host, ok = QtWidgets.QInputDialog.getText(self, "OPC DA Host", "Computer name (blank = local):")
-            if ok:
-                self.request_opc_da_browse.emit(host.strip())
-
-        if 'act_disc' in locals() and chosen == act_disc:
-            self.request_opc_ua_discover.emit()
-
-        # ---- Individual signal actions
-        if node_type == TYPE_SIGNAL:
-            if chosen == locals().get('act_sub'):
-                self.subscribe_live_requested.emit(name)
-            if chosen == locals().get('act_del'):
-                parent = it.parent() or self.invisibleRootItem()
-                parent.removeChild(it)
-                self.delete_node_requested.emit(TYPE_SIGNAL, name)
-            if chosen == locals().get('act_rename'):
-                self.editItem(it, 0)
-
-        # ---- Cases group
-        if node_type == TYPE_CASES and chosen == locals().get('act_new'):
-            self._add_case("new case")
-
-        # ---- Case node actions
-        if node_type == TYPE_CASE:
-            if chosen == locals().get('act_dup'):
-                self._duplicate_case(it)
-            if chosen == locals().get('act_del'):
-                parent = it.parent() or self.invisibleRootItem()
-                parent.removeChild(it)
-                self.delete_node_requested.emit(TYPE_CASE, name)
-            if chosen == locals().get('act_rename'):
-                self.editItem(it, 0)
+            self.delete_node_requested.emit(node_type, name)
 
     # --------------- Editing / Drag ---------------
 
@@ -236,6 +326,7 @@ class ProjectBrowser(QtWidgets.QTreeWidget):
     # --------------- Public helpers ---------------
 
     def _add_signal(self, name: str):
+        self._populate_signals()
         child = self._mk(name, TYPE_SIGNAL, editable=True)
         self.node_signals.addChild(child)
         self.expandItem(self.node_signals)
@@ -257,13 +348,18 @@ class ProjectBrowser(QtWidgets.QTreeWidget):
 
     # convenience getters
     def list_signals(self) -> List[str]:
-        out: List[str] = []
-        for i in range(self.node_signals.childCount()):
-            out.append(self.node_signals.child(i).text(0))
-        return out
+        self._populate_signals()
+        return list(self._child_names(TYPE_SIGNALS, self.node_signals))
 
     def list_cases(self) -> List[str]:
-        out: List[str] = []
-        for i in range(self.node_cases.childCount()):
-            out.append(self.node_cases.child(i).text(0))
-        return out
+        return list(self._child_names(TYPE_CASES, self.node_cases))
+
+    def _child_names(self, key: str, node: QtWidgets.QTreeWidgetItem) -> List[str]:
+        names = self._list_cache.get(key)
+        if names is None:
+            names = self._list_cache[key] = [node.child(i).text(0) for i in range(node.childCount())]
+        return names
+
+    @QtCore.Slot()
+    def _invalidate_lists(self):
+        self._list_cache.clear()
@@ -70,13 +70,43 @@ class SimulationPanel(QtWidgets.QWidget):
         self.lbl_status.setText("Running" if self.vm._running else "Stopped")
 
     def _wire(self):
-        # UI -> VM
-        self.sp.valueChanged.connect(self.vm.set_sp)
-        self.noise.valueChanged.connect(self.vm.set_noise)
-        self.speed.valueChanged.connect(self.vm.set_speed)
+        # UI -> VM: arrow/wheel steps are debounced to one VM call after the user pauses;
+        # finishing a typed edit (Enter / focus out) commits at once
+        for spin, commit in ((self.sp, self._commit_sp), (self.noise, self._commit_noise),
+                             (self.speed, self._commit_speed)):
+            timer = self._debounce(commit)
+            spin.valueChanged.connect(lambda _v, t=timer: t.start())
+            spin.editingFinished.connect(lambda t=timer, c=commit: self._flush_pending(t, c))
         self.btn_run.clicked.connect(self.vm.start)
         self.btn_stop.clicked.connect(self.vm.stop)
         self.btn_clear.clicked.connect(self.vm.clear_history)
 
         # VM -> UI
-        self.vm.runningChanged.connect(lambda r: self.lbl_status.setText("Running" if r else "Stopped"))
+        self.vm.runningChanged.connect(self._on_running)
+
+    def _debounce(self, slot, ms: int = 50) -> QtCore.QTimer:
+        t = QtCore.QTimer(self)
+        t.setSingleShot(True)
+        t.setInterval(ms)
+        t.timeout.connect(slot)
+        return t
+
+    def _flush_pending(self, timer: QtCore.QTimer, commit):
+        # editingFinished also fires on a plain focus change; only commit a pending value
+        if timer.isActive():
+            timer.stop()
+            commit()
+
+    # ---- handlers
+    def _commit_sp(self):
+        self.vm.set_sp(self.sp.value())
+
+    def _commit_noise(self):
+        self.vm.set_noise(self.noise.value())
+
+    def _commit_speed(self):
+        self.vm.set_speed(self.speed.value())
+
+    @QtCore.Slot(bool)
+    def _on_running(self, running: bool):
+        self.lbl_status.setText("Running" if running else "Stopped")
@@ -40,7 +40,9 @@ class TuningPanel(QtWidgets.QWidget):
         # --- bounds + optimize tables
         self.bounds = BoundsTable()
         self.bounds.set_parameters(["Gain", "Ti", "Td"], self.vm.bounds())
-        self.bounds.boundsChanged.connect(self.vm.set_bounds)
+        self.bounds.boundsChanged.connect(self._on_table_bounds)
+        # set while VM state is written into the tables, so their change signals are not echoed back
+        self._applying_from_vm = False
 
         self.case = CaseTable()
         # seed with a typical case row set
@@ -51,6 +53,7 @@ class TuningPanel(QtWidgets.QWidget):
         ]
         self.case.set_rows(rows)
         self.case.tableChanged.connect(self._on_case_changed)
+        self.case.cellDelta.connect(self._on_cell_delta)
 
         # --- buttons + results
         self.btn_compute = QtWidgets.QPushButton("Compute")
@@ -86,14 +89,14 @@ class TuningPanel(QtWidgets.QWidget):
         self._apply_rule_ui()
         self._wire()
 
+    @QtCore.Slot()
     def _sync_optimize_from_vm(self):
         """
         Refresh any optimize/tuning UI controls from the current VM state.
         This is intentionally simple; expand if you expose more controls.
         """
         # Example: refresh bounds table from VM
-        names = ["Gain", "Ti", "Td"]
-        self.bounds.set_parameters(names, self.vm.bounds())
+        self._on_vm_bounds(self.vm.bounds())
 
     # ---- helpers
     def _param_row(self, label: str, default: float, setter):
@@ -121,9 +124,26 @@ class TuningPanel(QtWidgets.QWidget):
 
         # VM -> UI
         self.vm.resultChanged.connect(self._display_result)
-        self.vm.boundsChanged.connect(lambda b: self.bounds.set_parameters(["Gain", "Ti", "Td"], b))
-        self.vm.optimizeMapChanged.connect(lambda m: self._sync_optimize_from_vm())
-
+        self.vm.boundsChanged.connect(self._on_vm_bounds)
+        self.vm.optimizeMapChanged.connect(self._sync_optimize_from_vm)
+
+    @QtCore.Slot(dict)
+    def _on_vm_bounds(self, bounds: dict):
+        if self._applying_from_vm:
+            return
+        self._applying_from_vm = True
+        try:
+            self.bounds.set_bounds(bounds)  # rows are fixed; values only
+        finally:
+            self._applying_from_vm = False
+
+    @QtCore.Slot(dict)
+    def _on_table_bounds(self, bounds: dict):
+        if self._applying_from_vm:
+            return
+        self.vm.set_bounds(bounds)
+
+    @QtCore.Slot(str)
     def _on_rule_changed(self, name: str):
         self.vm.set_rule(name)
         self._apply_rule_ui()
@@ -132,38 +152,40 @@ class TuningPanel(QtWidgets.QWidget):
         idx = {"SIMC": 0, "Lambda": 1, "ZN": 2}[self.vm.rule()]
         self.stack.setCurrentIndex(idx)
 
+    @QtCore.Slot(float, float, float)
     def _display_result(self, Kp: float, Ti: float, Td: float):
         self.lbl_result.setText(f"Kp={Kp:.6g}, Ti={Ti:.6g}, Td={Td:.6g}")
         # also reflect in CaseTable "Final"
-        rows = self.case.get_rows()
-        if "Gain" in rows:
-            rows["Gain"]["final"] = Kp
-        if "Ti" in rows:
-            rows["Ti"]["final"] = Ti
-        if "Td" in rows:
-            rows["Td"]["final"] = Td
-        # reapply (preserve optimize/others)
-        new_rows = [
-            ("Gain", rows["Gain"]["optimize"], rows["Gain"]["lower"], rows["Gain"]["upper"],
-             rows["Gain"]["existing"], rows["Gain"]["initial"], rows["Gain"]["final"]),
-            ("Ti", rows["Ti"]["optimize"], rows["Ti"]["lower"], rows["Ti"]["upper"],
-             rows["Ti"]["existing"], rows["Ti"]["initial"], rows["Ti"]["final"]),
-            ("Td", rows["Td"]["optimize"], rows["Td"]["lower"], rows["Td"]["upper"],
-             rows["Td"]["existing"], rows["Td"]["initial"], rows["Td"]["final"]),
-        ]
-        self.case.set_rows(new_rows)
+        self.case.set_final("Gain", Kp)
+        self.case.set_final("Ti", Ti)
+        self.case.set_final("Td", Td)
 
+    @QtCore.Slot(dict)
     def _on_case_changed(self, rows: dict):
+        if self._applying_from_vm:
+            return
         # push optimize flags and bounds back to VM
         opt = {k: bool(v["optimize"]) for k, v in rows.items() if k in ("Gain", "Ti", "Td")}
         bnd = {k: (float(v["lower"]), float(v["upper"])) for k, v in rows.items() if k in ("Gain", "Ti", "Td")}
         self.vm.set_optimize_map(opt)
         self.vm.set_bounds(bnd)
 
+    @QtCore.Slot(str, str, object)
+    def _on_cell_delta(self, name: str, field: str, value):
+        if self._applying_from_vm:
+            return
+        # single cell edit: touch only that flag/bound on the VM
+        if field == "optimize":
+            self.vm.set_optimize_flag(name, bool(value))
+        elif field in ("lower", "upper"):
+            self.vm.set_bound(name, field, float(value))
+
+    @QtCore.Slot()
     def _compute(self):
         res = self.vm.compute(self.proc_vm)
         self._display_result(res.Kp, res.Ti, res.Td)
 
+    @QtCore.Slot()
     def _apply(self):
         res = self.vm.apply_to_controller(self.ctrl_vm, self.proc_vm)
         self._display_result(res.Kp, res.Ti, res.Td)
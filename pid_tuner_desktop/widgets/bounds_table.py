@@ -1,13 +1,146 @@
 from __future__ import annotations
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
 
 
-class BoundsTable(QtWidgets.QTableWidget):
+class BoundsModel(QtCore.QAbstractTableModel):
+    """
+    Name / Lower / Upper rows kept as plain arrays (names list + float64 low/high);
+    cells are formatted on demand instead of being stored as items.
+
+    rowEdited(row) fires only for edits made through the view (setData);
+    bulk updates from code emit dataChanged alone.
+    """
+
+    rowEdited = QtCore.Signal(int)
+
+    HEADERS = ["Parameter", "Lower", "Upper"]
+    COL_NAME = 0
+    COL_LOW = 1
+    COL_HIGH = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names: List[str] = []
+        self._low = np.empty(0, dtype=np.float64)
+        self._high = np.empty(0, dtype=np.float64)
+        self._locked = False
+        self._bounds_cache: Dict[str, Tuple[float, float]] | None = None  # see bounds()
+
+    # ---------- Qt model interface ----------
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        r, c = index.row(), index.column()
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            if c == self.COL_NAME:
+                return self._names[r]
+            # text for editing too: keeps the line-edit editor (a float would get a 2-decimal spin box)
+            return self._FMT(self._low[r] if c == self.COL_LOW else self._high[r])
+        if role == QtCore.Qt.TextAlignmentRole and c != self.COL_NAME:
+            return int(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def flags(self, index: QtCore.QModelIndex):
+        flags = QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled
+        if index.column() != self.COL_NAME and not self._locked:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index: QtCore.QModelIndex, value, role=QtCore.Qt.EditRole) -> bool:
+        if role != QtCore.Qt.EditRole or not index.isValid() or index.column() == self.COL_NAME:
+            return False
+        try:
+            v = float(value)  # parsed once; invalid text keeps the previous value
+        except (TypeError, ValueError):
+            return False
+        r = index.row()
+        if index.column() == self.COL_LOW:
+            self._low[r] = v
+        else:
+            self._high[r] = v
+        if self._low[r] > self._high[r]:
+            # swap to enforce low<=high
+            self._low[r], self._high[r] = self._high[r], self._low[r]
+        if self._bounds_cache is not None and self._names.count(self._names[r]) == 1:
+            self._bounds_cache[self._names[r]] = (float(self._low[r]), float(self._high[r]))
+        else:
+            self._bounds_cache = None
+        self.dataChanged.emit(self.index(r, self.COL_LOW), self.index(r, self.COL_HIGH))
+        self.rowEdited.emit(r)
+        return True
+
+    # ---------- bulk access ----------
+    def set_rows(self, names: Sequence[str], low: Sequence[float], high: Sequence[float]):
+        self.beginResetModel()
+        self._names = list(names)
+        self._low = np.array(low, dtype=np.float64)
+        self._high = np.array(high, dtype=np.float64)
+        self._bounds_cache = None
+        self.endResetModel()
+
+    def set_values(self, rows: Sequence[int], low: Sequence[float], high: Sequence[float]):
+        """Overwrite low/high of the given rows; one dataChanged over the touched span."""
+        if not len(rows):
+            return
+        idx = np.asarray(rows, dtype=np.intp)
+        self._low[idx] = low
+        self._high[idx] = high
+        self._bounds_cache = None
+        self.dataChanged.emit(self.index(int(idx.min()), self.COL_LOW), self.index(int(idx.max()), self.COL_HIGH))
+
+    def set_locked(self, locked: bool):
+        self._locked = bool(locked)
+        if self._names:
+            # flags are read per index; nudge views to re-query them
+            self.dataChanged.emit(self.index(0, self.COL_LOW), self.index(len(self._names) - 1, self.COL_HIGH))
+
+    def name(self, row: int) -> str:
+        return self._names[row]
+
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def bounds(self) -> Dict[str, Tuple[float, float]]:
+        """{name: (low, high)}; the dict is shared between calls, treat it as read-only."""
+        if self._bounds_cache is None:
+            self._bounds_cache = dict(zip(self._names, zip(self._low.tolist(), self._high.tolist())))
+        return self._bounds_cache
+
+    def row_text(self, row: int) -> List[str]:
+        return [self._names[row], self._FMT(self._low[row]), self._FMT(self._high[row])]
+
+    # compact float formatting; the bound str.format is looked up once, not per cell
+    _FMT = "{:.6g}".format
+
+
+class _BoundsDelegate(QtWidgets.QStyledItemDelegate):
+    """Lower/Upper line-edit editors get the table's shared number validator."""
+
+    def createEditor(self, parent, option, index):
+        editor = super().createEditor(parent, option, index)
+        if isinstance(editor, QtWidgets.QLineEdit):
+            editor.setValidator(BoundsTable._get_validator())
+        return editor
+
+
+class BoundsTable(QtWidgets.QTableView):
     """
     Lower/Upper bounds editor with validation, copy/paste (TSV/CSV),
     context menu (Reset Selected / Reset All), and a 'locked' option
-    to prevent edits.
+    to prevent edits. Rows live in a BoundsModel.
 
     API:
         set_parameters(names, bounds=None) -> load rows
@@ -23,98 +156,79 @@ class BoundsTable(QtWidgets.QTableWidget):
     boundsChanged = QtCore.Signal(dict)
     cellEdited = QtCore.Signal(str, float, float)
 
-    COL_NAME = 0
-    COL_LOW = 1
-    COL_HIGH = 2
+    COL_NAME = BoundsModel.COL_NAME
+    COL_LOW = BoundsModel.COL_LOW
+    COL_HIGH = BoundsModel.COL_HIGH
+
+    _VALIDATOR: QtGui.QDoubleValidator | None = None  # shared by all tables, see _get_validator()
 
     def __init__(self, parent=None):
-        super().__init__(0, 3, parent)
+        super().__init__(parent)
+        self._model = BoundsModel(self)
+        self.setModel(self._model)
+        self.setItemDelegate(_BoundsDelegate(self))
         self.setAlternatingRowColors(True)
         self.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.setEditTriggers(QtWidgets.QAbstractItemView.DoubleClicked | QtWidgets.QAbstractItemView.EditKeyPressed)
-        self.setHorizontalHeaderLabels(["Parameter", "Lower", "Upper"])
         self.horizontalHeader().setStretchLastSection(True)
         self.verticalHeader().setVisible(False)
+        # fixed row height: layout/scroll never asks the rows for a size hint
+        vh = self.verticalHeader()
+        vh.setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        vh.setDefaultSectionSize(self.fontMetrics().height() + 6)
         self._locked = False
-        self._validator = QtGui.QDoubleValidator(bottom=-1e12, top=1e12, decimals=6)
         self._default_low = -1e6
         self._default_high = 1e6
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self._open_menu)
-        self.itemChanged.connect(self._on_item_changed)
-        self._in_change = False
+        self._model.rowEdited.connect(self._on_row_edited)
 
         # Shortcuts
         QtGui.QShortcut(QtGui.QKeySequence.Copy, self, self.copy_selection)
         QtGui.QShortcut(QtGui.QKeySequence.Paste, self, self.paste_into_selection)
 
     # ---------- Public API ----------
+    def rowCount(self) -> int:
+        return self._model.rowCount()
+
     def set_locked(self, locked: bool):
         self._locked = locked
-        flags = QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled
-        if not locked:
-            flags |= QtCore.Qt.ItemIsEditable
-        for r in range(self.rowCount()):
-            for c in (self.COL_LOW, self.COL_HIGH):
-                it = self.item(r, c)
-                if it:
-                    it.setFlags(flags)
+        self._model.set_locked(locked)
 
     def set_parameters(self, names: List[str], bounds: Dict[str, Tuple[float, float]] | None = None):
-        self._in_change = True
-        try:
-            self.setRowCount(0)
-            for name in names:
-                r = self.rowCount()
-                self.insertRow(r)
-                name_item = QtWidgets.QTableWidgetItem(name)
-                name_item.setFlags(QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled)
-                self.setItem(r, self.COL_NAME, name_item)
-
-                low, high = bounds.get(name, (self._default_low, self._default_high)) if bounds else (
-                    self._default_low, self._default_high
-                )
-                low_item = self._make_num_item(low)
-                high_item = self._make_num_item(high)
-                self.setItem(r, self.COL_LOW, low_item)
-                self.setItem(r, self.COL_HIGH, high_item)
+        default = (self._default_low, self._default_high)
+        pairs = [bounds.get(name, default) if bounds else default for name in names]
+        lows, highs = [p[0] for p in pairs], [p[1] for p in pairs]
+        if list(names) == self._model.names():
+            # same rows (the usual VM round-trip): one dataChanged, no reset/re-measure,
+            # selection and scroll position survive
+            self._model.set_values(range(len(lows)), lows, highs)
+        else:
+            self._model.set_rows(names, lows, highs)
             self.resizeColumnsToContents()
-        finally:
-            self._in_change = False
         self.boundsChanged.emit(self.get_bounds())
 
     def set_bounds(self, mapping: Dict[str, Tuple[float, float]]):
         # updates a subset of rows
-        for r in range(self.rowCount()):
-            name = self.item(r, self.COL_NAME).text()
-            if name in mapping:
-                low, high = mapping[name]
-                self.item(r, self.COL_LOW).setText(self._fmt(low))
-                self.item(r, self.COL_HIGH).setText(self._fmt(high))
+        rows = [r for r in range(self.rowCount()) if self._model.name(r) in mapping]
+        pairs = [mapping[self._model.name(r)] for r in rows]
+        self._model.set_values(rows, [p[0] for p in pairs], [p[1] for p in pairs])
         self.boundsChanged.emit(self.get_bounds())
 
     def get_bounds(self) -> Dict[str, Tuple[float, float]]:
-        out: Dict[str, Tuple[float, float]] = {}
-        for r in range(self.rowCount()):
-            name = self.item(r, self.COL_NAME).text()
-            low = float(self.item(r, self.COL_LOW).text())
-            high = float(self.item(r, self.COL_HIGH).text())
-            out[name] = (low, high)
-        return out
+        """Current bounds; the returned dict is shared between calls, treat it as read-only."""
+        return self._model.bounds()
 
     # ---------- Internals ----------
-    def _make_num_item(self, value: float) -> QtWidgets.QTableWidgetItem:
-        it = QtWidgets.QTableWidgetItem(self._fmt(value))
-        it.setTextAlignment(int(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter))
-        it.setFlags((QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled |
-                    (QtCore.Qt.ItemIsEditable if not self._locked else QtCore.Qt.ItemIsSelectable)))
-        return it
-
-    @staticmethod
-    def _fmt(v: float) -> str:
-        # compact float formatting
-        return f"{v:.6g}"
+    @classmethod
+    def _get_validator(cls) -> QtGui.QDoubleValidator:
+        # built on first use and shared by every editor; C locale to match the model's float() parse
+        if cls._VALIDATOR is None:
+            cls._VALIDATOR = QtGui.QDoubleValidator(-1e12, 1e12, 6)
+            cls._VALIDATOR.setLocale(QtCore.QLocale.c())
+        return cls._VALIDATOR
 
+    @QtCore.Slot(QtCore.QPoint)
     def _open_menu(self, pos):
         menu = QtWidgets.QMenu(self)
         act_reset_sel = menu.addAction("Reset Selected")
@@ -135,55 +249,25 @@ class BoundsTable(QtWidgets.QTableWidget):
             self.paste_into_selection()
 
     def _reset_rows(self, rows: List[int]):
-        self._in_change = True
-        try:
-            for r in rows:
-                self.item(r, self.COL_LOW).setText(self._fmt(self._default_low))
-                self.item(r, self.COL_HIGH).setText(self._fmt(self._default_high))
-        finally:
-            self._in_change = False
+        self._model.set_values(rows, self._default_low, self._default_high)
         self.boundsChanged.emit(self.get_bounds())
 
     def _selected_rows(self) -> List[int]:
         rows = sorted({i.row() for i in self.selectedIndexes()})
         return rows or list(range(self.rowCount()))
 
-    def _on_item_changed(self, item: QtWidgets.QTableWidgetItem):
-        if self._in_change or item.column() not in (self.COL_LOW, self.COL_HIGH):
-            return
-
-        # validate numeric and low<=high
-        try:
-            float(item.text())
-        except ValueError:
-            # revert to previous valid text
-            self.blockSignals(True)
-            item.setText("0")
-            self.blockSignals(False)
-            return
-
-        r = item.row()
-        low = float(self.item(r, self.COL_LOW).text())
-        high = float(self.item(r, self.COL_HIGH).text())
-        if low > high:
-            # swap to enforce low<=high
-            self.blockSignals(True)
-            self.item(r, self.COL_LOW).setText(self._fmt(high))
-            self.item(r, self.COL_HIGH).setText(self._fmt(low))
-            self.blockSignals(False)
-            low, high = high, low
-
-        name = self.item(r, self.COL_NAME).text()
-        self.boundsChanged.emit(self.get_bounds())
+    @QtCore.Slot(int)
+    def _on_row_edited(self, r: int):
+        # the model already parsed the text and enforced low<=high
+        name = self._model.name(r)
+        bounds = self.get_bounds()
+        low, high = bounds[name]
+        self.boundsChanged.emit(bounds)
         self.cellEdited.emit(name, low, high)
 
     # ---------- Copy/Paste ----------
     def copy_selection(self):
-        rows = self._selected_rows()
-        cols = [self.COL_NAME, self.COL_LOW, self.COL_HIGH]
-        data: List[List[str]] = []
-        for r in rows:
-            data.append([self.item(r, c).text() for c in cols])
+        data = [self._model.row_text(r) for r in self._selected_rows()]
         text = "\n".join("\t".join(row) for row in data)
         QtWidgets.QApplication.clipboard().setText(text)
 
@@ -191,35 +275,43 @@ class BoundsTable(QtWidgets.QTableWidget):
         text = QtWidgets.QApplication.clipboard().text()
         if not text.strip():
             return
-        lines = [line for line in text.splitlines() if line.strip()]
         start_rows = self._selected_rows()
         r0 = start_rows[0] if start_rows else 0
+        lines = [line for line in text.splitlines() if line.strip()][:max(0, self.rowCount() - r0)]
 
-        self._in_change = True
-        try:
-            for i, line in enumerate(lines):
-                parts = [p.strip() for p in line.replace(",", "\t").split("\t")]
-                if not parts:
-                    continue
-                r = r0 + i
-                if r >= self.rowCount():
-                    break
-                # allow either [name, low, high] or [low, high]
-                if len(parts) == 3:
-                    name, low, high = parts
-                    if name and name != self.item(r, self.COL_NAME).text():
-                        # keep row name; ignore pasted name
-                        low, high = parts[1], parts[2]
-                elif len(parts) >= 2:
-                    low, high = parts[0], parts[1]
-                else:
-                    continue
-                try:
-                    float(low); float(high)
-                except ValueError:
-                    continue
-                self.item(r, self.COL_LOW).setText(self._fmt(float(low)))
-                self.item(r, self.COL_HIGH).setText(self._fmt(float(high)))
-        finally:
-            self._in_change = False
+        # pick the two text fields per line: either [name, low, high] or [low, high];
+        # a pasted name never renames the row
+        rows: List[int] = []
+        cells: List[Tuple[str, str]] = []
+        for i, line in enumerate(lines):
+            parts = line.replace(",", "\t").split("\t")
+            if len(parts) < 2:
+                continue
+            j = 1 if len(parts) == 3 else 0
+            rows.append(r0 + i)
+            cells.append((parts[j].strip(), parts[j + 1].strip()))
+        if rows:
+            rows, vals = self._parse_pairs(rows, cells)
+            # enforce low<=high like an edit does
+            swap = vals[:, 0] > vals[:, 1]
+            vals[swap] = vals[swap, ::-1]
+            self._model.set_values(rows, vals[:, 0], vals[:, 1])
         self.boundsChanged.emit(self.get_bounds())
+
+    @staticmethod
+    def _parse_pairs(rows: List[int], cells: List[Tuple[str, str]]) -> Tuple[List[int], np.ndarray]:
+        """(rows, (n, 2) float64) for the pasted text pairs; rows with a non-number are dropped."""
+        try:
+            return rows, np.array(cells, dtype=np.str_).astype(np.float64)  # one C-level parse
+        except ValueError:
+            pass
+        # some cell is not a number: parse row by row and skip the bad ones
+        kept: List[int] = []
+        vals: List[Tuple[float, float]] = []
+        for r, (low, high) in zip(rows, cells):
+            try:
+                vals.append((float(low), float(high)))
+            except ValueError:
+                continue
+            kept.append(r)
+        return kept, np.array(vals, dtype=np.float64).reshape(-1, 2)
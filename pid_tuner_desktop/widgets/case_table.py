@@ -1,9 +1,186 @@
 from __future__ import annotations
-from typing import Dict, Iterable, Tuple
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Sequence, Tuple
+import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
 
 
-class CaseTable(QtWidgets.QTableWidget):
+class CaseTableModel(QtCore.QAbstractTableModel):
+    """
+    Case rows kept as arrays: names list, bool optimize flags and a float64 (N, 5)
+    block for Lower/Upper/Existing/Initial/Final. Cell text is formatted on first
+    display and kept until that cell is written again.
+
+    rowEdited(row, columns) fires only for edits made through the view (setData);
+    bulk updates from code emit dataChanged alone.
+    """
+
+    rowEdited = QtCore.Signal(int, object)  # (row, [edited columns])
+
+    HEADERS = ["Optimize", "Parameter", "Lower", "Upper", "Existing", "Initial", "Final"]
+    COL_OPT = 0
+    COL_NAME = 1
+    COL_LOW = 2
+    COL_HIGH = 3
+    COL_EXIST = 4
+    COL_INIT = 5
+    COL_FINAL = 6
+    VAL0 = COL_LOW  # first numeric column: column c lives in _vals[:, c - VAL0]
+
+    _FMT = "{:.6g}".format
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names: List[str] = []
+        self._opt = np.zeros(0, dtype=np.bool_)
+        self._vals = np.zeros((0, 5), dtype=np.float64)
+        self._text = np.empty((0, 5), dtype=object)  # formatted _vals, None = not formatted yet
+        self._row_by_name: Dict[str, int] = {}  # rebuilt by set_rows, the only place rows change
+
+    # ---------- Qt model interface ----------
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        r, c = index.row(), index.column()
+        if c == self.COL_OPT:
+            if role == QtCore.Qt.CheckStateRole:
+                return QtCore.Qt.Checked if self._opt[r] else QtCore.Qt.Unchecked
+            return None
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            if c == self.COL_NAME:
+                return self._names[r]
+            # text for editing too: keeps the line-edit editor (a float would get a 2-decimal spin box)
+            return self._cell_text(r, c - self.VAL0)
+        if role == QtCore.Qt.TextAlignmentRole and c != self.COL_NAME:
+            return int(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def flags(self, index: QtCore.QModelIndex):
+        flags = QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled
+        c = index.column()
+        if c == self.COL_OPT:
+            flags |= QtCore.Qt.ItemIsUserCheckable
+        elif c != self.COL_NAME:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index: QtCore.QModelIndex, value, role=QtCore.Qt.EditRole) -> bool:
+        if not index.isValid():
+            return False
+        r, c = index.row(), index.column()
+        if c == self.COL_OPT:
+            if role != QtCore.Qt.CheckStateRole:
+                return False
+            self._opt[r] = QtCore.Qt.CheckState(value) == QtCore.Qt.Checked
+            self.dataChanged.emit(index, index, [QtCore.Qt.CheckStateRole])
+            self.rowEdited.emit(r, [c])
+            return True
+        if role != QtCore.Qt.EditRole or c == self.COL_NAME:
+            return False
+        try:
+            v = float(value)  # parsed once; invalid text keeps the previous value
+        except (TypeError, ValueError):
+            return False
+        row = self._vals[r]
+        row[c - self.VAL0] = v
+        self._text[r, c - self.VAL0] = None
+        cols = [c]
+        lo, hi = self.COL_LOW - self.VAL0, self.COL_HIGH - self.VAL0
+        if c in (self.COL_LOW, self.COL_HIGH) and row[lo] > row[hi]:
+            # swap to enforce low<=high
+            row[lo], row[hi] = row[hi], row[lo]
+            self._text[r, lo] = self._text[r, hi] = None
+            cols = [self.COL_LOW, self.COL_HIGH]
+        self.dataChanged.emit(self.index(r, cols[0]), self.index(r, cols[-1]), [QtCore.Qt.DisplayRole])
+        self.rowEdited.emit(r, cols)
+        return True
+
+    # ---------- bulk access ----------
+    def set_rows(self, names: Sequence[str], opt: Sequence[bool], vals):
+        self.beginResetModel()
+        self._names = list(names)
+        self._opt = np.array(opt, dtype=np.bool_)
+        self._vals = np.array(vals, dtype=np.float64).reshape(-1, 5)
+        self._text = np.empty(self._vals.shape, dtype=object)
+        self._row_by_name = {name: r for r, name in enumerate(self._names)}
+        self.endResetModel()
+
+    def set_values(self, rows: Sequence[int], cols: int | Sequence[int], values):
+        """
+        Overwrite numeric column(s) of the given rows; one dataChanged over the touched span.
+        values is a scalar, one value per row (for every column) or an (rows, cols) block.
+        """
+        if not len(rows):
+            return
+        idx = np.asarray(rows, dtype=np.intp)
+        cidx = np.atleast_1d(np.asarray(cols, dtype=np.intp))
+        v = np.asarray(values, dtype=np.float64)
+        if v.ndim == 1:
+            v = v[:, None]
+        self._vals[np.ix_(idx, cidx - self.VAL0)] = v
+        self._text[np.ix_(idx, cidx - self.VAL0)] = None
+        self.dataChanged.emit(self.index(int(idx.min()), int(cidx.min())),
+                              self.index(int(idx.max()), int(cidx.max())))
+
+    def set_block(self, rows: Sequence[int], opt, vals):
+        """Overwrite optimize flags and all numeric cells of the given rows (paste)."""
+        if not len(rows):
+            return
+        idx = np.asarray(rows, dtype=np.intp)
+        self._opt[idx] = opt
+        self._vals[idx] = vals
+        self._text[idx] = None
+        self.dataChanged.emit(self.index(int(idx.min()), self.COL_OPT),
+                              self.index(int(idx.max()), self.COL_FINAL))
+
+    def row_of(self, name: str) -> int | None:
+        return self._row_by_name.get(name)
+
+    def name(self, row: int) -> str:
+        return self._names[row]
+
+    def optimize(self) -> np.ndarray:
+        return self._opt
+
+    def values(self) -> np.ndarray:
+        return self._vals
+
+    def row_dict(self, r: int) -> Dict[str, float | bool]:
+        lo, hi, ex, ini, fin = self._vals[r].tolist()
+        return {"optimize": bool(self._opt[r]), "lower": lo, "upper": hi,
+                "existing": ex, "initial": ini, "final": fin}
+
+    def rows_dict(self) -> Dict[str, Dict[str, float | bool]]:
+        # one tolist() per array instead of a float() per cell
+        return {
+            name: {"optimize": o, "lower": lo, "upper": hi, "existing": ex, "initial": ini, "final": fin}
+            for name, o, (lo, hi, ex, ini, fin) in zip(self._names, self._opt.tolist(), self._vals.tolist())
+        }
+
+    def row_text(self, row: int) -> List[str]:
+        return (["1" if self._opt[row] else "0", self._names[row]]
+                + [self._cell_text(row, k) for k in range(self._vals.shape[1])])
+
+    def _cell_text(self, r: int, k: int) -> str:
+        # repaints ask for the same text over and over; format each value once
+        t = self._text[r, k]
+        if t is None:
+            t = self._text[r, k] = self._FMT(self._vals[r, k])
+        return t
+
+
+class CaseTable(QtWidgets.QTableView):
     """
     Case grid for controller/process parameters with columns:
 
@@ -14,101 +191,96 @@ class CaseTable(QtWidgets.QTableWidget):
       - Tri-state Optimize checkbox per row
       - Copy/Paste TSV/CSV (preserves columns)
       - Context menu: Reset Final to Initial / Reset Row / Reset All
-      - Signals: rowEdited(name, values dict), tableChanged(dict)
+      - Signals: rowEdited(name, values dict) and cellDelta(name, field, value) per
+        cell edit; tableChanged(dict) after bulk changes (load, paste, resets)
+      - Rows live in a CaseTableModel
 
     API:
       set_rows(spec) where spec is an iterable of tuples:
         (name, optimize, low, high, existing, initial, final)
+      set_final(name, value) -> update one row's Final cell
       get_rows() -> dict[name] = {...}
     """
 
     rowEdited = QtCore.Signal(str, dict)
+    cellDelta = QtCore.Signal(str, str, object)  # (name, field, value), field as in get_rows()
     tableChanged = QtCore.Signal(dict)
 
-    COL_OPT = 0
-    COL_NAME = 1
-    COL_LOW = 2
-    COL_HIGH = 3
-    COL_EXIST = 4
-    COL_INIT = 5
-    COL_FINAL = 6
+    COL_OPT = CaseTableModel.COL_OPT
+    COL_NAME = CaseTableModel.COL_NAME
+    COL_LOW = CaseTableModel.COL_LOW
+    COL_HIGH = CaseTableModel.COL_HIGH
+    COL_EXIST = CaseTableModel.COL_EXIST
+    COL_INIT = CaseTableModel.COL_INIT
+    COL_FINAL = CaseTableModel.COL_FINAL
 
-    HEADERS = ["Optimize", "Parameter", "Lower", "Upper", "Existing", "Initial", "Final"]
+    HEADERS = CaseTableModel.HEADERS
+    # column -> get_rows() field name (cellDelta uses the same keys)
+    FIELDS = {COL_OPT: "optimize", COL_LOW: "lower", COL_HIGH: "upper",
+              COL_EXIST: "existing", COL_INIT: "initial", COL_FINAL: "final"}
 
     def __init__(self, parent=None):
-        super().__init__(0, len(self.HEADERS), parent)
+        super().__init__(parent)
+        self._model = CaseTableModel(self)
+        self.setModel(self._model)
         self.setAlternatingRowColors(True)
         self.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.setEditTriggers(QtWidgets.QAbstractItemView.DoubleClicked | QtWidgets.QAbstractItemView.EditKeyPressed)
-        self.setHorizontalHeaderLabels(self.HEADERS)
         self.horizontalHeader().setStretchLastSection(True)
         self.verticalHeader().setVisible(False)
+        # fixed row height: layout/scroll never asks the rows for a size hint
+        fm = self.fontMetrics()
+        vh = self.verticalHeader()
+        vh.setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        vh.setDefaultSectionSize(fm.height() + 6)
+        # column widths picked once from the font (user-resizable) instead of measuring every
+        # cell on each set_rows; numeric columns fit a 6-digit value like "-0.123456"
+        self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+        self.setColumnWidth(self.COL_OPT, fm.horizontalAdvance(self.HEADERS[self.COL_OPT]) + 16)
+        self.setColumnWidth(self.COL_NAME, 100)
+        num_w = fm.horizontalAdvance("-0.123456") + 16
+        for c in range(self.COL_LOW, self.COL_FINAL + 1):
+            self.setColumnWidth(c, max(num_w, fm.horizontalAdvance(self.HEADERS[c]) + 16))
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self._open_menu)
-        self.itemChanged.connect(self._on_item_changed)
-        self._in_change = False
+        self._model.rowEdited.connect(self._on_row_edited)
 
         QtGui.QShortcut(QtGui.QKeySequence.Copy, self, self.copy_selection)
         QtGui.QShortcut(QtGui.QKeySequence.Paste, self, self.paste_into_selection)
 
     # ---------- API ----------
+    def rowCount(self) -> int:
+        return self._model.rowCount()
+
     def set_rows(self, rows: Iterable[Tuple[str, bool, float, float, float, float, float]]):
-        self._in_change = True
-        try:
-            self.setRowCount(0)
-            for (name, opt, low, high, exist, init, final) in rows:
-                r = self.rowCount()
-                self.insertRow(r)
-
-                chk = QtWidgets.QTableWidgetItem()
-                chk.setFlags(QtCore.Qt.ItemIsUserCheckable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable)
-                chk.setCheckState(QtCore.Qt.Checked if opt else QtCore.Qt.Unchecked)
-                self.setItem(r, self.COL_OPT, chk)
-
-                name_item = QtWidgets.QTableWidgetItem(name)
-                name_item.setFlags(QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled)
-                self.setItem(r, self.COL_NAME, name_item)
-
-                for col, val in (
-                    (self.COL_LOW, low),
-                    (self.COL_HIGH, high),
-                    (self.COL_EXIST, exist),
-                    (self.COL_INIT, init),
-                    (self.COL_FINAL, final),
-                ):
-                    self.setItem(r, col, self._num_item(val))
-            self.resizeColumnsToContents()
-        finally:
-            self._in_change = False
-        self.tableChanged.emit(self.get_rows())
+        rows = list(rows)
+        with self._bulk():
+            self._model.set_rows([row[0] for row in rows], [bool(row[1]) for row in rows],
+                                 [row[2:7] for row in rows])
+
+    def set_final(self, name: str, value: float):
+        """Write one row's Final cell; no rowEdited/tableChanged (bounds and flags are untouched)."""
+        r = self._model.row_of(name)
+        if r is not None:
+            self._model.set_values([r], self.COL_FINAL, value)
 
     def get_rows(self) -> Dict[str, Dict[str, float | bool]]:
-        out: Dict[str, Dict[str, float | bool]] = {}
-        for r in range(self.rowCount()):
-            name = self.item(r, self.COL_NAME).text()
-            out[name] = {
-                "optimize": self.item(r, self.COL_OPT).checkState() == QtCore.Qt.Checked,
-                "lower": float(self.item(r, self.COL_LOW).text()),
-                "upper": float(self.item(r, self.COL_HIGH).text()),
-                "existing": float(self.item(r, self.COL_EXIST).text()),
-                "initial": float(self.item(r, self.COL_INIT).text()),
-                "final": float(self.item(r, self.COL_FINAL).text()),
-            }
-        return out
+        return self._model.rows_dict()
 
     # ---------- internals ----------
-    @staticmethod
-    def _fmt(v: float) -> str:
-        return f"{v:.6g}"
+    @contextmanager
+    def _bulk(self):
+        """Group model writes; tableChanged fires once afterwards, with one get_rows() dict."""
+        yield
+        self.tableChanged.emit(self.get_rows())
 
-    def _num_item(self, value: float) -> QtWidgets.QTableWidgetItem:
-        it = QtWidgets.QTableWidgetItem(self._fmt(value))
-        it.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
-        it.setFlags(QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable)
-        return it
+    def _selected_rows(self) -> List[int]:
+        rows = sorted({i.row() for i in self.selectedIndexes()})
+        return rows or list(range(self.rowCount()))
 
+    @QtCore.Slot(QtCore.QPoint)
     def _open_menu(self, pos):
-        rows = sorted({i.row() for i in self.selectedIndexes()}) or list(range(self.rowCount()))
+        rows = self._selected_rows()
         menu = QtWidgets.QMenu(self)
         act_reset_final = menu.addAction("Reset Final → Initial (Selected)")
         act_reset_row = menu.addAction("Reset Selected Row(s)")
@@ -120,13 +292,9 @@ class CaseTable(QtWidgets.QTableWidget):
         if not chosen:
             return
         if chosen == act_reset_final:
-            self._in_change = True
-            try:
-                for r in rows:
-                    self.item(r, self.COL_FINAL).setText(self.item(r, self.COL_INIT).text())
-            finally:
-                self._in_change = False
-            self.tableChanged.emit(self.get_rows())
+            with self._bulk():
+                init = self._model.values()[rows, self.COL_INIT - CaseTableModel.VAL0]
+                self._model.set_values(rows, self.COL_FINAL, init)
         elif chosen == act_reset_row:
             self._reset_rows(rows)
         elif chosen == act_reset_all:
@@ -137,86 +305,51 @@ class CaseTable(QtWidgets.QTableWidget):
             self.paste_into_selection()
 
     def _reset_rows(self, rows):
-        self._in_change = True
-        try:
-            for r in rows:
-                # reset to Existing->Initial->Final pipeline
-                exist = self.item(r, self.COL_EXIST).text()
-                for c in (self.COL_INIT, self.COL_FINAL):
-                    self.item(r, c).setText(exist)
-                # keep bounds and 'optimize' unchanged
-        finally:
-            self._in_change = False
-        self.tableChanged.emit(self.get_rows())
+        # reset to Existing->Initial->Final pipeline; bounds and 'optimize' stay unchanged
+        with self._bulk():
+            exist = self._model.values()[rows, self.COL_EXIST - CaseTableModel.VAL0]
+            self._model.set_values(rows, (self.COL_INIT, self.COL_FINAL), exist)
 
-    def _on_item_changed(self, item: QtWidgets.QTableWidgetItem):
-        if self._in_change:
-            return
-        r, c = item.row(), item.column()
-        name = self.item(r, self.COL_NAME).text()
-
-        # validate numerics
-        if c in (self.COL_LOW, self.COL_HIGH, self.COL_EXIST, self.COL_INIT, self.COL_FINAL):
-            try:
-                float(item.text())
-            except ValueError:
-                # revert to zero on invalid text
-                self.blockSignals(True)
-                item.setText("0")
-                self.blockSignals(False)
-
-        # ensure bounds low<=high
-        if c in (self.COL_LOW, self.COL_HIGH):
-            low = float(self.item(r, self.COL_LOW).text())
-            high = float(self.item(r, self.COL_HIGH).text())
-            if low > high:
-                self.blockSignals(True)
-                self.item(r, self.COL_LOW).setText(self._fmt(high))
-                self.item(r, self.COL_HIGH).setText(self._fmt(low))
-                self.blockSignals(False)
-
-        self.rowEdited.emit(name, self.get_rows()[name])
-        self.tableChanged.emit(self.get_rows())
+    @QtCore.Slot(int, object)
+    def _on_row_edited(self, r: int, cols: list):
+        # the model already parsed the text and enforced low<=high
+        name = self._model.name(r)
+        row = self._model.row_dict(r)
+        # only the edited cell(s) travel; tableChanged is left to bulk changes
+        self.rowEdited.emit(name, row)
+        for col in cols:
+            field = self.FIELDS[col]
+            self.cellDelta.emit(name, field, row[field])
 
     # ---------- Copy/Paste ----------
     def copy_selection(self):
-        rows = sorted({i.row() for i in self.selectedIndexes()}) or list(range(self.rowCount()))
-        cols = list(range(self.columnCount()))
-        data = []
-        for r in rows:
-            row = []
-            for c in cols:
-                if c == self.COL_OPT:
-                    row.append("1" if self.item(r, c).checkState() == QtCore.Qt.Checked else "0")
-                else:
-                    row.append(self.item(r, c).text())
-            data.append("\t".join(row))
-        QtWidgets.QApplication.clipboard().setText("\n".join(data))
+        data = [self._model.row_text(r) for r in self._selected_rows()]
+        QtWidgets.QApplication.clipboard().setText("\n".join("\t".join(row) for row in data))
 
     def paste_into_selection(self):
         text = QtWidgets.QApplication.clipboard().text()
         if not text.strip():
             return
         rows_in = [line for line in text.splitlines() if line.strip()]
-        start_rows = sorted({i.row() for i in self.selectedIndexes()}) or [0]
-        r0 = start_rows[0]
-        self._in_change = True
-        try:
-            for i, line in enumerate(rows_in):
+        r0 = (sorted({i.row() for i in self.selectedIndexes()}) or [0])[0]
+        rows = list(range(r0, min(r0 + len(rows_in), self.rowCount())))
+        with self._bulk():
+            if not rows:
+                return
+            # start from the current cells: columns missing or unparsable in the paste keep their value
+            opt = self._model.optimize()[rows]  # fancy indexing: copies
+            vals = self._model.values()[rows]
+            for i, line in enumerate(rows_in[:len(rows)]):
                 parts = [p.strip() for p in line.replace(",", "\t").split("\t")]
-                if not parts:
-                    continue
-                r = r0 + i
-                if r >= self.rowCount():
-                    break
-                for c in range(min(len(parts), self.columnCount())):
+                for c in range(min(len(parts), len(self.HEADERS))):
                     if c == self.COL_OPT:
-                        self.item(r, c).setCheckState(QtCore.Qt.Checked if parts[c] in ("1", "true", "True") else QtCore.Qt.Unchecked)
+                        opt[i] = parts[c] in ("1", "true", "True")
                     elif c == self.COL_NAME:
                         # don't allow renaming via paste
                         continue
                     else:
-                        self.item(r, c).setText(parts[c])
-        finally:
-            self._in_change = False
-        self.tableChanged.emit(self.get_rows())
+                        try:
+                            vals[i, c - CaseTableModel.VAL0] = float(parts[c])
+                        except ValueError:
+                            pass
+            self._model.set_block(rows, opt, vals)
@@ -94,6 +94,7 @@ class TagPicker(QtWidgets.QDialog):
         return proxy.sourceModel().data(src, QtCore.Qt.DisplayRole)
 
     # ---------- internals ----------
+    @QtCore.Slot(str)
     def _apply_filter(self, text: str):
         for proxy in self._models.values():
             proxy.setFilterFixedString(text)
@@ -86,8 +86,10 @@ def streaming_closed_loop(
     dt: float, horizon: float, update_period: float = 1.0
 ) -> Iterator[tuple[Sequence[float], Sequence[float], Sequence[float], Sequence[float]]]:
     """
-    Yields (t, y, sp, u) growing arrays periodically.
-    If a native realtime generator exists, use it; else re-sim up to elapsed.
+    Yields (t, y, sp, u) growing lists periodically.
+    If a native realtime generator exists, use it; else step the loop up to elapsed.
+    Every yield hands out the same four list objects, extended in place since the
+    previous one; copy them to keep a snapshot.
     """
     # Try native realtime first
     try:
@@ -122,10 +124,21 @@ def streaming_closed_loop(
     except Exception:
         pass  # fall back
 
-    # Fallback: re-sim to current elapsed time and yield
+    # Fallback: step the loop up to the current elapsed time and yield
     process, deadtime_s = _build_process(model_type, K, tau, theta, tau2, leak)
     controller = _build_controller(mode, Kp, Ti, Td, beta, deriv_on, filt_N, umin, umax, aw_track)
 
+    # loop state lives in the generator, so each tick only runs the new samples
+    steps = _sim.simulate_steps(
+        process, controller,
+        dt=float(dt), sp=float(sp_value),
+        u0=float(u0), y0=float(y0), deadtime_s=float(deadtime_s)
+    )
+    t_list: List[float] = []
+    y_list: List[float] = []
+    sp_list: List[float] = []
+    u_list: List[float] = []
+
     start_wall = time.time()
     last_emit = start_wall
     elapsed = 0.0
@@ -135,14 +148,15 @@ def streaming_closed_loop(
         # guard to avoid zero-length run
         t_end = float(elapsed if elapsed > 0 else dt)
 
-        t, sp_arr, y, u, _d, _uvalve = _sim.simulate(
-            process, controller,
-            t_end=t_end, dt=float(dt), sp=float(sp_value),
-            u0=float(u0), y0=float(y0), deadtime_s=float(deadtime_s)
-        )
+        for _ in range(int(t_end / dt) + 1 - len(t_list)):
+            tk, spk, yk, uk, _d, _uvalve = next(steps)
+            t_list.append(tk)
+            sp_list.append(spk)
+            y_list.append(yk)
+            u_list.append(uk)
 
         if (now - last_emit) >= update_period or elapsed >= horizon:
-            yield t, y, sp_arr, u
+            yield t_list, y_list, sp_list, u_list
             last_emit = now
 
         time.sleep(0.05)